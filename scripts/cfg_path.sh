@@ -12,6 +12,7 @@ export track_num="1" # Set ASR Task Track number to evaluate system outputs on.
 export sad_collar="0.5" # Default for FS02 SAD Task
 export sd_collar="0.25" # Default for FS02 SD Tasks (Track-1 and Track-2)
 export topN_eval="5"    # Default: 5 for FS02 SID Task
+export n_jobs="1"       # Number of files scored in parallel (SAD Task)
 
 sctk_dir=$(dirname $(dirname $(realpath "$0")))
 
@@ -19,4 +20,5 @@ export sad_score_file=${sctk_dir}/scutils/scoreFS02SAD.py
 export sd_score_file=${sctk_dir}/scutils/scoreFS02SD.py
 export sid_score_file=${sctk_dir}/scutils/scoreFS02SID.py
 export asr_score_file=${sctk_dir}/scutils/scoreFS02ASR.py
+export all_score_file=${sctk_dir}/scutils/fs02score.py
 export temp_path=${sctk_dir}/egs/.temp
@@ -0,0 +1,56 @@
+#!/bin/bash
+# Created on Sat Oct 17 2026
+# @author: Aditya Joglekar
+set -e
+source $(dirname $(realpath "$0"))/cfg_path.sh
+
+
+#--------------------------------------------------------------------#
+# Script to generate Scores for all FS02 Challenge Tasks in one run
+# (SAD, SD_track1, SD_track2, SID, ASR_track1 and ASR_track2 scored
+#  concurrently, all results written to one json file)
+# 
+# USAGE:
+#   bash scoreFS02_ALL.sh <out_path> [--<task> <ref_path> <hyp_path>] ...
+#  
+#       out_path: json File Path to write Scores of all Tasks
+#       task: sad, sd1, sd2, sid, asr1 or asr2
+#       ref_path: Reference (Ground Truth) Directory/File Path of the task
+#       hyp_path: Hypothesis (System Output) Directory/File Path of the task
+# 
+# EXAMPLES:
+#   Get Description and Help Options: 
+#       bash ./scripts/scoreFS02_ALL.sh
+# 
+#   Run on Default Examples (all tasks):
+#       bash ./scripts/scoreFS02_ALL.sh ./results/FS02_Scores.json
+# 
+#   Run on SAD and SID Tasks:
+#       bash ./scripts/scoreFS02_ALL.sh ./results/FS02_Scores.json --sad ./egs/ref_gt/SAD/ ./egs/sys_results/SAD/ --sid ./egs/ref_gt/SID/FS01_SID_uttID2spkID_Dev.txt ./egs/sys_results/SID/FS01_SID_uttID2spkID_Dev.txt
+#--------------------------------------------------------------------#
+
+
+# Input arguments
+out_path=$1
+
+
+# Run Score File
+if [ $# -eq 0 ]; then
+    # Help options
+    $python_path $all_score_file -h
+else
+    shift
+    if [ $# -eq 0 ]; then
+        # generates scores on default examples provided with the toolkit
+        echo -e "\nTask (ref and hyp) paths not provided."
+        echo -e "Running scipt on default examples.\n"
+    fi
+    # generates scores and saves them to the path provided by user
+    $python_path $all_score_file --out $out_path --sadcollar $sad_collar \
+    --diarcollar $sd_collar --topN $topN_eval "$@"
+fi
+
+
+# remove temp folder
+rm -rf $temp_path
+# END
@@ -45,11 +45,11 @@ else
         if [ -z "$out_path" ]; then
             # generates score and saves it to the default path
             $python_path $sad_score_file --ref $ref_path --hyp $hyp_path \
-            --sadcollar $sad_collar
+            --sadcollar $sad_collar --jobs $n_jobs
         else
             # generates score and saves it to the path provided by user
             $python_path $sad_score_file --ref $ref_path --hyp $hyp_path \
-            --out $out_path --sadcollar $sad_collar
+            --out $out_path --sadcollar $sad_collar --jobs $n_jobs
         fi    
     fi
 fi
@@ -43,7 +43,7 @@ and warn about any speaker turns not present in those files, and trim the
 remaining turns to the relevant scoring regions before computing the metrics
 as before.
 
-Diarization error rate (DER) is scored using the NIST ``md-eval.pl`` tool with
+Diarization error rate (DER) is scored as by the NIST ``md-eval.pl`` tool with
 a default collar size of 0 ms and explicitly including regions that contain
 overlapping speech in the reference diarization. If desired, this behavior
 can be altered using the ``--collar`` and ``--ignore_overlaps`` flags. For
@@ -78,7 +78,7 @@ from tabulate import tabulate
 from scorelib import __version__ as VERSION
 from scorelib.argparse import ArgumentParser
 from scorelib.rttm import load_rttm
-from scorelib.turn import merge_turns, trim_turns
+from scorelib.turn import merge_turns, trim_turns, TurnSet
 from scorelib.score import score
 from scorelib.six import iterkeys
 from scorelib.uem import gen_uem, load_uem
@@ -115,7 +115,7 @@ def load_rttms(rttm_fns):
 
     Returns
     -------
-    turns : list of Turn
+    turns : TurnSet
         Speaker turns.
 
     file_ids : set
@@ -128,19 +128,19 @@ def load_rttms(rttm_fns):
             error('Unable to open RTTM file: %s' % rttm_fn)
             sys.exit(1)
         try:
-            turns_, _, file_ids_ = load_rttm(rttm_fn)
-            turns.extend(turns_)
+            turns_, _, file_ids_ = load_rttm(rttm_fn, as_turnset=True)
+            turns.append(turns_)
             file_ids.update(file_ids_)
         except IOError as e:
             error('Invalid RTTM file: %s. %s' % (rttm_fn, e))
             sys.exit(1)
-    return turns, file_ids
+    return TurnSet.concatenate(turns), file_ids
 
 
 def check_for_empty_files(ref_turns, sys_turns, uem):
     """Warn on files in UEM without reference or speaker turns."""
-    ref_file_ids = {turn.file_id for turn in ref_turns}
-    sys_file_ids = {turn.file_id for turn in sys_turns}
+    ref_file_ids = set(TurnSet.from_turns(ref_turns).file_ids)
+    sys_file_ids = set(TurnSet.from_turns(sys_turns).file_ids)
     for file_id in sorted(iterkeys(uem)):
         if file_id not in ref_file_ids:
             warn('File "%s" missing in reference RTTMs.' % file_id)
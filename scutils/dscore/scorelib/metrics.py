@@ -4,6 +4,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+from collections import defaultdict
 import os
 import re
 import shutil
@@ -15,8 +16,10 @@ from scipy.optimize import linear_sum_assignment
 from scipy.sparse import coo_matrix, issparse
 
 from .rttm import write_rttm
-from .uem import gen_uem, write_uem
-from .utils import clip, xor
+from .six import iteritems, itervalues
+from .turn import TurnSet
+from .uem import UEM, gen_uem, write_uem
+from .utils import clip, coverage, xor
 
 __all__ = ['bcubed', 'conditional_entropy', 'contingency_matrix', 'der',
            'goodman_kruskal_tau', 'jer', 'mutual_information']
@@ -71,6 +74,43 @@ def contingency_matrix(ref_labels, sys_labels):
     return cm
 
 
+def _cm_entries(cm):
+    """Return non-zero entries and marginals of contingency matrix ``cm``.
+
+    ``cm`` may be a dense array or a ``scipy.sparse`` matrix; only its
+    non-zero entries are visited.
+
+    Returns
+    -------
+    ref_inds : ndarray, (n_nonzero,)
+        Row indices of non-zero entries.
+
+    sys_inds : ndarray, (n_nonzero,)
+        Column indices of non-zero entries.
+
+    vals : ndarray, (n_nonzero,)
+        Non-zero entries.
+
+    ref_marginals : ndarray, (n_ref_classes,)
+        Row sums.
+
+    sys_marginals : ndarray, (n_sys_classes,)
+        Column sums.
+    """
+    if issparse(cm):
+        cm = cm.tocoo()
+        cm.sum_duplicates()
+        keep = cm.data != 0
+        ref_inds, sys_inds, vals = cm.row[keep], cm.col[keep], cm.data[keep]
+    else:
+        ref_inds, sys_inds = np.nonzero(cm)
+        vals = cm[ref_inds, sys_inds]
+    n_ref_classes, n_sys_classes = cm.shape
+    ref_marginals = np.bincount(ref_inds, vals, minlength=n_ref_classes)
+    sys_marginals = np.bincount(sys_inds, vals, minlength=n_sys_classes)
+    return ref_inds, sys_inds, vals, ref_marginals, sys_marginals
+
+
 def bcubed(ref_labels, sys_labels, cm=None):
     """Return B-cubed precision, recall, and F1.
 
@@ -89,7 +129,7 @@ def bcubed(ref_labels, sys_labels, cm=None):
     sys_labels : ndarray, (n_frames,)
         System labels.
 
-    cm : ndarray, (n_ref_classes, n_sys_classes)
+    cm : ndarray or sparse matrix, (n_ref_classes, n_sys_classes)
         Contingency matrix between reference and system labelings. If None,
         will be computed automatically from ``ref_labels`` and ``sys_labels``.
         Otherwise, the given value will be used and ``ref_labels`` and
@@ -114,10 +154,11 @@ def bcubed(ref_labels, sys_labels, cm=None):
     """
     if cm is None:
         cm = contingency_matrix(ref_labels, sys_labels)
-    cm = cm.astype('float64')
-    cm_norm = cm / cm.sum()
-    precision = np.sum(cm_norm * (cm / cm.sum(axis=0)))
-    recall = np.sum(cm_norm * (cm / np.expand_dims(cm.sum(axis=1), 1)))
+    ref_inds, sys_inds, vals, ref_marginals, sys_marginals = _cm_entries(cm)
+    vals = vals.astype('float64')
+    vals_norm = vals / vals.sum()
+    precision = np.sum(vals_norm * (vals / sys_marginals[sys_inds]))
+    recall = np.sum(vals_norm * (vals / ref_marginals[ref_inds]))
     f1 = 2*(precision*recall)/(precision + recall)
     return precision, recall, f1
 
@@ -133,7 +174,7 @@ def goodman_kruskal_tau(ref_labels, sys_labels, cm=None):
     sys_labels : ndarray, (n_frames,)
         System labels.
 
-    cm : ndarray, (n_ref_classes, n_sys_classes)
+    cm : ndarray or sparse matrix, (n_ref_classes, n_sys_classes)
         Contingency matrix between reference and system labelings. If None,
         will be computed automatically from ``ref_labels`` and ``sys_labels``.
         Otherwise, the given value will be used and ``ref_labels`` and
@@ -161,10 +202,11 @@ def goodman_kruskal_tau(ref_labels, sys_labels, cm=None):
     """
     if cm is None:
         cm = contingency_matrix(ref_labels, sys_labels)
-    cm = cm.astype('float64')
-    cm = cm / cm.sum()
-    ref_marginals = cm.sum(axis=1)
-    sys_marginals = cm.sum(axis=0)
+    ref_inds, sys_inds, vals, ref_marginals, sys_marginals = _cm_entries(cm)
+    N = vals.sum()
+    vals = vals / N
+    ref_marginals = ref_marginals / N
+    sys_marginals = sys_marginals / N
     n_ref_classes, n_sys_classes = cm.shape
 
     # Tau(ref, sys).
@@ -174,7 +216,7 @@ def goodman_kruskal_tau(ref_labels, sys_labels, cm=None):
         tau_ref_sys = 1.
     else:
         vy = 1 - np.sum(sys_marginals**2)
-        xy_term = np.sum(cm**2, axis=1)
+        xy_term = np.bincount(ref_inds, vals**2, minlength=n_ref_classes)
         vy_bar_x = 1 - np.sum(xy_term / ref_marginals)
         tau_ref_sys = (vy - vy_bar_x) / vy
 
@@ -185,7 +227,7 @@ def goodman_kruskal_tau(ref_labels, sys_labels, cm=None):
         tau_sys_ref = 1.
     else:
         vx = 1 - np.sum(ref_marginals**2)
-        yx_term = np.sum(cm**2, axis=0)
+        yx_term = np.bincount(sys_inds, vals**2, minlength=n_sys_classes)
         vx_bar_y = 1 - np.sum(yx_term / sys_marginals)
         tau_sys_ref = (vx - vx_bar_y) / vx
 
@@ -208,7 +250,7 @@ def conditional_entropy(ref_labels, sys_labels, cm=None, nats=False):
     sys_labels : ndarray, (n_frames,)
         System labels.
 
-    cm : ndarray, (n_ref_classes, n_sys_classes)
+    cm : ndarray or sparse matrix, (n_ref_classes, n_sys_classes)
         Contingency matrix between reference and system labelings. If None,
         will be computed automatically from ``ref_labels`` and ``sys_labels``.
         Otherwise, the given value will be used and ``ref_labels`` and
@@ -230,10 +272,8 @@ def conditional_entropy(ref_labels, sys_labels, cm=None, nats=False):
     log = np.log if nats else np.log2
     if cm is None:
         cm = contingency_matrix(ref_labels, sys_labels)
-    sys_marginals = cm.sum(axis=0)
-    N = cm.sum()
-    ref_inds, sys_inds = np.nonzero(cm)
-    vals = cm[ref_inds, sys_inds] # Non-zero values of contingency matrix.
+    ref_inds, sys_inds, vals, _, sys_marginals = _cm_entries(cm)
+    N = vals.sum()
     sys_marginals = sys_marginals[sys_inds] # Corresponding marginals.
     sigma = vals/N * (log(sys_marginals) - log(vals))
     return sigma.sum()
@@ -268,7 +308,7 @@ def mutual_information(ref_labels, sys_labels, cm=None, nats=False,
     sys_labels : ndarray, (n_frames,)
         System labels.
 
-    cm : ndarray, (n_ref_classes, n_sys_classes)
+    cm : ndarray or sparse matrix, (n_ref_classes, n_sys_classes)
         Contingency matrix between reference and system labelings. If None,
         will be computed automatically from ``ref_labels`` and ``sys_labels``.
         Otherwise, the given value will be used and ``ref_labels`` and
@@ -321,11 +361,8 @@ def mutual_information(ref_labels, sys_labels, cm=None, nats=False,
         return 0.0, 1.0
 
     # Mutual information.
-    N = cm.sum()
-    ref_marginals = cm.sum(axis=1)
-    sys_marginals = cm.sum(axis=0)
-    ref_inds, sys_inds = np.nonzero(cm)
-    vals = cm[ref_inds, sys_inds] # Non-zero values of contingency matrix.
+    ref_inds, sys_inds, vals, ref_marginals, sys_marginals = _cm_entries(cm)
+    N = vals.sum()
     outer = ref_marginals[ref_inds]*sys_marginals[sys_inds]
     sigma = (vals/N) * (
         log(vals) - log(outer) + log(N))
@@ -352,17 +389,285 @@ def mutual_information(ref_labels, sys_labels, cm=None, nats=False,
     return mi, nmi
 
 
+def _map_speakers(overlap):
+    """Return md-eval's mapping between reference and system speakers.
+
+    This is a direct port of ``weighted_bipartite_graph_match`` from
+    ``md-eval-22.pl``. The mapping maximizes the total overlap, as would
+    ``linear_sum_assignment``, but md-eval's tie breaking is kept so that
+    the resulting speaker error times agree when several mappings are
+    optimal.
+
+    Parameters
+    ----------
+    overlap : ndarray, (n_ref_speakers, n_sys_speakers)
+        Overlap in seconds between reference and system speakers. Speakers
+        must be ordered by speaker id.
+
+    Returns
+    -------
+    ref_inds : ndarray, (n_mapped,)
+        Indices of mapped reference speakers.
+
+    sys_inds : ndarray, (n_mapped,)
+        Indices of the system speakers they are mapped to.
+    """
+    required_precision = 1E-12
+    INF = 1E30
+    rows = np.flatnonzero(overlap.sum(axis=1) > 0)
+    cols = np.flatnonzero(overlap.sum(axis=0) > 0)
+    if rows.size == 0:
+        return np.array([], dtype='int64'), np.array([], dtype='int64')
+    min_score = -overlap.max()
+    cost = -overlap[np.ix_(rows, cols)] - min_score
+    defined = overlap[np.ix_(rows, cols)] > 0
+    reverse_search = rows.size < cols.size
+    if reverse_search:
+        cost, defined = cost.T, defined.T
+    nrows, ncols = cost.shape[0] + 1, cost.shape[1] + 1
+    nmax = max(nrows, ncols)
+    no_match_cost = -min_score*(1 + required_precision)
+
+    # Subtract the column minima.
+    col_min = [no_match_cost]*nmax
+    for l in range(ncols - 1):
+        vals = cost[defined[:, l], l]
+        if vals.size:
+            col_min[l] = min(no_match_cost, vals.min())
+    C = [[(cost[k, l] if k < nrows - 1 and l < ncols - 1 and defined[k, l]
+           else no_match_cost) - col_min[l]
+          for l in range(nmax)] for k in range(nmax)]
+
+    # Initial stage.
+    row_mate = [None]*nmax
+    col_mate = [None]*nmax
+    row_dec = [0.0]*nmax
+    col_inc = [0.0]*nmax
+    slack = [INF]*nmax
+    slack_row = [None]*nmax
+    parent_row = [None]*nmax
+    unchosen_row = {}
+    t = 0
+    for k in range(nmax):
+        row_min = min([no_match_cost] + C[k][:ncols])
+        row_dec[k] = row_min
+        for l in range(nmax):
+            if C[k][l] == row_min and row_mate[l] is None:
+                col_mate[k] = l
+                row_mate[l] = k
+                break
+        else:
+            col_mate[k] = -1
+            unchosen_row[t] = k
+            t += 1
+
+    # Remaining stages.
+    unmatched = t
+    while unmatched:
+        q = 0
+        match = None
+        while match is None:
+            # Explore forest; stop when the matching can be increased.
+            while q < t and match is None:
+                k = unchosen_row[q]
+                s = row_dec[k]
+                for l in range(nmax):
+                    if slack[l] > 0:
+                        delta = C[k][l] - s + col_inc[l]
+                        if delta < slack[l]:
+                            if delta == 0:
+                                if row_mate[l] is None:
+                                    match = k, l
+                                    break
+                                slack[l] = 0
+                                parent_row[l] = k
+                                unchosen_row[t] = row_mate[l]
+                                t += 1
+                            else:
+                                slack[l] = delta
+                                slack_row[l] = k
+                q += 1
+            if match is not None:
+                break
+
+            # Introduce a new zero by modifying row_dec and col_inc.
+            s = min([INF] + [x for x in slack if x])
+            for q in range(t):
+                row_dec[unchosen_row[q]] += s
+            q = t
+            for l in range(nmax):
+                if slack[l]:
+                    slack[l] -= s
+                    if slack[l] == 0:
+                        k = slack_row[l]
+                        if row_mate[l] is None:
+                            for j in range(l + 1, nmax):
+                                if slack[j] == 0:
+                                    col_inc[j] += s
+                            match = k, l
+                            break
+                        parent_row[l] = k
+                        unchosen_row[t] = row_mate[l]
+                        t += 1
+                else:
+                    col_inc[l] += s
+
+        # Update matching by pairing row k with column l.
+        k, l = match
+        while True:
+            j = col_mate[k]
+            col_mate[k] = l
+            row_mate[l] = k
+            if j < 0:
+                break
+            k = parent_row[j]
+            l = j
+        unmatched -= 1
+        t = 0
+        unchosen_row = {}
+        parent_row = [-1]*nmax
+        slack = [INF]*nmax
+        for k in range(nmax):
+            if col_mate[k] < 0:
+                unchosen_row[t] = k
+                t += 1
+
+    pairs = [(k, l) for l, k in enumerate(row_mate)
+             if k < nrows - 1 and l < ncols - 1 and defined[k, l]]
+    if reverse_search:
+        pairs = [(l, k) for k, l in pairs]
+    ref_inds, sys_inds = np.array(pairs, dtype='int64').reshape(-1, 2).T
+    return rows[ref_inds], cols[sys_inds]
+
+
 SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
 MDEVAL_BIN = os.path.join(SCRIPT_DIR, 'md-eval-22.pl')
-FILE_REO = re.compile(r'(?<=Speaker Diarization for).+(?=\*\*\*)')
 SCORED_SPEAKER_REO = re.compile(r'(?<=SCORED SPEAKER TIME =)[\d.]+')
 MISS_SPEAKER_REO = re.compile(r'(?<=MISSED SPEAKER TIME =)[\d.]+')
 FA_SPEAKER_REO = re.compile(r'(?<=FALARM SPEAKER TIME =)[\d.]+')
 ERROR_SPEAKER_REO = re.compile(r'(?<=SPEAKER ERROR TIME =)[\d.]+')
 
-# TODO: Working with md-eval is a PITA, even with modifications to the
-#       reporting. Suggest looking into moving over to pyannote's
-#       implementation.
+
+def _has_overlap_ties(ref_turns, score_regions):
+    """Return True if md-eval's overlap exclusion is order dependent.
+
+    Without collars, ``md-eval.pl -1`` sorts reference and UEM boundaries
+    with an inconsistent comparator, so that a reference onset coinciding with
+    a reference offset or with a UEM boundary is resolved according to the
+    order of the input rather than the times alone.
+    """
+    ref_turns = TurnSet.from_turns(ref_turns)
+    uem_times = np.array(score_regions, dtype='float64').ravel()
+    return bool(
+        np.intersect1d(ref_turns.onsets, ref_turns.offsets).size or
+        np.intersect1d(np.concatenate([ref_turns.onsets, ref_turns.offsets]),
+                       uem_times).size)
+
+
+def _mdeval_file_der_stats(file_id, ref_turns, sys_turns, score_regions,
+                           collar=0.0, ignore_overlaps=False):
+    """Return speaker times for a single file as reported by md-eval.
+
+    Returns
+    -------
+    stats : ndarray, (4,)
+        Scored, missed, false alarm, and speaker error times in seconds.
+    """
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        ref_rttm_fn = os.path.join(tmp_dir, 'ref.rttm')
+        write_rttm(ref_rttm_fn, ref_turns)
+        sys_rttm_fn = os.path.join(tmp_dir, 'sys.rttm')
+        write_rttm(sys_rttm_fn, sys_turns)
+        uemf = os.path.join(tmp_dir, 'all.uem')
+        write_uem(uemf, UEM({file_id: score_regions}))
+        cmd = [MDEVAL_BIN,
+               '-af',
+               '-r', ref_rttm_fn,
+               '-s', sys_rttm_fn,
+               '-c', str(collar),
+               '-u', uemf,
+              ]
+        if ignore_overlaps:
+            cmd.append('-1')
+        stdout = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+    except subprocess.CalledProcessError as e:
+        stdout = e.output
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    # The by-file and total times agree, as only one file is scored.
+    stdout = stdout.decode('utf-8')
+    return np.array([float(reo.search(stdout).group())
+                     for reo in [SCORED_SPEAKER_REO, MISS_SPEAKER_REO,
+                                 FA_SPEAKER_REO, ERROR_SPEAKER_REO]])
+
+
+def _file_der_stats(ref_turns, sys_turns, score_regions, collar=0.0,
+                    ignore_overlaps=False):
+    """Return md-eval speaker times for a single file.
+
+    Returns
+    -------
+    stats : ndarray, (4,)
+        Scored, missed, false alarm, and speaker error times in seconds.
+    """
+    def _unpack(turns):
+        turns = TurnSet.from_turns(turns)
+        return (turns.onsets, turns.offsets, turns.speaker_inds,
+                len(turns.speaker_ids))
+    ref_onsets, ref_offsets, ref_spks, n_ref = _unpack(ref_turns)
+    sys_onsets, sys_offsets, sys_spks, n_sys = _unpack(sys_turns)
+    uem_onsets, uem_offsets = np.array(score_regions, dtype='float64').T
+
+    def _segments(*times):
+        # Elementary segments delimited by every boundary in ``times``.
+        bounds = np.unique(np.concatenate(times))
+        ref = coverage(bounds, ref_onsets, ref_offsets, ref_spks, n_ref) > 0
+        sys = coverage(bounds, sys_onsets, sys_offsets, sys_spks, n_sys) > 0
+        evaluated = coverage(bounds, uem_onsets, uem_offsets)[:, 0] > 0
+        return bounds, np.diff(bounds), ref, sys, evaluated
+    turn_times = [ref_onsets, ref_offsets, sys_onsets, sys_offsets,
+                  uem_onsets, uem_offsets]
+
+    # Speaker overlap within the evaluation regions, accumulated segment by
+    # segment as md-eval does so that the mapping breaks ties the same way.
+    _, durs, ref, sys, evaluated = _segments(*turn_times)
+    ref_seg_inds, ref_inds = np.nonzero(ref & evaluated[:, None])
+    sys_seg_inds, sys_inds = np.nonzero(sys)
+    starts = np.searchsorted(sys_seg_inds, ref_seg_inds, 'left')
+    counts = np.searchsorted(sys_seg_inds, ref_seg_inds, 'right') - starts
+    pair_inds = (np.arange(counts.sum()) +
+                 np.repeat(starts - np.cumsum(counts) + counts, counts))
+    overlap = np.zeros((n_ref, n_sys))
+    np.add.at(overlap, (np.repeat(ref_inds, counts), sys_inds[pair_inds]),
+              durs[sys_seg_inds[pair_inds]])
+    ref_inds, sys_inds = _map_speakers(overlap)
+
+    # Scoring regions are the UEM less the no-score collars around reference
+    # boundaries and, optionally, the regions of overlapping reference speech.
+    collar_onsets = np.concatenate([ref_onsets, ref_offsets]) - collar
+    collar_offsets = collar_onsets + 2*collar
+    bounds, durs, ref, sys, scored = _segments(
+        collar_onsets, collar_offsets, *turn_times)
+    if collar > 0:
+        scored &= coverage(bounds, collar_onsets, collar_offsets)[:, 0] == 0
+    if ignore_overlaps:
+        scored &= coverage(bounds, ref_onsets, ref_offsets)[:, 0] < 2
+
+    # Accumulate error times over scored segments.
+    durs = durs*scored
+    n_ref_spks = ref.sum(axis=1)
+    n_sys_spks = sys.sum(axis=1)
+    n_mapped = (ref[:, ref_inds] & sys[:, sys_inds]).sum(axis=1)
+    scored_time = np.dot(durs, n_ref_spks)
+    miss_time = np.dot(durs, np.maximum(n_ref_spks - n_sys_spks, 0))
+    fa_time = np.dot(durs, np.maximum(n_sys_spks - n_ref_spks, 0))
+    error_time = np.dot(
+        durs, np.minimum(n_ref_spks, n_sys_spks) - n_mapped)
+    return np.array([scored_time, miss_time, fa_time, error_time])
+
+
 def der(ref_turns, sys_turns, collar=0.0, ignore_overlaps=False, uem=None):
     """Return overall diarization error rate.
 
@@ -379,9 +684,10 @@ def der(ref_turns, sys_turns, collar=0.0, ignore_overlaps=False, uem=None):
     As with word error rate, a score of zero indicates perfect performance and
     higher scores (which may exceed 100) indicate poorer performance.
 
-    DER is computed as defined in the NIST RT-09 evaluation plan using version
-    22 of the ``md-eval.pl`` scoring script. When ``ignore_overlaps=False``,
-    this is equivalent to running the following command:
+    DER is computed as defined in the NIST RT-09 evaluation plan, following
+    version 22 of the ``md-eval.pl`` scoring script. When
+    ``ignore_overlaps=False``, this is equivalent to running the following
+    command:
 
         md-eval.pl -r ref.rttm -s sys.rttm -c collar -u uemf
 
@@ -395,12 +701,21 @@ def der(ref_turns, sys_turns, collar=0.0, ignore_overlaps=False, uem=None):
 
         md-eval.pl -r ref.rttm -s sys.rttm -c collar -u uemf -1
 
+    The script itself is normally not invoked. Scoring is done directly on the
+    sorted turn boundaries, with the speaker mapping found by
+    ``_map_speakers``, a port of md-eval's ``weighted_bipartite_graph_match``
+    (including its tie breaking between equally good mappings). The one
+    exception is ``ignore_overlaps=True`` without a collar, for files where
+    reference boundaries coincide with each other or with the UEM; md-eval
+    resolves these by input order, so such files are still scored by
+    ``md-eval.pl`` itself.
+
     Parameters
     ----------
-    ref_turns : list of Turn
+    ref_turns : list of Turn or TurnSet
         Reference speaker turns.
 
-    sys_turns : list of Turn
+    sys_turns : list of Turn or TurnSet
         System speaker turns.
 
     collar : float, optional
@@ -433,74 +748,56 @@ def der(ref_turns, sys_turns, collar=0.0, ignore_overlaps=False, uem=None):
     NIST. (2009). The 2009 (RT-09) Rich Transcription Meeting Recognition
     Evaluation Plan. https://web.archive.org/web/20100606041157if_/http://www.itl.nist.gov/iad/mig/tests/rt/2009/docs/rt09-meeting-eval-plan-v2.pdf
     """
-    tmp_dir = tempfile.mkdtemp()
-
-    # Write RTTMs.
-    ref_rttm_fn = os.path.join(tmp_dir, 'ref.rttm')
-    write_rttm(ref_rttm_fn, ref_turns)
-    sys_rttm_fn = os.path.join(tmp_dir, 'sys.rttm')
-    write_rttm(sys_rttm_fn, sys_turns)
-
-    # Write UEM.
     if uem is None:
         uem = gen_uem(ref_turns, sys_turns)
-    uemf = os.path.join(tmp_dir, 'all.uem')
-    write_uem(uemf, uem)
-
-    # Actually score.
-    try:
-        cmd = [MDEVAL_BIN,
-               '-af',
-               '-r', ref_rttm_fn,
-               '-s', sys_rttm_fn,
-               '-c', str(collar),
-               '-u', uemf,
-              ]
-        if ignore_overlaps:
-            cmd.append('-1')
-        stdout = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-    except subprocess.CalledProcessError as e:
-        stdout = e.output
-    finally:
-        shutil.rmtree(tmp_dir)
-
-    # Parse md-eval output to extract by-file and total scores.
-    stdout = stdout.decode('utf-8')
-    file_ids = [m.strip() for m in FILE_REO.findall(stdout)]
-    file_ids = [file_id[2:] if file_id.startswith('f=') else file_id
-                for file_id in file_ids]
-    scored_speaker_times = np.array(
-        [float(m) for m in SCORED_SPEAKER_REO.findall(stdout)])
-    miss_speaker_times = np.array(
-        [float(m) for m in MISS_SPEAKER_REO.findall(stdout)])
-    fa_speaker_times = np.array(
-        [float(m) for m in FA_SPEAKER_REO.findall(stdout)])
-    error_speaker_times = np.array(
-        [float(m) for m in ERROR_SPEAKER_REO.findall(stdout)])
-    with np.errstate(invalid='ignore', divide='ignore'):
-        error_times = miss_speaker_times + fa_speaker_times + error_speaker_times
-        ders = error_times / scored_speaker_times
-    ders[np.isnan(ders)] = 0 # Numerator and denominator both 0.
-    ders[np.isinf(ders)] = 1 # Numerator > 0, but denominator = 0.
-    ders *= 100. # Convert to percent.
+    file_to_ref_turns = defaultdict(
+        list, TurnSet.from_turns(ref_turns).groupby_file())
+    file_to_sys_turns = defaultdict(
+        list, TurnSet.from_turns(sys_turns).groupby_file())
+
+    # As with md-eval, only files with reference turns are scored, and those
+    # missing from the UEM are scored over the extent of the reference turns.
+    file_to_stats = {}
+    for file_id, file_ref_turns in iteritems(file_to_ref_turns):
+        if file_id in uem:
+            score_regions = uem[file_id]
+        else:
+            score_regions = [
+                (file_ref_turns.onsets.min(), file_ref_turns.offsets.max())]
+        if (ignore_overlaps and collar <= 0 and
+                _has_overlap_ties(file_ref_turns, score_regions)):
+            # md-eval's own tie breaking can't be reproduced from the times
+            # alone, so defer to it; with collars, all such ties fall within
+            # no-score regions.
+            file_to_stats[file_id] = _mdeval_file_der_stats(
+                file_id, file_ref_turns, file_to_sys_turns[file_id],
+                score_regions, collar, ignore_overlaps)
+        else:
+            file_to_stats[file_id] = _file_der_stats(
+                file_ref_turns, file_to_sys_turns[file_id], score_regions,
+                collar, ignore_overlaps)
+
+    def _der(stats):
+        scored_time = stats[0]
+        error_time = stats[1:].sum()
+        if scored_time > 0:
+            return 100.*error_time/scored_time
+        return 100. if error_time > 0 else 0.0 # Denominator = 0.
 
     # Reconcile with UEM, keeping in mind that in the edge case where no
     # reference turns are observed for a file, md-eval doesn't report results
     # for said file.
-    file_to_der_base = dict(zip(file_ids, ders))
     file_to_der = {}
     for file_id in uem:
         try:
-            der = file_to_der_base[file_id]
+            der = _der(file_to_stats[file_id])
         except KeyError:
             # Check for any system turns for that file, which should be FAs,
             # assuming that the turns have been cropped to the UEM scoring
             # regions.
-            n_sys_turns = len(
-                [turn for turn in sys_turns if turn.file_id == file_id])
-            der = 100. if n_sys_turns else 0.0
+            der = 100. if file_to_sys_turns[file_id] else 0.0
         file_to_der[file_id] = der
-    global_der = file_to_der_base['ALL']
+    global_der = _der(sum(itervalues(file_to_stats), np.zeros(4)))
 
     return file_to_der, global_der
 
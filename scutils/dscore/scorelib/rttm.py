@@ -3,13 +3,19 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from .turn import Turn
+import contextlib
+import io
+
+import numpy as np
+
+from .turn import Turn, TurnSet
 from .utils import format_float
 
 __all__ = ['load_rttm', 'write_rttm', 'validate_rttm']
 
 
-def _parse_rttm_line(line):
+
+def _parse_rttm_fields(line):
     line = line.decode('utf-8').strip()
     fields = line.split()
     if len(fields) < 9:
@@ -33,23 +39,138 @@ def _parse_rttm_line(line):
     if dur <= 0:
         raise IOError('Turn duration <= 0 seconds. LINE: "%s"' % line)
 
+    return file_id, speaker_id, onset, dur
+
+
+def _parse_rttm_line(line):
+    file_id, speaker_id, onset, dur = _parse_rttm_fields(line)
     return Turn(onset, dur=dur, speaker_id=speaker_id, file_id=file_id)
 
 
-def load_rttm(rttmf):
+def _tokens(buf, starts, ends):
+    """Return tokens ``buf[starts[i]:ends[i]]`` as fixed width byte strings."""
+    width = int((ends - starts).max()) if starts.size else 1
+    offsets = np.arange(width)
+    chars = buf[np.minimum(starts[:, None] + offsets, buf.size - 1)]
+    chars[offsets >= (ends - starts)[:, None]] = 0
+    return chars.view('S%d' % width).ravel()
+
+
+def _intern_tokens(tokens):
+    """Return sorted unique ``tokens`` and index of each token into them."""
+    # Ids tend to come in runs, so only the first token of each run is
+    # looked up.
+    is_first = np.ones(tokens.size, dtype=bool)
+    is_first[1:] = tokens[1:] != tokens[:-1]
+    keys = tokens[is_first]
+    width = tokens.dtype.itemsize
+    if width <= 8:
+        # Zero padded big-endian integers sort in the same order as tokens.
+        chars = np.zeros((keys.size, 8), dtype='uint8')
+        chars[:, :width] = keys.view('uint8').reshape(-1, width)
+        keys = chars.view('>u8').ravel()
+    _, first_inds, inds = np.unique(
+        keys, return_index=True, return_inverse=True)
+    unique_tokens = tokens[is_first][first_inds].tolist()
+    inds = inds[np.cumsum(is_first) - 1]
+    return [token.decode('utf-8') for token in unique_tokens], inds
+
+
+@contextlib.contextmanager
+def _open_rttm(rttmf):
+    """Open ``rttmf`` for reading in binary mode.
+
+    File objects are used as is, and are not closed.
+    """
+    if hasattr(rttmf, 'read'):
+        yield rttmf
+    else:
+        with open(rttmf, 'rb') as f:
+            yield f
+
+
+def _load_rttm_bulk(data):
+    """Load speaker turns from RTTM file contents using vectorized tokenization.
+
+    Returns None if ``data`` contains non-ASCII or NUL bytes or a turn onset
+    or duration that cannot be parsed as a float. Such files should be parsed
+    line by line, which also reports the offending line.
+    """
+    buf = np.frombuffer(data, dtype='uint8')
+    if (buf >= 0x80).any() or (buf == 0).any():
+        return None
+
+    # Locate lines, skipping SPKR-INFO lines.
+    newlines = np.flatnonzero(buf == ord('\n'))
+    line_starts = np.concatenate([[0], newlines + 1])
+    line_ends = np.append(newlines + 1, buf.size)
+    if line_starts[-1] == buf.size:
+        line_starts, line_ends = line_starts[:-1], line_ends[:-1]
+    is_info = line_ends - line_starts >= len(b'SPKR-INFO')
+    for i, char in enumerate(bytearray(b'SPKR-INFO')):
+        is_info[is_info] &= buf[line_starts[is_info] + i] == char
+
+    # Locate tokens, splitting on the same whitespace as ``str.split`` does
+    # for ASCII text.
+    is_space = ((buf == 32) | ((buf >= 9) & (buf <= 13)) |
+                ((buf >= 28) & (buf <= 31)))
+    is_start = ~is_space
+    is_start[1:] &= is_space[:-1]
+    is_end = ~is_space
+    is_end[:-1] &= is_space[1:]
+    starts = np.flatnonzero(is_start)
+    ends = np.flatnonzero(is_end) + 1
+    first_tokens = np.searchsorted(starts, line_starts)
+    n_fields = np.searchsorted(starts, line_ends) - first_tokens
+
+    # Parse and validate onsets and durations.
+    is_bad = ~is_info & (n_fields < 9)
+    line_inds = np.flatnonzero(~is_info & ~is_bad)
+    def _field(i):
+        token_inds = first_tokens[line_inds] + i
+        return _tokens(buf, starts[token_inds], ends[token_inds])
+    try:
+        onsets = _field(3).astype('float64')
+        durs = _field(4).astype('float64')
+    except ValueError:
+        return None
+    is_bad[line_inds] = (onsets < 0) | (durs <= 0)
+    if is_bad.any():
+        # Re-parse first invalid line to raise the same error as
+        # ``_parse_rttm_line``.
+        line_ind = np.argmax(is_bad)
+        _parse_rttm_fields(
+            buf[line_starts[line_ind]:line_ends[line_ind]].tobytes())
+
+    file_ids, file_inds = _intern_tokens(_field(1))
+    speaker_ids, speaker_inds = _intern_tokens(_field(7))
+    return TurnSet(
+        onsets, onsets + durs, durs, speaker_inds, file_inds, speaker_ids,
+        file_ids)
+
+
+def load_rttm(rttmf, as_turnset=False):
     """Load speaker turns from RTTM file.
 
     For a description of the RTTM format, consult Appendix A of the NIST RT-09
     evaluation plan.
 
+    The file is read into memory and tokenized in bulk. It is only parsed line
+    by line if it contains non-ASCII bytes or malformed numbers.
+
     Parameters
     ----------
-    rttmf : str
-        Path to RTTM file.
+    rttmf : str or file object
+        Path to RTTM file, or RTTM file opened in binary mode.
+
+    as_turnset : bool, optional
+        If True, return turns as a ``TurnSet`` instead of a list of ``Turn``.
+        This avoids creating an object per turn for large RTTM files.
+        (Default: False)
 
     Returns
     -------
-    turns : list of Turn
+    turns : list of Turn or TurnSet
         Speaker turns.
 
     speaker_ids : set
@@ -63,17 +184,19 @@ def load_rttm(rttmf):
     NIST. (2009). The 2009 (RT-09) Rich Transcription Meeting Recognition
     Evaluation Plan. https://web.archive.org/web/20100606041157if_/http://www.itl.nist.gov/iad/mig/tests/rt/2009/docs/rt09-meeting-eval-plan-v2.pdf
     """
-    with open(rttmf, 'rb') as f:
-        turns = []
-        speaker_ids = set()
-        file_ids = set()
-        for line in f:
-            if line.startswith(b'SPKR-INFO'):
-                continue
-            turn = _parse_rttm_line(line)
-            turns.append(turn)
-            speaker_ids.add(turn.speaker_id)
-            file_ids.add(turn.file_id)
+    with _open_rttm(rttmf) as f:
+        data = f.read()
+    turns = _load_rttm_bulk(data)
+    if turns is None:
+        fields = [_parse_rttm_fields(line) for line in io.BytesIO(data)
+                  if not line.startswith(b'SPKR-INFO')]
+        file_ids, speaker_ids, onsets, durs = (
+            zip(*fields) if fields else ((), (), (), ()))
+        turns = TurnSet.from_columns(onsets, speaker_ids, file_ids, durs=durs)
+    speaker_ids = set(turns.speaker_ids)
+    file_ids = set(turns.file_ids)
+    if not as_turnset:
+        turns = turns.to_turns()
     return turns, speaker_ids, file_ids
 
 
@@ -122,8 +245,8 @@ def validate_rttm(rttmf):
 
     Parameters
     ----------
-    rttmf : str
-        Path to RTTM file.
+    rttmf : str or file object
+        Path to RTTM file, or RTTM file opened in binary mode.
 
     Returns
     -------
@@ -136,7 +259,7 @@ def validate_rttm(rttmf):
     error_messages : list of str
          Errors encountered in file.
     """
-    with open(rttmf, 'rb') as f:
+    with _open_rttm(rttmf) as f:
         file_ids = set()
         speaker_ids = set()
         error_messages = []
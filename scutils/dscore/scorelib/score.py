@@ -6,13 +6,15 @@ from __future__ import unicode_literals
 from collections import defaultdict, namedtuple
 
 import numpy as np
-from scipy.linalg import block_diag
+from scipy.sparse import block_diag
 
 from . import metrics
 from .six import iteritems, itervalues
-from .utils import groupby
+from .turn import TurnSet
+from .utils import coverage
 
-__all__ = ['flatten_labels', 'score', 'turns_to_frames', 'Scores']
+__all__ = ['flatten_labels', 'score', 'turns_to_frame_counts',
+           'turns_to_frames', 'Scores']
 
 
 def turns_to_frames(turns, score_regions, step=0.010):
@@ -20,7 +22,7 @@ def turns_to_frames(turns, score_regions, step=0.010):
 
     Parameters
     ----------
-    turns : list of Turn
+    turns : list of Turn or TurnSet
         Speaker turns. Should all be from single file.
 
     score_regions : list of tuple
@@ -37,24 +39,19 @@ def turns_to_frames(turns, score_regions, step=0.010):
         ``j``-th speaker was present at frame ``i`` and 0 otherwise. If no
         speaker turns were passed, the second dimension will be 0.
     """
-    file_ids = {turn.file_id for turn in turns}
-    if len(file_ids) > 1:
+    turns = TurnSet.from_turns(turns)
+    if len(turns.file_ids) > 1:
         raise ValueError('Turns should be from a single file.')
 
     # Create matrix whose i,j-th entry is True IFF the j-th speaker was
     # present at frame i.
-    onsets = [turn.onset for turn in turns]
-    offsets = [turn.offset for turn in turns]
-    speaker_ids = [turn.speaker_id for turn in turns]
-    speaker_classes, speaker_class_inds = np.unique(
-        speaker_ids, return_inverse=True)
     dur = max(score_offset for score_onset, score_offset in score_regions)
     n_frames = int(dur/step)
-    X = np.zeros((n_frames, speaker_classes.size), dtype='int32')
+    X = np.zeros((n_frames, len(turns.speaker_ids)), dtype='int32')
     times = step*np.arange(n_frames)
-    bis = np.searchsorted(times, onsets)
-    eis = np.searchsorted(times, offsets)
-    for bi, ei, speaker_class_ind in zip(bis, eis, speaker_class_inds):
+    bis = np.searchsorted(times, turns.onsets)
+    eis = np.searchsorted(times, turns.offsets)
+    for bi, ei, speaker_class_ind in zip(bis, eis, turns.speaker_inds):
         X[bi:ei, speaker_class_ind] = 1
 
     # Eliminate frames belonging to non-score regions.
@@ -67,6 +64,104 @@ def turns_to_frames(turns, score_regions, step=0.010):
     return X
 
 
+def _frame_inds(times, n_frames, step=0.010):
+    """Return indices of first frames starting at or after ``times``.
+
+    Equivalent to ``np.searchsorted(step*np.arange(n_frames), times)``, but
+    without materializing the frame times.
+    """
+    times = np.asarray(times, dtype='float64')
+    inds = np.clip(np.ceil(times/step), 0, n_frames).astype('int64')
+    while True:
+        # Correct for any rounding error in the division.
+        lower = (inds > 0) & (step*(inds - 1) >= times)
+        upper = (inds < n_frames) & (step*inds < times)
+        if not (lower.any() or upper.any()):
+            return inds
+        inds += upper.astype('int64') - lower.astype('int64')
+
+
+def turns_to_frame_counts(ref_turns, sys_turns, score_regions, step=0.010):
+    """Return frame-level statistics of reference and system diarizations.
+
+    The results are identical to those computed from the frame-level labels
+    returned by ``turns_to_frames``. However, the frames are never actually
+    built. Instead, frames are grouped into runs over which neither
+    diarization changes, so memory grows with the number of turns rather
+    than with the duration of the recording.
+
+    Parameters
+    ----------
+    ref_turns : list of Turn or TurnSet
+        Reference speaker turns. Should all be from single file.
+
+    sys_turns : list of Turn or TurnSet
+        System speaker turns. Should all be from same file as ``ref_turns``.
+
+    score_regions : list of tuple
+        Scoring regions from UEM.
+
+    step : float, optional
+        Frame step size in seconds.
+        (Default: 0.01)
+
+    Returns
+    -------
+    ref_durs : ndarray, (n_ref_speakers,)
+        Number of scored frames for each reference speaker.
+
+    sys_durs : ndarray, (n_sys_speakers,)
+        Number of scored frames for each system speaker.
+
+    jer_cm : ndarray, (n_ref_speakers, n_sys_speakers)
+        Contingency matrix between reference and system speakers, as used by
+        JER.
+
+    cm : ndarray, (n_ref_classes, n_sys_classes)
+        Contingency matrix between the flattened reference and system labels,
+        as used by the clustering metrics.
+    """
+    dur = max(score_offset for score_onset, score_offset in score_regions)
+    n_frames = int(dur/step)
+    def _frame_runs(turns):
+        turns = TurnSet.from_turns(turns)
+        if len(turns.file_ids) > 1:
+            raise ValueError('Turns should be from a single file.')
+        bis = _frame_inds(turns.onsets, n_frames, step)
+        eis = _frame_inds(turns.offsets, n_frames, step)
+        return bis, eis, turns.speaker_inds, len(turns.speaker_ids)
+    ref_bis, ref_eis, ref_inds, n_ref = _frame_runs(ref_turns)
+    sys_bis, sys_eis, sys_inds, n_sys = _frame_runs(sys_turns)
+    score_bis, score_eis = _frame_inds(
+        np.reshape(score_regions, (-1, 2)), n_frames, step).T
+
+    # Label runs of frames and weight each by its number of scored frames.
+    bounds = np.unique(np.concatenate(
+        [[0, n_frames], ref_bis, ref_eis, sys_bis, sys_eis, score_bis,
+         score_eis]))
+    ref_labels = coverage(bounds, ref_bis, ref_eis, ref_inds, n_ref) > 0
+    sys_labels = coverage(bounds, sys_bis, sys_eis, sys_inds, n_sys) > 0
+    keep = coverage(bounds, score_bis, score_eis)[:, 0] > 0
+    n_run_frames = np.diff(bounds)*keep
+    ref_labels = ref_labels.astype('int64')
+    sys_labels = sys_labels.astype('int64')
+
+    ref_durs = n_run_frames.dot(ref_labels)
+    sys_durs = n_run_frames.dot(sys_labels)
+    jer_cm = (ref_labels.T*n_run_frames).dot(sys_labels)
+
+    # Contingency matrix over classes observed in scored frames.
+    keep = n_run_frames > 0
+    ref_classes, ref_class_inds = np.unique(
+        flatten_labels(ref_labels[keep]), return_inverse=True)
+    sys_classes, sys_class_inds = np.unique(
+        flatten_labels(sys_labels[keep]), return_inverse=True)
+    cm = np.zeros((ref_classes.size, sys_classes.size), dtype='int64')
+    np.add.at(cm, (ref_class_inds, sys_class_inds), n_run_frames[keep])
+
+    return ref_durs, sys_durs, jer_cm, cm
+
+
 # TODO: Consider mapping all speech overlaps to a single class.
 def flatten_labels(labels):
     """Helper function to convert output of ``turns_to_frames`` to 1-D array of
@@ -156,10 +251,10 @@ def score(ref_turns, sys_turns, uem, step=0.010, nats=False, jer_min_ref_dur=0.0
 
     Parameters
     ----------
-    ref_turns : list of Turn
+    ref_turns : list of Turn or TurnSet
         Reference speaker turns.
 
-    sys_turns : list of Turn
+    sys_turns : list of Turn or TurnSet
         System speaker turns.
 
     uem : UEM
@@ -197,12 +292,10 @@ def score(ref_turns, sys_turns, uem, step=0.010, nats=False, jer_min_ref_dur=0.0
         jer_min_ref_dur = int(jer_min_ref_dur/step)
 
     # Build contingency matrices.
-    file_to_ref_turns = defaultdict(
-        list,
-        {fid : list(g) for fid, g in groupby(ref_turns, lambda x: x.file_id)})
-    file_to_sys_turns =defaultdict(
-        list,
-        {fid : list(g) for fid, g in groupby(sys_turns, lambda x: x.file_id)})
+    ref_turns = TurnSet.from_turns(ref_turns)
+    sys_turns = TurnSet.from_turns(sys_turns)
+    file_to_ref_turns = defaultdict(list, ref_turns.groupby_file())
+    file_to_sys_turns = defaultdict(list, sys_turns.groupby_file())
     file_to_cm = {} # Map from files to contingency matrices used by
                     # clustering metrics.
     file_to_jer_cm = {} # Map from files to contingency matrices used by
@@ -212,22 +305,18 @@ def score(ref_turns, sys_turns, uem, step=0.010, nats=False, jer_min_ref_dur=0.0
     file_to_sys_durs = {} # Map from files to speaker durations in system
                           # segmentation.
     for file_id, score_regions in iteritems(uem):
-        ref_labels = turns_to_frames(
-            file_to_ref_turns[file_id], score_regions, step=step)
-        sys_labels = turns_to_frames(
-            file_to_sys_turns[file_id], score_regions, step=step)
-        file_to_ref_durs[file_id] = ref_labels.sum(axis=0)
-        file_to_sys_durs[file_id] = sys_labels.sum(axis=0)
-        file_to_jer_cm[file_id] = metrics.contingency_matrix(
-            ref_labels, sys_labels)
-        file_to_cm[file_id] = metrics.contingency_matrix(
-            flatten_labels(ref_labels), flatten_labels(sys_labels))
-    global_cm = block_diag(*list(itervalues(file_to_cm)))
+        (file_to_ref_durs[file_id], file_to_sys_durs[file_id],
+         file_to_jer_cm[file_id], file_to_cm[file_id]) = turns_to_frame_counts(
+             file_to_ref_turns[file_id], file_to_sys_turns[file_id],
+             score_regions, step=step)
+    global_cm = block_diag(list(itervalues(file_to_cm)), format='coo')
     # Above line has the undesirable property of claiming silence on
     # different files is a different category. However, leave it in for
     # consistency with how the clustering metrics were computed in DIHARD I.
+    # The matrix is kept sparse as it grows quadratically with the number of
+    # files.
 
-    # Compute DER. This bit is slow as it relies on NIST's perl script.
+    # Compute DER.
     file_to_der, global_der = metrics.der(
         ref_turns, sys_turns, uem=uem, **kwargs)
 
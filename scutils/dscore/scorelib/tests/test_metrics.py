@@ -6,6 +6,8 @@ import itertools
 import os
 
 import numpy as np
+from scipy.linalg import block_diag
+from scipy.sparse import coo_matrix
 from numpy.testing import (assert_almost_equal, assert_equal,
                            assert_raises_regex)
 
@@ -14,6 +16,8 @@ from scorelib.metrics import (bcubed, conditional_entropy, contingency_matrix,
                               mutual_information)
 from scorelib.rttm import load_rttm
 from scorelib.score import turns_to_frames
+from scorelib.turn import Turn
+from scorelib.uem import UEM
 
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -117,6 +121,31 @@ def test_mutual_information():
     assert_almost_equal(nmi, 0.001116, 5)
 
 
+def test_sparse_cm():
+    # Clustering metrics should agree for dense and sparse block diagonal
+    # contingency matrices.
+    x, y = make_labels()
+    cm1 = contingency_matrix(x, y)
+    x, y = make_labels(n_classes=5, seed=1234)
+    cm2 = contingency_matrix(x, y)
+    cm = block_diag(cm1, cm2)
+    sparse_cm = coo_matrix(cm)
+    assert_almost_equal(
+        bcubed(None, None, sparse_cm), bcubed(None, None, cm))
+    assert_almost_equal(
+        goodman_kruskal_tau(None, None, sparse_cm),
+        goodman_kruskal_tau(None, None, cm))
+    assert_almost_equal(
+        conditional_entropy(None, None, sparse_cm),
+        conditional_entropy(None, None, cm))
+    assert_almost_equal(
+        conditional_entropy(None, None, sparse_cm.T),
+        conditional_entropy(None, None, cm.T))
+    assert_almost_equal(
+        mutual_information(None, None, sparse_cm),
+        mutual_information(None, None, cm))
+
+
 def test_der():
     ref_turns, _, _ = load_rttm(
         os.path.join(TEST_DIR, 'ref.rttm'))
@@ -127,6 +156,40 @@ def test_der():
     assert_almost_equal(file_to_der['FILE1'], expected_der, 3)
     assert_almost_equal(global_der, expected_der, 3)
 
+    # Collars and overlap exclusion; expected values are from md-eval-22.pl.
+    for collar, ignore_overlaps, expected_der in [
+            (0.0, True, 23.3559),
+            (0.25, False, 24.0114),
+            (0.25, True, 21.5329)]:
+        file_to_der, global_der = der(
+            ref_turns, sys_turns, collar=collar,
+            ignore_overlaps=ignore_overlaps)
+        assert_almost_equal(file_to_der['FILE1'], expected_der, 3)
+        assert_almost_equal(global_der, expected_der, 3)
+
+    # Overlap starting exactly at a scoring region onset; md-eval still scores
+    # the overlapped region.
+    ref_turns_ov = [
+        Turn(1.5, 3.36, speaker_id='r0', file_id='FILE1'),
+        Turn(1.5, 3.36, speaker_id='r2', file_id='FILE1'),
+        Turn(5.0, 6.5, speaker_id='r1', file_id='FILE1')]
+    sys_turns_ov = [
+        Turn(1.6, 2.6, speaker_id='s0', file_id='FILE1'),
+        Turn(5.0, 6.0, speaker_id='s1', file_id='FILE1')]
+    uem = UEM({'FILE1': [(1.5, 3.36), (4.78, 6.93), (7.5, 9.11)]})
+    file_to_der, global_der = der(
+        ref_turns_ov, sys_turns_ov, collar=0.0, ignore_overlaps=True, uem=uem)
+    assert_almost_equal(file_to_der['FILE1'], 61.6858, 3)
+    assert_almost_equal(global_der, 61.6858, 3)
+
+    # Edge case: file without reference turns.
+    sys_turns.append(Turn(0, 1, speaker_id='speaker1', file_id='FILE2'))
+    uem = UEM({'FILE1': [(0, 20)], 'FILE2': [(0, 20)], 'FILE3': [(0, 20)]})
+    file_to_der, global_der = der(ref_turns, sys_turns, uem=uem)
+    assert file_to_der['FILE2'] == 100.
+    assert file_to_der['FILE3'] == 0.
+    assert_almost_equal(global_der, file_to_der['FILE1'], 3)
+
 
 def test_jer():
     # Check input validation.
@@ -0,0 +1,101 @@
+"""Tests for RTTM utilities."""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import tempfile
+
+from numpy.testing import assert_raises_regex
+
+from scorelib.rttm import load_rttm, validate_rttm
+from scorelib.turn import Turn, TurnSet
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TMP_DIR = tempfile.mkdtemp(prefix="dscore_scorelib_test_rttm__")
+
+
+def _write_rttm(lines):
+    rttmf = os.path.join(TMP_DIR, 'test.rttm')
+    with open(rttmf, 'wb') as f:
+        f.write('\n'.join(lines).encode('utf-8'))
+    return rttmf
+
+
+def test_load_rttm():
+    rttmf = _write_rttm([
+        'SPKR-INFO FILE1 1 <NA> <NA> <NA> unknown S2 <NA>',
+        'SPEAKER FILE1 1 5.0 1.5 <NA> <NA> S2 <NA> <NA>',
+        'SPEAKER\tFILE1  1 0.25 4.75 <NA> <NA> S1 <NA> <NA>\r',
+        'SPEAKER FILE2 1 1 1 <NA> <NA> S1 <NA>'])
+    expected_turns = [
+        Turn(5.0, dur=1.5, speaker_id='S2', file_id='FILE1'),
+        Turn(0.25, dur=4.75, speaker_id='S1', file_id='FILE1'),
+        Turn(1.0, dur=1.0, speaker_id='S1', file_id='FILE2'),
+        ]
+    turns, speaker_ids, file_ids = load_rttm(rttmf)
+    assert turns == expected_turns
+    assert speaker_ids == {'S1', 'S2'}
+    assert file_ids == {'FILE1', 'FILE2'}
+    turns, _, _ = load_rttm(rttmf, as_turnset=True)
+    assert isinstance(turns, TurnSet)
+    assert turns.to_turns() == expected_turns
+
+    # Non-ASCII ids are parsed line by line, with same result.
+    rttmf = _write_rttm([
+        'SPEAKER FILE1 1 5.0 1.5 <NA> <NA> Sé <NA> <NA>'])
+    turns, speaker_ids, _ = load_rttm(rttmf)
+    assert turns == [
+        Turn(5.0, dur=1.5, speaker_id='Sé', file_id='FILE1')]
+    assert speaker_ids == {'Sé'}
+
+    # Real data.
+    turns, _, _ = load_rttm(os.path.join(TEST_DIR, 'ref.rttm'))
+    turnset, _, _ = load_rttm(
+        os.path.join(TEST_DIR, 'ref.rttm'), as_turnset=True)
+    assert turnset.to_turns() == turns
+
+
+def test_load_rttm_file_object():
+    # Same result for a path and an open file, which is not closed.
+    rttmf = os.path.join(TEST_DIR, 'ref.rttm')
+    turns, speaker_ids, file_ids = load_rttm(rttmf)
+    with open(rttmf, 'rb') as f:
+        assert load_rttm(f) == (turns, speaker_ids, file_ids)
+        assert not f.closed
+    data = io.BytesIO(b'SPEAKER FILE1 1 5.0 1.5 <NA> <NA> S\xc3\xa9 <NA> <NA>\n')
+    turns, _, _ = load_rttm(data)
+    assert turns == [Turn(5.0, dur=1.5, speaker_id='S\xe9', file_id='FILE1')]
+    data = io.BytesIO(b'SPEAKER FILE1 1 x 1.5 <NA> <NA> S1 <NA> <NA>\n')
+    file_ids, speaker_ids, error_messages = validate_rttm(data)
+    assert file_ids == set()
+    assert len(error_messages) == 1
+
+
+def test_load_rttm_errors():
+    # First invalid line is reported.
+    valid_line = 'SPEAKER FILE1 1 5.0 1.5 <NA> <NA> S1 <NA> <NA>'
+    for line, msg in [
+            ('SPEAKER FILE1 1 5.0 1.5 <NA> <NA> S1',
+             'Number of fields < 9. LINE: "SPEAKER FILE1 1 5.0 1.5 <NA> '
+             '<NA> S1"'),
+            ('SPEAKER FILE1 1 x 1.5 <NA> <NA> S1 <NA> <NA>',
+             'Turn onset not FLOAT.'),
+            ('SPEAKER FILE1 1 -1 1.5 <NA> <NA> S1 <NA> <NA>',
+             'Turn onset < 0 seconds.'),
+            ('SPEAKER FILE1 1 5.0 x <NA> <NA> S1 <NA> <NA>',
+             'Turn duration not FLOAT.'),
+            ('SPEAKER FILE1 1 5.0 0 <NA> <NA> S1 <NA> <NA>',
+             'Turn duration <= 0 seconds.'),
+            ]:
+        rttmf = _write_rttm([valid_line, line, 'SPEAKER FILE1 1 x'])
+        for as_turnset in [False, True]:
+            with assert_raises_regex(IOError, msg):
+                load_rttm(rttmf, as_turnset=as_turnset)
+
+
+def teardown_module():
+    if os.path.isdir(TMP_DIR):
+        shutil.rmtree(TMP_DIR)
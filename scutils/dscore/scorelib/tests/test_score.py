@@ -8,7 +8,9 @@ import numpy as np
 from numpy.testing import (assert_almost_equal, assert_equal, assert_raises_regex)
 
 from scorelib.rttm import load_rttm
-from scorelib.score import flatten_labels, score, turns_to_frames, Scores
+from scorelib.metrics import contingency_matrix
+from scorelib.score import (flatten_labels, score, turns_to_frame_counts,
+                            turns_to_frames, Scores)
 from scorelib.turn import Turn
 from scorelib.uem import UEM
 
@@ -41,6 +43,38 @@ def test_turns_to_frames():
     assert_equal(labels, expected_labels)
 
 
+def test_turns_to_frame_counts():
+    # Check validation.
+    turns = [
+        Turn(0, 11, speaker_id='S1', file_id='FILE1'),
+        Turn(5, 11, speaker_id='S2', file_id='FILE2'),
+        ]
+    with assert_raises_regex(ValueError, 'Turns should be from'):
+        turns_to_frame_counts(turns, [], [(0, 1)], step=0.1)
+
+    # Check that file containing no speech has a single silence class.
+    ref_durs, sys_durs, jer_cm, cm = turns_to_frame_counts(
+        [], [], [(0, 1)], step=0.1)
+    assert_equal(ref_durs, np.zeros(0, dtype='int64'))
+    assert_equal(jer_cm, np.zeros((0, 0), dtype='int64'))
+    assert_equal(cm, [[10]])
+
+    # Check agreement with frame-level labels on real data with several
+    # scoring regions.
+    ref_turns, _, _ = load_rttm(os.path.join(TEST_DIR, 'ref.rttm'))
+    sys_turns, _, _ = load_rttm(os.path.join(TEST_DIR, 'sys.rttm'))
+    score_regions = [(0.5, 10.123), (12.0, 30.0), (31.337, 43.0)]
+    ref_labels = turns_to_frames(ref_turns, score_regions)
+    sys_labels = turns_to_frames(sys_turns, score_regions)
+    ref_durs, sys_durs, jer_cm, cm = turns_to_frame_counts(
+        ref_turns, sys_turns, score_regions)
+    assert_equal(ref_durs, ref_labels.sum(axis=0))
+    assert_equal(sys_durs, sys_labels.sum(axis=0))
+    assert_equal(jer_cm, contingency_matrix(ref_labels, sys_labels))
+    assert_equal(cm, contingency_matrix(
+        flatten_labels(ref_labels), flatten_labels(sys_labels)))
+
+
 def test_flatten_labels():
     # No speech.
     assert_equal(flatten_labels(np.zeros((5, 0), dtype='int64')),
@@ -76,3 +110,11 @@ def test_score():
     expected_scores = expected_scores._replace(file_id='*** OVERALL ***')
     assert global_scores.file_id == expected_scores.file_id
     assert_almost_equal(global_scores[1:], expected_scores[1:], 3)
+
+    # Same scores from TurnSet.
+    ref_turns, _, _ = load_rttm(
+        os.path.join(TEST_DIR, 'ref.rttm'), as_turnset=True)
+    sys_turns, _, _ = load_rttm(
+        os.path.join(TEST_DIR, 'sys.rttm'), as_turnset=True)
+    _, turnset_global_scores = score(ref_turns, sys_turns, uem)
+    assert_almost_equal(turnset_global_scores[1:], global_scores[1:], 10)
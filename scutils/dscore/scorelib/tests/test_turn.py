@@ -7,10 +7,47 @@ from intervaltree import Interval, IntervalTree
 
 import pytest
 
-from scorelib.turn import chop_tree, merge_turns, trim_turns, Turn
+from scorelib.turn import chop_tree, merge_turns, trim_turns, Turn, TurnSet
 from scorelib.uem import UEM
 
 
+def test_turn_set():
+    turns = [
+        Turn(6, 10, speaker_id='S2', file_id='FILE2'),
+        Turn(0, dur=5, speaker_id='S1', file_id='FILE1'),
+        Turn(2, 3, speaker_id='S2', file_id='FILE1'),
+        ]
+    turnset = TurnSet.from_turns(turns)
+    assert len(turnset) == 3
+    assert turnset.speaker_ids == ['S1', 'S2']
+    assert turnset.file_ids == ['FILE1', 'FILE2']
+    assert list(turnset) == turns
+    assert turnset[-1] == turns[-1]
+    assert turnset[1:].to_turns() == turns[1:]
+
+    # Subsets only keep ids that are still referenced.
+    file_ids, groups = zip(*turnset.groupby_file())
+    assert file_ids == ('FILE1', 'FILE2')
+    assert groups[1].speaker_ids == ['S2']
+    assert groups[0].to_turns() == turns[1:]
+
+    # Building from columns.
+    turnset = TurnSet.from_columns(
+        [6, 0, 2], ['S2', 'S1', 'S2'], ['FILE2', 'FILE1', 'FILE1'],
+        offsets=[10, 5, 3])
+    assert list(turnset) == turns
+    with pytest.raises(ValueError):
+        TurnSet.from_columns([0], ['S1'], ['FILE1'])
+    with pytest.raises(ValueError):
+        TurnSet.from_columns([0], ['S1'], ['FILE1'], durs=[0])
+
+    # Concatenation re-interns ids.
+    turnset = TurnSet.concatenate(
+        [TurnSet.from_turns(turns[:1]), TurnSet.from_turns(turns[1:])])
+    assert turnset.speaker_ids == ['S1', 'S2']
+    assert list(turnset) == turns
+
+
 def test_merge_turns():
     expected_turns = [
         Turn(0, 11, speaker_id='S1', file_id='FILE1'),
@@ -25,6 +62,30 @@ def test_merge_turns():
         ]
     assert set(expected_turns) == set(merge_turns(turns))
 
+    # Touching turns are not merged and turns by speakers without any
+    # overlap are returned as is.
+    turns = [
+        Turn(5, 6, speaker_id='S1', file_id='FILE1'),
+        Turn(0, 5, speaker_id='S1', file_id='FILE1'),
+        Turn(0, 2, speaker_id='S2', file_id='FILE1'),
+        Turn(1, 3, speaker_id='S2', file_id='FILE1'),
+        Turn(2.5, 4, speaker_id='S2', file_id='FILE1'),
+        Turn(6, 7, speaker_id='S2', file_id='FILE1'),
+        ]
+    expected_turns = [
+        Turn(5, 6, speaker_id='S1', file_id='FILE1'),
+        Turn(0, 5, speaker_id='S1', file_id='FILE1'),
+        Turn(0, 4, speaker_id='S2', file_id='FILE1'),
+        Turn(6, 7, speaker_id='S2', file_id='FILE1'),
+        ]
+    assert expected_turns == merge_turns(turns)
+    assert merge_turns([]) == []
+
+    # TurnSet in, TurnSet out.
+    merged_turns = merge_turns(TurnSet.from_turns(turns))
+    assert isinstance(merged_turns, TurnSet)
+    assert expected_turns == merged_turns.to_turns()
+
 
 def test_trim_turns():
     turns = [
@@ -52,6 +113,32 @@ def test_trim_turns():
         ]
     assert set(expected_turns) == set(trim_turns(turns, None, 2, 7))
 
+    # Turns spanning several scoring regions are split, but not at the
+    # boundary between touching regions.
+    turns = [
+        Turn(1, 10, speaker_id='S1', file_id='FILE1'),
+        Turn(1, 10, speaker_id='S1', file_id='FILE1'),
+        Turn(5, 6, speaker_id='S2', file_id='FILE1'),
+        ]
+    uem = UEM({'FILE1' : [(0, 2), (3, 5), (5, 8), (9, 9.5)]})
+    expected_turns = [
+        Turn(1, 2, speaker_id='S1', file_id='FILE1'),
+        Turn(3, 8, speaker_id='S1', file_id='FILE1'),
+        Turn(9, 9.5, speaker_id='S1', file_id='FILE1'),
+        Turn(5, 6, speaker_id='S2', file_id='FILE1'),
+        ]
+    assert sorted(expected_turns, key=lambda x: (x.onset, x.speaker_id)) == \
+        sorted(trim_turns(turns, uem), key=lambda x: (x.onset, x.speaker_id))
+
+    # TurnSet in, TurnSet out.
+    trimmed_turns = trim_turns(TurnSet.from_turns(turns), uem)
+    assert isinstance(trimmed_turns, TurnSet)
+    assert trimmed_turns.to_turns() == trim_turns(turns, uem)
+
+    # No scoring regions.
+    assert trim_turns(turns, UEM({'FILE1' : []})) == []
+    assert len(trim_turns(TurnSet.from_turns(turns), UEM({'FILE1' : []}))) == 0
+
 
 def test_chop_tree():
     def _get_tree():
@@ -3,17 +3,17 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from intervaltree import Interval, IntervalTree
+import itertools
 
-from .six import python_2_unicode_compatible
-from .uem import UEM
-from .utils import groupby, warn, xor
+from intervaltree import Interval
+import numpy as np
 
-__all__ = ['merge_turns', 'trim_turns', 'Turn']
+from .six import integer_types, python_2_unicode_compatible
+from .uem import UEM
+from .utils import warn, xor
 
+__all__ = ['merge_turns', 'trim_turns', 'Turn', 'TurnSet']
 
-# TODO: intervaltree is pure Python and a bit of a bottleneck. Explore
-#       alternatives.
 
 @python_2_unicode_compatible
 class Turn(object):
@@ -44,6 +44,8 @@ class Turn(object):
         File id.
         (Default: none)
     """
+    __slots__ = ('onset', 'offset', 'dur', 'speaker_id', 'file_id')
+
     def __init__(self, onset, offset=None, dur=None, speaker_id=None,
                  file_id=None):
         if not xor(offset is None, dur is None):
@@ -64,7 +66,8 @@ class Turn(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return all(getattr(self, attr) == getattr(other, attr)
+                       for attr in self.__slots__)
         return False
 
     def __ne__(self, other):
@@ -88,30 +91,302 @@ class Turn(object):
                 (self.onset, self.offset, speaker_id, file_id))
 
 
+def _intern(ids):
+    """Return sorted unique ids and the index of each of ``ids`` into them."""
+    ids = list(ids)
+    unique_ids = sorted(set(ids))
+    id_to_ind = {id_ : ind for ind, id_ in enumerate(unique_ids)}
+    inds = np.array([id_to_ind[id_] for id_ in ids], dtype='int64')
+    return unique_ids, inds
+
+
+def _compact_ids(ids, inds):
+    """Drop ids not referenced by ``inds`` and renumber ``inds``."""
+    used_inds, inds = np.unique(inds, return_inverse=True)
+    return [ids[ind] for ind in used_inds.tolist()], inds.astype('int64')
+
+
+class TurnSet(object):
+    """Columnar collection of speaker turns.
+
+    Holds the same information as a list of ``Turn``, but as NumPy arrays, with
+    speaker and file ids interned as integer indices into sorted lists of the
+    distinct ids. Iterating over a ``TurnSet`` yields ``Turn`` instances.
+    Indexing with an integer returns a ``Turn``, while indexing with a slice,
+    boolean mask, or integer array returns a new ``TurnSet``.
+
+    Parameters
+    ----------
+    onsets : ndarray, (n_turns,)
+        Onsets of turns in seconds from beginning of recording.
+
+    offsets : ndarray, (n_turns,)
+        Offsets of turns in seconds from beginning of recording.
+
+    durs : ndarray, (n_turns,)
+        Durations of turns in seconds.
+
+    speaker_inds : ndarray, (n_turns,)
+        Index of speaker id of each turn in ``speaker_ids``.
+
+    file_inds : ndarray, (n_turns,)
+        Index of file id of each turn in ``file_ids``.
+
+    speaker_ids : list of str
+        Sorted speaker ids. Each should be referenced by at least one turn.
+
+    file_ids : list of str
+        Sorted file ids. Each should be referenced by at least one turn.
+    """
+    def __init__(self, onsets, offsets, durs, speaker_inds, file_inds,
+                 speaker_ids, file_ids):
+        self.onsets = np.asarray(onsets, dtype='float64')
+        self.offsets = np.asarray(offsets, dtype='float64')
+        self.durs = np.asarray(durs, dtype='float64')
+        self.speaker_inds = np.asarray(speaker_inds, dtype='int64')
+        self.file_inds = np.asarray(file_inds, dtype='int64')
+        self.speaker_ids = list(speaker_ids)
+        self.file_ids = list(file_ids)
+
+    @classmethod
+    def from_columns(cls, onsets, speaker_ids, file_ids, offsets=None,
+                     durs=None):
+        """Return ``TurnSet`` built from per-turn columns.
+
+        Parameters
+        ----------
+        onsets : array_like, (n_turns,)
+            Onsets of turns in seconds from beginning of recording.
+
+        speaker_ids : list of str
+            Speaker id of each turn.
+
+        file_ids : list of str
+            File id of each turn.
+
+        offsets : array_like, (n_turns,), optional
+            Offsets of turns in seconds from beginning of recording. If None,
+            then computed from ``onsets`` and ``durs``.
+            (Default: None)
+
+        durs : array_like, (n_turns,), optional
+            Durations of turns in seconds. If None, then computed from
+            ``onsets`` and ``offsets``.
+            (Default: None)
+
+        Returns
+        -------
+        turns : TurnSet
+            Speaker turns.
+        """
+        if not xor(offsets is None, durs is None):
+            raise ValueError('Exactly one of offsets or durs must be given')
+        onsets = np.asarray(onsets, dtype='float64')
+        if offsets is not None:
+            offsets = np.asarray(offsets, dtype='float64')
+            durs = offsets - onsets
+        else:
+            durs = np.asarray(durs, dtype='float64')
+            offsets = onsets + durs
+        speaker_ids, speaker_inds = _intern(speaker_ids)
+        file_ids, file_inds = _intern(file_ids)
+        if not (onsets.shape == durs.shape == speaker_inds.shape ==
+                file_inds.shape):
+            raise ValueError('All columns must have same length')
+        if (onsets < 0).any():
+            raise ValueError('Turn onset must be >= 0 seconds')
+        if (durs <= 0).any():
+            raise ValueError('Turn duration must be > 0 seconds')
+        return cls(onsets, offsets, durs, speaker_inds, file_inds,
+                   speaker_ids, file_ids)
+
+    @classmethod
+    def from_turns(cls, turns):
+        """Return ``TurnSet`` holding ``turns``.
+
+        If ``turns`` is already a ``TurnSet``, it is returned unchanged.
+        """
+        if isinstance(turns, TurnSet):
+            return turns
+        turns = list(turns)
+        speaker_ids, speaker_inds = _intern(
+            [turn.speaker_id for turn in turns])
+        file_ids, file_inds = _intern([turn.file_id for turn in turns])
+        return cls(
+            [turn.onset for turn in turns], [turn.offset for turn in turns],
+            [turn.dur for turn in turns], speaker_inds, file_inds,
+            speaker_ids, file_ids)
+
+    @classmethod
+    def concatenate(cls, turnsets):
+        """Return ``TurnSet`` holding the turns of all of ``turnsets``."""
+        turnsets = [cls.from_turns(turns) for turns in turnsets]
+        def _merge_ids(attr):
+            ids = sorted(set(itertools.chain.from_iterable(
+                getattr(turns, attr + '_ids') for turns in turnsets)))
+            id_to_ind = {id_ : ind for ind, id_ in enumerate(ids)}
+            inds = [np.zeros(0, dtype='int64')]
+            for turns in turnsets:
+                remap = np.array(
+                    [id_to_ind[id_] for id_ in getattr(turns, attr + '_ids')],
+                    dtype='int64')
+                inds.append(remap[getattr(turns, attr + '_inds')])
+            return ids, np.concatenate(inds)
+        speaker_ids, speaker_inds = _merge_ids('speaker')
+        file_ids, file_inds = _merge_ids('file')
+        def _column(attr):
+            return np.concatenate(
+                [np.zeros(0)] + [getattr(turns, attr) for turns in turnsets])
+        return cls(
+            _column('onsets'), _column('offsets'), _column('durs'),
+            speaker_inds, file_inds, speaker_ids, file_ids)
+
+    def _take(self, key, onsets=None, offsets=None):
+        """Return ``TurnSet`` of turns selected by ``key``.
+
+        If ``onsets`` and ``offsets`` are given, they replace the onsets and
+        offsets of the selected turns.
+        """
+        if onsets is None:
+            onsets = self.onsets[key]
+            offsets = self.offsets[key]
+            durs = self.durs[key]
+        else:
+            durs = offsets - onsets
+        speaker_ids, speaker_inds = _compact_ids(
+            self.speaker_ids, self.speaker_inds[key])
+        file_ids, file_inds = _compact_ids(self.file_ids, self.file_inds[key])
+        return TurnSet(
+            onsets, offsets, durs, speaker_inds, file_inds, speaker_ids,
+            file_ids)
+
+    def _file_groups(self):
+        """Yield file ids and indices of their turns, sorted by file id."""
+        order = np.argsort(self.file_inds, kind='mergesort')
+        bounds = np.searchsorted(
+            self.file_inds[order], np.arange(len(self.file_ids) + 1))
+        for file_ind, file_id in enumerate(self.file_ids):
+            yield file_id, order[bounds[file_ind]:bounds[file_ind + 1]]
+
+    def groupby_file(self):
+        """Yield ``(file_id, turns)`` pairs in sorted order of file id.
+
+        Within each file, turns are kept in their original order.
+        """
+        for file_id, inds in self._file_groups():
+            yield file_id, self._take(inds)
+
+    def to_turns(self):
+        """Return turns as list of ``Turn``."""
+        return list(self)
+
+    def __len__(self):
+        return self.onsets.size
+
+    def __iter__(self):
+        # Turns were validated when the TurnSet was built, so set fields
+        # directly rather than going through ``Turn.__init__``.
+        speaker_ids = [self.speaker_ids[ind]
+                       for ind in self.speaker_inds.tolist()]
+        file_ids = [self.file_ids[ind] for ind in self.file_inds.tolist()]
+        for turn_fields in zip(
+                self.onsets.tolist(), self.offsets.tolist(),
+                self.durs.tolist(), speaker_ids, file_ids):
+            turn = Turn.__new__(Turn)
+            (turn.onset, turn.offset, turn.dur, turn.speaker_id,
+             turn.file_id) = turn_fields
+            yield turn
+
+    def __getitem__(self, key):
+        if isinstance(key, integer_types + (np.integer, )):
+            turn = Turn(
+                float(self.onsets[key]), float(self.offsets[key]),
+                speaker_id=self.speaker_ids[self.speaker_inds[key]],
+                file_id=self.file_ids[self.file_inds[key]])
+            turn.dur = float(self.durs[key])
+            return turn
+        return self._take(key)
+
+    def __repr__(self):
+        return ('TurnSet(%d turns, %d speakers, %d files)' %
+                (len(self), len(self.speaker_ids), len(self.file_ids)))
+
+
 def merge_turns(turns):
-    """Merge overlapping turns by same speaker within each file."""
+    """Merge overlapping turns by same speaker within each file.
+
+    Parameters
+    ----------
+    turns : list of Turn or TurnSet
+        Speaker turns.
+
+    Returns
+    -------
+    merged_turns : list of Turn or TurnSet
+        Merged turns, of same type as ``turns``.
+    """
+    is_turnset = isinstance(turns, TurnSet)
+    turns = TurnSet.from_turns(turns)
+    if not len(turns):
+        return turns if is_turnset else []
+
     # Merge separately within each file and for each speaker.
-    new_turns = []
-    for (file_id, speaker_id), speaker_turns in groupby(
-            turns, lambda x: (x.file_id, x.speaker_id)):
-        speaker_turns = list(speaker_turns)
-        speaker_it = IntervalTree.from_tuples(
-            [(turn.onset, turn.offset) for turn in speaker_turns])
-        n_turns_pre = len(speaker_it)
-        speaker_it.merge_overlaps()
-        n_turns_post = len(speaker_it)
-        if n_turns_post < n_turns_pre:
-            speaker_turns = []
-            for intrvl in speaker_it:
-                speaker_turns.append(
-                    Turn(intrvl.begin, intrvl.end, speaker_id=speaker_id,
-                         file_id=file_id))
-            speaker_turns = sorted(
-                speaker_turns, key=lambda x: (x.onset, x.offset))
-            warn('Merging overlapping speaker turns. '
-                 'FILE: %s, SPEAKER: %s' % (file_id, speaker_id))
-        new_turns.extend(speaker_turns)
-    return new_turns
+    n_speakers = len(turns.speaker_ids)
+    group_keys, turn_groups = np.unique(
+        turns.file_inds*n_speakers + turns.speaker_inds, return_inverse=True)
+    n_groups = group_keys.size
+
+    # Sort turns within each group and drop duplicates.
+    order = np.lexsort((turns.offsets, turns.onsets, turn_groups))
+    groups = turn_groups[order]
+    onsets = turns.onsets[order]
+    offsets = turns.offsets[order]
+    keep = np.ones(order.size, dtype=bool)
+    keep[1:] = ((groups[1:] != groups[:-1]) | (onsets[1:] != onsets[:-1]) |
+                (offsets[1:] != offsets[:-1]))
+    groups, onsets, offsets = groups[keep], onsets[keep], offsets[keep]
+    n_turns_pre = np.bincount(groups, minlength=n_groups)
+
+    # A merged turn starts at each turn beginning at or after the offsets of
+    # all preceding turns in its group. Times are replaced by their ranks so
+    # that the running maximum can be taken over all groups at once.
+    times = np.unique(np.concatenate([onsets, offsets]))
+    onset_keys = groups*times.size + np.searchsorted(times, onsets)
+    offset_keys = groups*times.size + np.searchsorted(times, offsets)
+    is_first = np.ones(groups.size, dtype=bool)
+    is_first[1:] = onset_keys[1:] >= np.maximum.accumulate(offset_keys)[:-1]
+    first_inds = np.flatnonzero(is_first)
+    merged_groups = groups[first_inds]
+    merged_onsets = onsets[first_inds]
+    merged_offsets = np.maximum.reduceat(offsets, first_inds)
+    n_turns_post = np.bincount(merged_groups, minlength=n_groups)
+
+    # Only groups that actually had overlapping turns are replaced.
+    is_merged = n_turns_post < n_turns_pre
+    for group_key in group_keys[is_merged].tolist():
+        warn('Merging overlapping speaker turns. FILE: %s, SPEAKER: %s' %
+             (turns.file_ids[group_key // n_speakers],
+              turns.speaker_ids[group_key % n_speakers]))
+    inds = np.argsort(turn_groups, kind='mergesort')
+    inds = inds[~is_merged[turn_groups[inds]]]
+    is_new = is_merged[merged_groups]
+    merged_groups = merged_groups[is_new]
+    merged_onsets = merged_onsets[is_new]
+    merged_offsets = merged_offsets[is_new]
+    order = np.argsort(
+        np.concatenate([turn_groups[inds], merged_groups]), kind='mergesort')
+    merged_keys = group_keys[merged_groups]
+    new_turns = TurnSet(
+        np.concatenate([turns.onsets[inds], merged_onsets])[order],
+        np.concatenate([turns.offsets[inds], merged_offsets])[order],
+        np.concatenate(
+            [turns.durs[inds], merged_offsets - merged_onsets])[order],
+        np.concatenate(
+            [turns.speaker_inds[inds], merged_keys % n_speakers])[order],
+        np.concatenate(
+            [turns.file_inds[inds], merged_keys // n_speakers])[order],
+        turns.speaker_ids, turns.file_ids)
+    return new_turns if is_turnset else new_turns.to_turns()
 
 
 def chop_tree(tree, onset, offset):
@@ -175,15 +450,28 @@ def chop_tree(tree, onset, offset):
     return overlapped_intervals
 
 
-MAX_SESSION_DUR = 1e6 # Maximum duration (seconds) of session. Any outlandishly
-                      # high number will do.
+def _join_regions(score_regions):
+    """Return sorted onsets and offsets of scoring regions.
+
+    Overlapping or touching regions are joined, so that the regions are
+    separated by no score regions of non-zero duration.
+    """
+    onsets, offsets = np.array(
+        sorted(score_regions), dtype='float64').reshape(-1, 2).T
+    if onsets.size == 0:
+        return onsets, offsets
+    max_offsets = np.maximum.accumulate(offsets)
+    is_first = np.concatenate([[True], onsets[1:] > max_offsets[:-1]])
+    first_inds = np.flatnonzero(is_first)
+    return onsets[first_inds], np.maximum.reduceat(offsets, first_inds)
+
 
 def trim_turns(turns, uem=None, score_onset=None, score_offset=None):
     """Trim turns to scoring regions defined in UEM.
 
     Parameters
     ----------
-    turns : list of Turn
+    turns : list of Turn or TurnSet
         Speaker turns.
 
     uem : UEM, optional
@@ -202,8 +490,8 @@ def trim_turns(turns, uem=None, score_onset=None, score_offset=None):
 
     Returns
     -------
-    trimmed_turns : list of Turn
-        Trimmed turns.
+    trimmed_turns : list of Turn or TurnSet
+        Trimmed turns, of same type as ``turns``.
     """
     # Validate arguments.
     if uem is not None:
@@ -219,44 +507,66 @@ def trim_turns(turns, uem=None, score_onset=None, score_offset=None):
         if score_offset <= score_onset:
             raise ValueError('Scoring region duration must be > 0 seconds')
 
+    is_turnset = isinstance(turns, TurnSet)
+    turns = TurnSet.from_turns(turns)
+
     # If no UEM provided, set each file to have same scoring region:
     # (score_onset, score_offset).
     if uem is None:
-        file_ids = set([turn.file_id for turn in turns])
-        uem = UEM({fid : [(score_onset, score_offset)] for fid in file_ids})
+        uem = UEM(
+            {fid : [(score_onset, score_offset)] for fid in turns.file_ids})
 
     # Trim turns to scoring regions.
-    new_turns = []
-    for file_id, file_turns in groupby(turns, lambda x: x.file_id):
+    piece_inds = [np.zeros(0, dtype='int64')]
+    piece_onsets = [np.zeros(0)]
+    piece_offsets = [np.zeros(0)]
+    for file_id, inds in turns._file_groups():
         if file_id not in uem:
-            for turn in file_turns:
+            for turn in turns[inds]:
                 warn('Skipping turn from file not in UEM. TURN: %s' % turn)
             continue
 
-        # Remove overlaps with no score regions.
-        noscore_tree = IntervalTree.from_tuples([(0.0, MAX_SESSION_DUR)])
-        for score_onset, score_offset in uem[file_id]:
-            noscore_tree.chop(score_onset, score_offset)
-        turns_tree = IntervalTree.from_tuples(
-            (turn.onset, turn.offset, turn) for turn in file_turns)
-        overlapped_turns = set() # Turns found to overlap a no score region.
-        for noscore_intrvl in noscore_tree:
-            overlapped_intrvls = chop_tree(
-                turns_tree, noscore_intrvl.begin, noscore_intrvl.end)
-            overlapped_turns.update(
-                [intrvl.data for intrvl in overlapped_intrvls])
-
-        # Convert interval tree to turns.
-        for intrvl in turns_tree:
-            orig_turn = intrvl.data
-            new_turns.append(Turn(
-                intrvl.begin, intrvl.end, speaker_id=orig_turn.speaker_id,
-                file_id=orig_turn.file_id))
-
-        # Report any overlapping turns to STDERR.
-        for turn in sorted(
-                overlapped_turns, key=lambda x: (x.onset, x.offset)):
+        # Identical turns are only kept once.
+        keys = [turns.durs[inds], turns.offsets[inds], turns.onsets[inds],
+                turns.speaker_inds[inds]]
+        order = np.lexsort(keys)
+        is_dup = np.zeros(inds.size, dtype=bool)
+        is_dup[order[1:]] = np.all(
+            [key[order[1:]] == key[order[:-1]] for key in keys], axis=0)
+        inds = inds[~is_dup]
+
+        # Split each turn into its pieces within the scoring regions.
+        region_onsets, region_offsets = _join_regions(uem[file_id])
+        onsets = turns.onsets[inds]
+        offsets = turns.offsets[inds]
+        first = np.searchsorted(region_offsets, onsets, 'right')
+        n_pieces = np.maximum(
+            np.searchsorted(region_onsets, offsets, 'left') - first, 0)
+        turn_inds = np.repeat(np.arange(inds.size), n_pieces)
+        region_inds = (np.arange(n_pieces.sum()) +
+                       np.repeat(first - np.cumsum(n_pieces) + n_pieces,
+                                 n_pieces))
+        piece_inds.append(inds[turn_inds])
+        piece_onsets.append(
+            np.maximum(onsets[turn_inds], region_onsets[region_inds]))
+        piece_offsets.append(
+            np.minimum(offsets[turn_inds], region_offsets[region_inds]))
+
+        # Report any turns not contained in a single scoring region to
+        # STDERR.
+        first = np.minimum(first, max(region_onsets.size - 1, 0))
+        contained = n_pieces == 1
+        contained[contained] &= (
+            (region_onsets[first[contained]] <= onsets[contained]) &
+            (offsets[contained] <= region_offsets[first[contained]]))
+        overlapped = np.flatnonzero(~contained)
+        overlapped = overlapped[
+            np.lexsort((offsets[overlapped], onsets[overlapped]))]
+        for turn in turns[inds[overlapped]]:
             warn('Truncating turn overlapping non-scoring region. TURN: %s' %
                  turn)
 
-    return new_turns
+    new_turns = turns._take(
+        np.concatenate(piece_inds), np.concatenate(piece_onsets),
+        np.concatenate(piece_offsets))
+    return new_turns if is_turnset else new_turns.to_turns()
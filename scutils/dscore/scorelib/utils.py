@@ -5,21 +5,27 @@ from __future__ import unicode_literals
 import itertools
 import sys
 
+import numpy as np
+
 from . import six
 
-__all__ = ['clip', 'error', 'format_float', 'groupby', 'info', 'warn', 'xor']
+__all__ = ['clip', 'coverage', 'error', 'format_float', 'groupby', 'info', 'warn', 'xor']
 
 
-def error(msg, file=sys.stderr):
+def error(msg, file=None):
     """Log error message ``msg`` to stderr."""
+    if file is None:
+        file = sys.stderr
     msg = 'ERROR: %s' % msg
     if six.PY2:
         msg = msg.encode('utf-8')
     print(msg, file=file)
 
 
-def info(msg, print_level=False, file=sys.stdout):
+def info(msg, print_level=False, file=None):
     """Log info message ``msg`` to stdout."""
+    if file is None:
+        file = sys.stdout
     if print_level:
         msg = 'INFO: %s' %msg
     if six.PY2:
@@ -27,8 +33,10 @@ def info(msg, print_level=False, file=sys.stdout):
     print(msg, file=file)
 
 
-def warn(msg, file=sys.stderr):
+def warn(msg, file=None):
     """Log warning message ``msg`` to stderr."""
+    if file is None:
+        file = sys.stderr
     msg = 'WARNING: %s' %msg
     if six.PY2:
         msg = msg.encode('utf-8')
@@ -66,6 +74,43 @@ def clip(x, lower, upper):
     return min(max(x, lower), upper)
 
 
+def coverage(bounds, onsets, offsets, labels=None, n_labels=1):
+    """Return number of labeled intervals covering each elementary segment.
+
+    Parameters
+    ----------
+    bounds : ndarray, (n_bounds,)
+        Sorted segment boundaries. Must contain every onset and offset.
+
+    onsets : ndarray, (n_intervals,)
+        Interval onsets.
+
+    offsets : ndarray, (n_intervals,)
+        Interval offsets.
+
+    labels : ndarray, (n_intervals,), optional
+        Integer labels of the intervals in ``[0, n_labels)``. If None, all
+        intervals share label 0.
+        (Default: None)
+
+    n_labels : int, optional
+        Number of labels.
+        (Default: 1)
+
+    Returns
+    -------
+    counts : ndarray, (n_bounds - 1, n_labels)
+        The ``k, j``-th entry is the number of intervals with label ``j``
+        covering ``[bounds[k], bounds[k+1])``.
+    """
+    if labels is None:
+        labels = np.zeros(len(onsets), dtype='int64')
+    counts = np.zeros((bounds.size, n_labels), dtype='int64')
+    np.add.at(counts, (np.searchsorted(bounds, onsets), labels), 1)
+    np.add.at(counts, (np.searchsorted(bounds, offsets), labels), -1)
+    return np.cumsum(counts, axis=0)[:-1]
+
+
 def groupby(iterable, keyfunc):
     """Wrapper around ``itertools.groupby`` which sorts data first."""
     iterable = sorted(iterable, key=keyfunc)
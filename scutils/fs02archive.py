@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Scoring of system outputs in (.tar.gz, .tgz, .tar or .zip) archives
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+A system output directory can be given as an archive (a submission packet,
+see submission_packet/), or as a directory inside an archive:
+    <email>_SAD_Submission_1.tar.gz
+    <email>_SAD_Submission_1.tar.gz/<email>_SAD_Submission_1/Dev/
+The files of the archive (at any depth below the directory) are listed as
+ArchiveMember paths, which are matched to the reference files by name like
+the files of a directory, and read with open_file without extracting them.
+Member names are normalized, so that the members of an archive created
+from '.' (e.g. './Dev/FS01_dev_001.txt') are listed as 'Dev/FS01_dev_001.txt'.
+
+Members are read one at a time from the archive opened by this process (one
+archive at a time), so memory does not grow with the size or the number of
+archives scored. Compressed tar members are read in one forward pass when
+read in archive order (see archive_index).
+"""
+
+
+import io, os, posixpath, tarfile, zipfile
+
+
+ARCHIVE_EXTS = ('.tar.gz', '.tgz', '.tar', '.zip')
+
+# archive opened by this process: (pid, path, mtime, size), archive,
+# {name:member} (forked worker processes open the archive again, as the
+# inherited file offset is shared with the parent process)
+_opened = {'key':None, 'archive':None, 'members':None}
+
+
+class ArchiveMember(str):
+    """A file of an archive. The str is '<archive path>/<member name>', so
+    that file names and messages are the same as for an extracted archive;
+    position is the index of the member in the archive."""
+
+    def __new__(cls, archive, name, position=0):
+        member = str.__new__(cls, archive+'/'+name)
+        member.archive, member.name, member.position = archive, name, position
+        return member
+
+    def __getnewargs__(self):
+        # pickled for the worker processes of util.run_jobs
+        return (self.archive, self.name, self.position)
+
+
+def is_archive(file_path):
+    return file_path.lower().endswith(ARCHIVE_EXTS) and os.path.isfile(file_path)
+
+
+""" USAGE: archive_path, member_dir = fs02archive.split_archive_path(inp_path) """
+def split_archive_path(inp_path):
+    # (archive path, member directory ending with '/' or '') of an archive
+    # path, None for other paths
+    parts = inp_path.rstrip('/').split('/')
+    for i in range(len(parts), 0, -1):
+        archive_path = '/'.join(parts[:i])
+        if is_archive(archive_path):
+            member_dir = norm_name('/'.join(parts[i:]))
+            return archive_path, (member_dir+'/' if member_dir else '')
+    return None
+
+
+def norm_name(name):
+    # member name without './' and '//' ('' for the archive root)
+    name = posixpath.normpath(name) if name else ''
+    return '' if name == '.' else name
+
+
+def open_archive(archive_path):
+    # (archive, {name:member}) of the archive, kept open for the next calls
+    st = os.stat(archive_path)
+    key = (os.getpid(), archive_path, st.st_mtime, st.st_size)
+    if _opened['key'] != key:
+        close_archive()
+        if zipfile.is_zipfile(archive_path):
+            archive = zipfile.ZipFile(archive_path)
+            members = {norm_name(x.filename):x for x in archive.infolist() if not x.is_dir()}
+        else:
+            archive = tarfile.open(archive_path, 'r:*')
+            members = {norm_name(x.name):x for x in archive.getmembers() if x.isfile()}
+        _opened.update({'key':key, 'archive':archive, 'members':members})
+    return _opened['archive'], _opened['members']
+
+
+def close_archive():
+    if _opened['archive'] is not None:
+        _opened['archive'].close()
+    _opened.update({'key':None, 'archive':None, 'members':None})
+
+
+def is_hidden(name):
+    # dot files and the resource forks added by macOS zip ('.' and '..'
+    # are not hidden)
+    return any([(x.startswith('.') and x not in ('.', '..')) or x == '__MACOSX'
+                for x in name.split('/')])
+
+
+""" USAGE: members = fs02archive.list_members(archive_path, member_dir) """
+def list_members(archive_path, member_dir=''):
+    # ArchiveMember of every file below member_dir, in archive order
+    _, members = open_archive(archive_path)
+    return [ArchiveMember(archive_path, name, i) for i, name in enumerate(members)
+            if name.startswith(member_dir) and not is_hidden(name)]
+
+
+""" USAGE: with fs02archive.open_file(file_path, 'r') as file: """
+def open_file(file_path, mode='r'):
+    # open(file_path, mode) for files, and a file object streaming the
+    # member for ArchiveMember paths (read modes only)
+    if not isinstance(file_path, ArchiveMember):
+        return open(file_path, mode)
+    archive, members = open_archive(file_path.archive)
+    if file_path.name not in members:
+        raise IOError('File not found in archive: '+file_path)
+    if isinstance(archive, zipfile.ZipFile):
+        file = archive.open(members[file_path.name])
+    else:
+        file = archive.extractfile(members[file_path.name])
+    return file if 'b' in mode else io.TextIOWrapper(file)
+
+
+def exists(file_path):
+    return isinstance(file_path, ArchiveMember) or os.path.exists(file_path)
+
+
+def archive_index(file_path):
+    # sort key of files read in archive order (other files keep their order)
+    if not isinstance(file_path, ArchiveMember):
+        return -1
+    return file_path.position
+
+
+def sort_by_archive(file_names, file_paths):
+    # file_names in the order of their file_paths (e.g. fileDict['hyp']) in
+    # the archive
+    return sorted(file_names, key=lambda fn: archive_index(file_paths[fn]))
+# EOF
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Python port of compute-wer (--text) from the Kaldi Speech Recognition
+#    Toolkit
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Open-Source Software Credits:
+# KALDI         - ASR          -  WER   - (http://kaldi-asr.org),
+#                                         (https://github.com/kaldi-asr/kaldi/
+#                                         blob/master/src/bin/compute-wer.cc)
+###############################################################################
+
+In-process WER engine. This module follows compute-wer.cc (scoring modes,
+sentence counts and the float precision of the printed rates) and the
+LevenshteinEditDistance of Kaldi's util/edit-distance-inl.h (including how
+ties between substitution, deletion and insertion are broken), so that the
+%WER line and the ins/del/sub counts match the ones printed by compute-wer.
+
+Words are encoded as integers and the edit distance table is filled one
+hypothesis word (row) at a time with numpy; the deletions along a row are
+resolved with a running minimum instead of a loop over reference words.
+"""
+
+
+import re
+from collections import namedtuple
+
+import numpy as np
+
+import fs02utils as util
+
+
+WER_MODES = ['all', 'present', 'strict']
+
+
+# edit ops of an alignment (sclite-style names)
+OP_COR, OP_SUB, OP_INS, OP_DEL = 0, 1, 2, 3
+OP_NAMES = ['C', 'S', 'I', 'D']
+
+
+WERScores = namedtuple('WERScores', ['wer', 'n_err', 'n_words', 'n_ins',
+                       'n_del', 'n_sub', 'ser', 'n_sent_err', 'n_sent',
+                       'n_absent'])
+
+
+Alignments = namedtuple('Alignments', ['keys', 'vocab', 'utt', 'op',
+                        'ref_word', 'hyp_word', 'ref_pos', 'n_absent'])
+
+
+def read_text(file_path):
+    """Read a kaldi "text" file as a list of (key, words) tuples, in file
+    order. Lines with a key only are empty transcripts."""
+    trans = []
+    with open(file_path, 'r') as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) == 0:
+                continue
+            trans.append((fields[0], fields[1:]))
+    return trans
+
+
+def encode_words(trans_list):
+    """Map the words of several (key, words) lists to integer arrays, with a
+    single vocabulary shared by all of them. Returns the encoded lists and
+    the vocabulary (list of words)."""
+    vocab = {}
+    encoded = []
+    for trans in trans_list:
+        encoded.append([(key, np.array([vocab.setdefault(w, len(vocab))
+                                        for w in words], dtype=np.int64))
+                        for key, words in trans])
+    return encoded, list(vocab)
+
+
+def pair_utterances(ref_trans, hyp_trans, mode='all'):
+    """Pair the (key, words) lists ref_trans and hyp_trans as compute-wer.
+    mode "present" only keeps references with a hypothesis, "all" pairs
+    missing hypotheses with empty ones and "strict" raises ValueError for
+    them. Returns the (key, ref, hyp) encoded triples, in reference order,
+    the number of references without hypothesis and the vocabulary."""
+    if mode not in WER_MODES:
+        raise ValueError('Mode not in '+', '.join(WER_MODES)+': '+str(mode))
+    (ref_trans, hyp_trans), vocab = encode_words([ref_trans, hyp_trans])
+    hyp_dict = {}
+    for key, hyp in hyp_trans:
+        if key in hyp_dict:
+            raise ValueError('Duplicate key '+key+' in hypothesis')
+        hyp_dict[key] = hyp
+    empty = np.zeros(0, dtype=np.int64)
+    pairs = []
+    n_absent = 0
+    for key, ref in ref_trans:
+        if key not in hyp_dict:
+            if mode == 'strict':
+                raise ValueError('No hypothesis for key '+key+
+                                 ' and strict mode specifier.')
+            n_absent += 1
+            if mode == 'present':
+                continue
+        pairs.append((key, ref, hyp_dict.get(key, empty)))
+    return pairs, n_absent, vocab
+
+
+def next_row(ref, word, i, cost, cols):
+    """Fill row i (hypothesis word word) of the edit distance table from the
+    costs of row i-1. Returns the costs of the row and, for columns 1 to
+    len(ref), whether the cell is reached by sub (or match) or by del."""
+    sub_err = cost[:-1]+(ref != word)
+    ins_err = cost[1:]+1
+    # best cost without deletions, then deletions as a running minimum
+    new_cost = np.empty_like(cost)
+    new_cost[0] = i
+    np.minimum(sub_err, ins_err, out=new_cost[1:])
+    new_cost = np.minimum.accumulate(new_cost-cols)+cols
+    del_err = new_cost[:-1]+1
+    # same choice as kaldi: sub (or match), else del, else ins
+    is_sub = (sub_err < ins_err) & (sub_err < del_err)
+    is_del = ~is_sub & (del_err < ins_err)
+    return new_cost, is_sub, is_del
+
+
+def edit_distance(ref, hyp):
+    """Word-level Levenshtein distance between integer arrays ref and hyp.
+    Returns (n_err, n_ins, n_del, n_sub) as kaldi LevenshteinEditDistance."""
+    n_ref = len(ref)
+    if n_ref == len(hyp) and np.array_equal(ref, hyp):
+        return 0, 0, 0, 0
+    cols = np.arange(n_ref+1)
+    cost = cols.copy()
+    n_ins = np.zeros(n_ref+1, dtype=np.int64)
+    n_del = cols.copy()
+    src_ins = np.empty(n_ref+1, dtype=np.int64)
+    src_del = np.empty(n_ref+1, dtype=np.int64)
+    from_prev = np.ones(n_ref+1, dtype=bool)
+    for i, word in enumerate(hyp, 1):
+        cost, is_sub, is_del = next_row(ref, word, i, cost, cols)
+        # counts of cells reached from the previous hypothesis word
+        src_ins[0], src_del[0] = i, 0
+        src_ins[1:] = np.where(is_sub, n_ins[:-1], n_ins[1:]+1)
+        src_del[1:] = np.where(is_sub, n_del[:-1], n_del[1:])
+        # cells reached by deletions continue from the nearest cell on their
+        # left that was reached from the previous hypothesis word
+        from_prev[1:] = ~is_del
+        anchor = np.maximum.accumulate(np.where(from_prev, cols, 0))
+        n_ins = src_ins[anchor]
+        n_del = src_del[anchor]+cols-anchor
+    n_err, n_ins, n_del = int(cost[-1]), int(n_ins[-1]), int(n_del[-1])
+    return n_err, n_ins, n_del, n_err-n_ins-n_del
+
+
+def align(ref, hyp):
+    """Alignment of integer arrays ref and hyp along the path chosen by kaldi
+    LevenshteinEditDistance. Returns the edit ops (OP_* codes) and the aligned
+    positions in ref and hyp (-1 for insertions and deletions, resp.)."""
+    n_ref, n_hyp = len(ref), len(hyp)
+    if n_ref == n_hyp and np.array_equal(ref, hyp):
+        pos = np.arange(n_ref)
+        return np.full(n_ref, OP_COR, dtype=np.int8), pos, pos.copy()
+    cols = np.arange(n_ref+1)
+    cost = cols.copy()
+    # op reaching each cell of the table (deletions only along row 0)
+    path = np.full((n_hyp+1, n_ref+1), OP_DEL, dtype=np.int8)
+    path[1:, 0] = OP_INS
+    for i, word in enumerate(hyp, 1):
+        cost, is_sub, is_del = next_row(ref, word, i, cost, cols)
+        path[i, 1:] = np.where(is_sub, OP_SUB, np.where(is_del, OP_DEL, OP_INS))
+    # trace back from the last cell
+    ref_pos, hyp_pos = [], []
+    i, j = n_hyp, n_ref
+    while i > 0 or j > 0:
+        op = path[i, j]
+        if op != OP_INS:
+            j -= 1
+        if op != OP_DEL:
+            i -= 1
+        ref_pos.append(j if op != OP_INS else -1)
+        hyp_pos.append(i if op != OP_DEL else -1)
+    ref_pos = np.array(ref_pos[::-1], dtype=np.int64)
+    hyp_pos = np.array(hyp_pos[::-1], dtype=np.int64)
+    ops = np.where(ref_pos < 0, OP_INS, np.where(hyp_pos < 0, OP_DEL, OP_SUB))
+    is_cor = ops == OP_SUB
+    is_cor[is_cor] = ref[ref_pos[is_cor]] == hyp[hyp_pos[is_cor]]
+    ops[is_cor] = OP_COR
+    return ops.astype(np.int8), ref_pos, hyp_pos
+
+
+def get_rate(n_err, n_total):
+    # compute-wer keeps rates as (32-bit) BaseFloat
+    n_err, n_total = float(np.float32(n_err)), float(np.float32(n_total))
+    if n_total == 0:
+        return float('nan') if n_err == 0 else float('inf')
+    return float(np.float32(100.0*n_err/n_total))
+
+
+def compute_wer(ref_trans, hyp_trans, mode='all'):
+    """Score (key, words) lists ref_trans and hyp_trans like compute-wer,
+    see pair_utterances for mode."""
+    pairs, n_absent, _ = pair_utterances(ref_trans, hyp_trans, mode)
+    n_words = n_err = n_ins = n_del = n_sub = 0
+    n_sent_err = 0
+    for key, ref, hyp in pairs:
+        n_words += len(ref)
+        errs = edit_distance(ref, hyp)
+        n_err += errs[0]; n_ins += errs[1]; n_del += errs[2]; n_sub += errs[3]
+        n_sent_err += errs[0] != 0
+    return WERScores(get_rate(n_err, n_words), n_err, n_words, n_ins, n_del,
+                     n_sub, get_rate(n_sent_err, len(pairs)), n_sent_err,
+                     len(pairs), n_absent)
+
+
+def align_all(ref_trans, hyp_trans, mode='all'):
+    """Align all utterances of (key, words) lists ref_trans and hyp_trans in
+    a single pass, see pair_utterances for mode. Returns Alignments: one row
+    per edit op, over all utterances, with the utterance (index in keys), op
+    (OP_* code), reference and hypothesis words (index in vocab, -1 if none)
+    and position of the reference word in its utterance (-1 if none)."""
+    pairs, n_absent, vocab = pair_utterances(ref_trans, hyp_trans, mode)
+    columns = [[] for x in range(5)]
+    for utt, (key, ref, hyp) in enumerate(pairs):
+        ops, ref_pos, hyp_pos = align(ref, hyp)
+        columns[0].append(np.full(len(ops), utt, dtype=np.int32))
+        columns[1].append(ops)
+        # position -1 picks the appended -1 (no word)
+        columns[2].append(np.append(ref, -1)[ref_pos])
+        columns[3].append(np.append(hyp, -1)[hyp_pos])
+        columns[4].append(ref_pos)
+    dtypes = [np.int32, np.int8, np.int32, np.int32, np.int32]
+    columns = [np.concatenate([np.zeros(0, dtype=dtype)]+col).astype(dtype)
+               for col, dtype in zip(columns, dtypes)]
+    return Alignments([x[0] for x in pairs], vocab, *columns, n_absent)
+
+
+""" USAGE: aligns = fs02asr.align_text_files(ref_fp, hyp_fp, 'all') """
+def align_text_files(ref_fp, hyp_fp, mode='all'):
+    return align_all(read_text(ref_fp), read_text(hyp_fp), mode)
+
+
+def count_ops(aligns, groups=None, n_groups=None):
+    """Count the edit ops of aligns per group (default: per utterance).
+    groups gives the group of each op. Returns an (n_groups, 4) array of
+    counts, with columns in OP_* order."""
+    if groups is None:
+        groups, n_groups = aligns.utt, len(aligns.keys)
+    counts = np.bincount(groups.astype(np.int64)*len(OP_NAMES)+aligns.op,
+                         minlength=n_groups*len(OP_NAMES))
+    return counts.reshape(n_groups, len(OP_NAMES))
+
+
+def alignment_scores(aligns):
+    """WERScores of aligns, same as compute_wer for the same inputs."""
+    counts = count_ops(aligns)
+    n_cor, n_sub, n_ins, n_del = counts.sum(axis=0).tolist()
+    n_words = n_cor+n_sub+n_del
+    n_err = n_sub+n_ins+n_del
+    n_sent_err = int(np.count_nonzero(counts[:, OP_COR] != counts.sum(axis=1)))
+    return WERScores(get_rate(n_err, n_words), n_err, n_words, n_ins, n_del,
+                     n_sub, get_rate(n_sent_err, len(aligns.keys)), n_sent_err,
+                     len(aligns.keys), aligns.n_absent)
+
+
+def op_ref_index(aligns):
+    """Index of the reference word of each op of aligns, within the words of
+    all utterances (in keys order). Insertions get the previous reference
+    word of their utterance, or else the next one, or else -1."""
+    n_keys = len(aligns.keys)
+    is_ref = aligns.ref_pos >= 0
+    n_ref = np.bincount(aligns.utt[is_ref], minlength=n_keys)
+    ref_end = np.cumsum(n_ref)
+    ref_start = (ref_end-n_ref)[aligns.utt]
+    ref_end = ref_end[aligns.utt]
+    index = np.where(is_ref, ref_start+aligns.ref_pos, -1)
+    prev_index = np.maximum.accumulate(index)
+    next_index = np.where(is_ref, index, np.count_nonzero(is_ref))
+    next_index = np.minimum.accumulate(next_index[::-1])[::-1]
+    index = np.where(is_ref | (prev_index >= ref_start), prev_index,
+                     np.where(next_index < ref_end, next_index, -1))
+    return index
+
+
+def count_ops_by_label(aligns, word_labels, none_label='-'):
+    """Count the edit ops of aligns per label of their reference word (see
+    op_ref_index), for word_labels a dict of key: labels of the reference
+    words of the utterance. Returns the sorted labels and their counts."""
+    labels = []
+    for key in aligns.keys:
+        labels.extend(word_labels[key])
+    n_ref = np.count_nonzero(aligns.ref_pos >= 0)
+    if len(labels) != n_ref:
+        raise ValueError('Number of word labels ('+str(len(labels))+
+                         ') does not match number of reference words ('+
+                         str(n_ref)+')')
+    labels = np.array(labels+[none_label], dtype=str)
+    names, groups = np.unique(labels[op_ref_index(aligns)], return_inverse=True)
+    return names.tolist(), count_ops(aligns, groups, len(names))
+
+
+def confusion_pairs(aligns, top_n=20):
+    """Most frequent substitutions of aligns, as (count, ref word, hyp word)
+    tuples, most frequent first."""
+    is_sub = aligns.op == OP_SUB
+    pairs = aligns.ref_word[is_sub].astype(np.int64)*len(aligns.vocab)+ \
+        aligns.hyp_word[is_sub]
+    pairs, counts = np.unique(pairs, return_counts=True)
+    order = np.argsort(-counts, kind='mergesort')[:top_n]
+    return [(int(counts[x]), aligns.vocab[pairs[x]//len(aligns.vocab)],
+             aligns.vocab[pairs[x] % len(aligns.vocab)]) for x in order]
+
+
+def save_alignments(aligns, file_path):
+    # columnar, compressed numpy archive
+    with open(file_path, 'wb') as file:
+        np.savez_compressed(file, keys=np.array(aligns.keys, dtype=str),
+                            vocab=np.array(aligns.vocab, dtype=str),
+                            utt=aligns.utt, op=aligns.op,
+                            ref_word=aligns.ref_word, hyp_word=aligns.hyp_word,
+                            ref_pos=aligns.ref_pos, n_absent=aligns.n_absent)
+
+
+def load_alignments(file_path):
+    with np.load(file_path) as data:
+        return Alignments(data['keys'].tolist(), data['vocab'].tolist(),
+                          data['utt'], data['op'], data['ref_word'],
+                          data['hyp_word'], data['ref_pos'],
+                          int(data['n_absent']))
+
+
+""" USAGE: scores = fs02asr.score_text_files(ref_fp, hyp_fp, 'all') """
+def score_text_files(ref_fp, hyp_fp, mode='all'):
+    return compute_wer(read_text(ref_fp), read_text(hyp_fp), mode)
+
+
+""" USAGE: ref_trans, hyp_trans, word_speakers = fs02asr.load_trans(ref_path, hyp_path, 1) """
+def load_trans(ref_path, hyp_path, track_num, n_jobs=1):
+    """(key, words) lists of the Track-1 (directories of json files, read with
+    n_jobs worker processes) or Track-2 (kaldi "text" files) ref and hyp
+    paths, and the speaker of each ref word (Track-1 only, else None)."""
+    if track_num == 1:
+        ref_path = util.check_path(ref_path)
+        hyp_path = util.check_path(hyp_path)
+        ref_trans, word_speakers = util.json_dir_to_trans(ref_path, n_jobs, use_cache=True)
+        hyp_trans = util.json_dir_to_trans(hyp_path, n_jobs)[0]
+    elif track_num == 2:
+        ref_path = util.check_path(ref_path, inpType='file', checkExists=True)
+        hyp_path = util.check_path(hyp_path, inpType='file', checkExists=True)
+        ref_trans = util.get_ASR_track2_trans(ref_path)
+        hyp_trans = util.get_ASR_track2_trans(hyp_path)
+        word_speakers = None
+    else:
+        raise util.ScoringError('Invalid Track number input. Valid Inputs: 1 or 2')
+    return ref_trans, hyp_trans, word_speakers
+
+
+""" USAGE: scores = fs02asr.score_ASR(ref_path, hyp_path, 1, 'all') """
+def score_ASR(ref_path, hyp_path, track_num, mode='all', n_jobs=1):
+    """WERScores of an ASR Track-1 or Track-2 system output (see load_trans).
+    Raises ValueError (util.ScoringError for invalid paths) for inputs which
+    can not be scored."""
+    ref_trans, hyp_trans, _ = load_trans(ref_path, hyp_path, track_num, n_jobs)
+    return compute_wer(ref_trans, hyp_trans, mode)
+
+
+def format_rate(rate):
+    # same precision as the rates printed by compute-wer
+    return '%.2f' % rate
+
+
+def format_scores(scores):
+    # same lines as printed by compute-wer on stdout
+    partial = ' [PARTIAL]' if scores.n_absent != 0 else ''
+    return '\n'.join([
+        '%WER '+format_rate(scores.wer)+' [ '+str(scores.n_err)+' / '+
+        str(scores.n_words)+', '+str(scores.n_ins)+' ins, '+
+        str(scores.n_del)+' del, '+str(scores.n_sub)+' sub ]'+partial,
+        '%SER '+format_rate(scores.ser)+' [ '+str(scores.n_sent_err)+' / '+
+        str(scores.n_sent)+' ]',
+        'Scored '+str(scores.n_sent)+' sentences, '+str(scores.n_absent)+
+        ' not present in hyp.'])
+
+
+def parse_scores(text):
+    """WERScores from the lines printed by compute-wer (or format_scores),
+    None if text has no %WER line."""
+    wer = re.search(r'%WER (\S+) \[ (\d+) / (\d+), (\d+) ins, (\d+) del, '
+                    r'(\d+) sub \]', text)
+    if wer is None:
+        return None
+    ser = re.search(r'%SER (\S+) \[ (\d+) / (\d+) \]', text)
+    absent = re.search(r'Scored \d+ sentences, (\d+) not present in hyp', text)
+    ser = ser.groups() if ser is not None else ('nan', 0, 0)
+    n_absent = int(absent.group(1)) if absent is not None else 0
+    return WERScores(float(wer.group(1)), *[int(x) for x in wer.groups()[1:]],
+                     float(ser[0]), int(ser[1]), int(ser[2]), n_absent)
+
+
+def format_alignment(aligns, utt):
+    # REF, HYP and OPS lines of utterance utt (index in keys), sclite-style
+    inds = np.flatnonzero(aligns.utt == utt)
+    ref_line, hyp_line, ops_line = ['REF:'], ['HYP:'], ['OPS:']
+    for op, ref, hyp in zip(aligns.op[inds].tolist(),
+                            aligns.ref_word[inds].tolist(),
+                            aligns.hyp_word[inds].tolist()):
+        ref = aligns.vocab[ref] if ref >= 0 else '*'*3
+        hyp = aligns.vocab[hyp] if hyp >= 0 else '*'*3
+        width = max(len(ref), len(hyp))
+        ref_line.append(ref.ljust(width))
+        hyp_line.append(hyp.ljust(width))
+        ops_line.append(OP_NAMES[op].ljust(width))
+    return '\n'.join([' '.join(x).rstrip() for x in
+                      [ref_line, hyp_line, ops_line]])
+
+
+def format_counts(names, counts, name_title='NAME'):
+    # table of op counts (count_ops) per name, with WER of each row
+    name_width = max([len(name_title)]+[len(x) for x in names])
+    lines = [name_title.ljust(name_width)+'  %8s %8s %8s %8s %8s %8s' %
+             ('#Wrd', 'Corr', 'Sub', 'Del', 'Ins', '%WER')]
+    for name, (n_cor, n_sub, n_ins, n_del) in zip(names, counts.tolist()):
+        n_words = n_cor+n_sub+n_del
+        lines.append(name.ljust(name_width)+'  %8d %8d %8d %8d %8d %8s' %
+                     (n_words, n_cor, n_sub, n_del, n_ins,
+                      format_rate(get_rate(n_sub+n_del+n_ins, n_words))))
+    return '\n'.join(lines)
+
+
+def format_confusion_pairs(pairs):
+    # lines of confusion_pairs
+    return '\n'.join(['%6d: %s ==> %s' % pair for pair in pairs])
+# EOF
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Benchmarks of the FS02 scoring pipelines on synthetic data
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+Synthetic SAD label files, SD RTTM/UEM files, SID ranked lists and ASR
+(Track-1 json and Track-2 text) transcripts are generated with a fixed seed,
+in the formats of the files in egs/. Each task is then scored in a new
+process with the same functions as its scoreFS02<Task>.py score-file, and
+the wall time, peak RSS and throughput of every stage (discovery, parsing,
+scoring, report writing) are written to a json file.
+"""
+
+import fs02utils as util
+import fs02asr
+import fs02cache
+import fs02prof as prof
+import fs02sad
+import fs02sd
+import fs02sid
+import scoreFS02ASR as asr_score
+import scoreFS02SAD as sad_score
+import scoreFS02SD as sd_score
+import scoreFS02SID as sid_score
+import argparse, json, multiprocessing, os, platform, shutil, time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import numpy as np
+
+
+BENCH_TASKS = ['SAD', 'SD', 'SID', 'ASR_track1', 'ASR_track2']
+BENCH_STAGES = ['discovery', 'parsing', 'scoring', 'report']
+DEF_PARAMS = {'files':100, 'hours':0.5, 'speakers':8, 'trials':100000, 'topN':5,
+              'words':2000, 'utts':10000, 'seed':0, 'cache':False}
+
+
+
+def parse_arguments():
+
+    def_out_path = util.get_results_path()+'FS02_Bench_'+util.getDateTimeStrStamp()+'.json'
+
+    desc='Benchmarks of the FS02 scoring pipelines (SAD, SD, SID, ASR track1/track2) '+\
+        'on synthetic data of configurable size, generated with a fixed seed. '+\
+        'Wall time, peak RSS and throughput of each pipeline stage '+\
+        '('+', '.join(BENCH_STAGES)+') are written to a json file.'
+
+    tsk_str = 'Tasks to benchmark. Input Options: '+', '.join(BENCH_TASKS)+'. Default: all.'
+    fls_str = 'No. of SAD, SD and ASR Track-1 files. Default: '+str(DEF_PARAMS['files'])
+    hrs_str = 'Length (hours) of every SAD and SD file (channel). Default: '+str(DEF_PARAMS['hours'])
+    spk_str = 'No. of speakers per SD file. Default: '+str(DEF_PARAMS['speakers'])
+    trl_str = 'No. of SID trials (utterances). Default: '+str(DEF_PARAMS['trials'])
+    top_str = 'No. of SID system predictions per trial. Default: '+str(DEF_PARAMS['topN'])
+    wrd_str = 'No. of words per ASR Track-1 file. Default: '+str(DEF_PARAMS['words'])
+    utt_str = 'No. of ASR Track-2 utterances. Default: '+str(DEF_PARAMS['utts'])
+    sed_str = 'Random seed of the data generators. Default: '+str(DEF_PARAMS['seed'])
+    cch_str = 'Load the ref files from the reference cache (egs/.cache/, filled by the first '+\
+        'run on the same data), to time cached parsing. Default: ref files are parsed.'
+    dat_str = 'Directory for the generated data. Data already generated there with the '+\
+        'same parameters is reused, and kept after the run. '+\
+        'Default: a temporary directory in '+util.get_temp_path()+' (removed after the run).'
+    out_str = 'Output (benchmark results) json File Path. '+\
+        'Default: Result file will stored in '+util.get_results_path()+' directory.'
+
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('-tasks', '--tasks', type=str, nargs='+', default=BENCH_TASKS,
+                        choices=BENCH_TASKS, help=tsk_str)
+    parser.add_argument('-files', '--files', type=int, default=DEF_PARAMS['files'], help=fls_str)
+    parser.add_argument('-hours', '--hours', type=float, default=DEF_PARAMS['hours'], help=hrs_str)
+    parser.add_argument('-speakers', '--speakers', type=int, default=DEF_PARAMS['speakers'],
+                        help=spk_str)
+    parser.add_argument('-trials', '--trials', type=int, default=DEF_PARAMS['trials'], help=trl_str)
+    parser.add_argument('-topN', '--topN', type=int, default=DEF_PARAMS['topN'], help=top_str)
+    parser.add_argument('-words', '--words', type=int, default=DEF_PARAMS['words'], help=wrd_str)
+    parser.add_argument('-utts', '--utts', type=int, default=DEF_PARAMS['utts'], help=utt_str)
+    parser.add_argument('-seed', '--seed', type=int, default=DEF_PARAMS['seed'], help=sed_str)
+    parser.add_argument('-cache', '--cache', action='store_true', help=cch_str)
+    parser.add_argument('-data', '--data', type=str, default=None, help=dat_str)
+    parser.add_argument('-out', '--out', type=str, default=def_out_path, help=out_str)
+    args = parser.parse_args()
+
+    params = {x:getattr(args, x) for x in DEF_PARAMS}
+    for x in ['files', 'speakers', 'trials', 'topN', 'words', 'utts']:
+        if params[x] < 1:
+            print('--'+x+' has to be greater than 0.')
+            util.terminate_program()
+    if params['hours'] <= 0:
+        print('--hours has to be greater than 0.')
+        util.terminate_program()
+    data_path = util.processInpPath(args.data, inpType='file') if args.data is not None else None
+    out_path = util.processInpPath(args.out, inpType='file')
+
+    return args.tasks, params, data_path, out_path
+
+
+
+###############################################################################
+# Synthetic data generators
+###############################################################################
+
+def get_fnames(prefix, n_files):
+    return [prefix+'_%06d' % i for i in range(1, n_files+1)]
+
+
+def get_boundaries(rng, total_dur, mean_dur, min_dur):
+    # sorted segment boundaries 0.0 < ... < total_dur (secs, 2 decimals)
+    n_segs = int(total_dur/(mean_dur+min_dur)*1.2)+2
+    bounds = np.cumsum(min_dur+rng.exponential(mean_dur, n_segs))
+    bounds = np.unique(np.round(bounds[bounds < total_dur-min_dur], 2))
+    return np.concatenate([[0.0], bounds, [round(total_dur, 2)]])
+
+
+def jitter_boundaries(rng, bounds, std_dur):
+    # system boundaries, moved by N(0, std_dur) and kept in order
+    inner = np.round(bounds[1:-1]+rng.normal(0, std_dur, len(bounds)-2), 2)
+    inner = np.unique(np.clip(inner, 0.01, bounds[-1]-0.01))
+    return np.concatenate([[0.0], inner, [bounds[-1]]])
+
+
+def write_lines(lines, file_path):
+    with open(file_path, 'w') as file:
+        file.write('\n'.join(lines)+'\n')
+
+
+def gen_SAD(data_path, n_files, hours, rng):
+    # ref: "fn 0 start end S|NS manual X..." / hyp: "X X X SAD X start end speech|non-speech conf"
+    ref_path, hyp_path = data_path+'SAD/ref/', data_path+'SAD/hyp/'
+    os.makedirs(ref_path, exist_ok=True); os.makedirs(hyp_path, exist_ok=True)
+    for fn in get_fnames('BENCH_SAD', n_files):
+        bounds = get_boundaries(rng, hours*3600, 2.5, 0.2)
+        ref_types = ['NS', 'S']*(len(bounds)//2+1)
+        write_lines([fn+'\t0\t%.2f\t%.2f\t%s\tmanual\tX\tX\tX\tX\tX\tX' % (s, e, t)
+                     for s, e, t in zip(bounds[:-1], bounds[1:], ref_types)], ref_path+fn+'.txt')
+        hyp_bounds = jitter_boundaries(rng, bounds, 0.15)
+        hyp_types = ['non-speech', 'speech']*(len(hyp_bounds)//2+1)
+        write_lines(['X\tX\tX\tSAD\tX\t%.2f\t%.2f\t%s\t0.500000' % (s, e, t)
+                     for s, e, t in zip(hyp_bounds[:-1], hyp_bounds[1:], hyp_types)],
+                    hyp_path+fn+'.txt')
+    return ref_path, hyp_path
+
+
+def gen_SD(data_path, n_files, hours, n_speakers, rng):
+    # ref: RTTM/ and UEM/ (whole file scored), hyp: RTTM
+    ref_path, hyp_path = data_path+'SD/ref/', data_path+'SD/hyp/'
+    for dir_path in [ref_path+'RTTM/', ref_path+'UEM/', hyp_path]:
+        os.makedirs(dir_path, exist_ok=True)
+    rttm_fmt = 'SPEAKER %s 1 %.2f %.2f <NA> <NA> %s <NA>'
+    for fn in get_fnames('BENCH_SD', n_files):
+        bounds = get_boundaries(rng, hours*3600, 3.0, 0.3)
+        starts, ends = bounds[1:-1:2], bounds[2::2]
+        speakers = rng.randint(n_speakers, size=len(ends))
+        write_lines([rttm_fmt % (fn, s, e-s, 'SPK%02d' % x) for s, e, x in
+                     zip(starts, ends, speakers)], ref_path+'RTTM/'+fn+'.rttm')
+        write_lines(['%s 1 0.00 %.2f' % (fn, hours*3600)], ref_path+'UEM/'+fn+'.uem')
+        hyp_bounds = jitter_boundaries(rng, bounds, 0.2)
+        starts, ends = hyp_bounds[1:-1:2], hyp_bounds[2::2]
+        hyp_speakers = rng.randint(n_speakers, size=len(ends))
+        is_corr = rng.rand(len(ends)) < 0.8
+        n_corr = min(len(ends), len(speakers))
+        hyp_speakers[:n_corr][is_corr[:n_corr]] = speakers[:n_corr][is_corr[:n_corr]]
+        write_lines([rttm_fmt % (fn, s, e-s, 'spk%d' % x) for s, e, x in
+                     zip(starts, ends, hyp_speakers)], hyp_path+fn+'.rttm')
+    return ref_path, hyp_path
+
+
+def gen_SID(data_path, n_trials, n_speakers, topN, rng):
+    # ref: "uttID spkID" / hyp: "uttID spkID_1 ... spkID_topN", sorted by uttID
+    os.makedirs(data_path+'SID/', exist_ok=True)
+    ref_path, hyp_path = data_path+'SID/ref.txt', data_path+'SID/hyp.txt'
+    n_speakers = max(n_speakers, topN+1)
+    fnames = get_fnames('BENCH_SID', n_trials)
+    true_spk = rng.randint(n_speakers, size=n_trials)
+    offsets = rng.randint(1, n_speakers-topN+1, size=n_trials)
+    hyp_spk = (true_spk[:,None]+offsets[:,None]+np.arange(topN)[None,:]) % n_speakers
+    is_pred = rng.rand(n_trials) < 0.6
+    ranks = rng.randint(topN, size=n_trials)
+    hyp_spk[is_pred, ranks[is_pred]] = true_spk[is_pred]
+    spk_names = np.array(['SPK%04d' % x for x in range(n_speakers)], dtype=object)
+    write_lines([fn+' '+spk for fn, spk in zip(fnames, spk_names[true_spk])], ref_path)
+    write_lines([fn+' '+' '.join(spks) for fn, spks in zip(fnames, spk_names[hyp_spk].tolist())],
+                hyp_path)
+    return ref_path, hyp_path
+
+
+def get_vocab(n_words):
+    # alphabetic synthetic words (kept by the ASR text normalization)
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    digits = np.stack([(np.arange(n_words)//26**k) % 26 for k in range(4)], axis=1)
+    return np.array(['w'+''.join(x) for x in letters[digits]], dtype=object)
+
+
+def get_hyp_words(rng, ref_words, n_vocab):
+    # ref words (vocab indices) with ~10% substitutions, 5% deletions and
+    # 5% insertions
+    ops = rng.rand(len(ref_words))
+    hyp_words = np.where(ops < 0.1, rng.zipf(1.3, len(ref_words)) % n_vocab, ref_words)
+    hyp_words = hyp_words[(ops < 0.1) | (ops >= 0.15)]
+    ins_pos = rng.randint(len(hyp_words)+1, size=len(ref_words)//20)
+    return np.insert(hyp_words, ins_pos, rng.zipf(1.3, len(ins_pos)) % n_vocab)
+
+
+def get_json_utts(rng, words, n_speakers):
+    # json list of utterances of ~10 words, with speakerID, startTime, endTime
+    utt_bounds = np.arange(0, len(words)+10, 10)
+    utts, start = [], 0.0
+    for s, e in zip(utt_bounds[:-1], utt_bounds[1:]):
+        if s >= len(words):
+            break
+        end = start+0.4*len(words[s:e])
+        utts.append({'speakerID':'SPK%02d' % rng.randint(n_speakers), 'startTime':round(start, 2),
+                     'endTime':round(end, 2), 'words':' '.join(words[s:e])})
+        start = end+0.5
+    return utts
+
+
+def gen_ASR_track1(data_path, n_files, n_words, n_speakers, rng):
+    ref_path, hyp_path = data_path+'ASR_track1/ref/', data_path+'ASR_track1/hyp/'
+    os.makedirs(ref_path, exist_ok=True); os.makedirs(hyp_path, exist_ok=True)
+    vocab = get_vocab(5000)
+    for fn in get_fnames('BENCH_ASR', n_files):
+        ref_words = rng.zipf(1.3, n_words) % len(vocab)
+        hyp_words = get_hyp_words(rng, ref_words, len(vocab))
+        for dir_path, words in [(ref_path, ref_words), (hyp_path, hyp_words)]:
+            with open(dir_path+fn+'.json', 'w') as file:
+                json.dump(get_json_utts(rng, vocab[words].tolist(), n_speakers), file, indent=4)
+    return ref_path, hyp_path
+
+
+def gen_ASR_track2(data_path, n_utts, rng):
+    # kaldi "text" files of utterances of 1 to 30 words
+    os.makedirs(data_path+'ASR_track2/', exist_ok=True)
+    ref_path, hyp_path = data_path+'ASR_track2/ref', data_path+'ASR_track2/hyp'
+    vocab = get_vocab(5000)
+    ref_lines, hyp_lines = [], []
+    for fn in get_fnames('BENCH_ASR_track2', n_utts):
+        ref_words = rng.zipf(1.3, rng.randint(1, 31)) % len(vocab)
+        hyp_words = get_hyp_words(rng, ref_words, len(vocab))
+        ref_lines.append(fn+' '+' '.join(vocab[ref_words].tolist()).upper())
+        hyp_lines.append(fn+' '+' '.join(vocab[hyp_words].tolist()).upper())
+    write_lines(ref_lines, ref_path)
+    write_lines(hyp_lines, hyp_path)
+    return ref_path, hyp_path
+
+
+""" USAGE: task_paths = fs02bench.gen_data(data_path, tasks, params) """
+def gen_data(data_path, tasks, params):
+    # {task: (ref_path, hyp_path)}, each task with its own random stream so
+    # that its data does not depend on the other tasks generated
+    task_paths = {}
+    for i, task in enumerate(BENCH_TASKS):
+        if task not in tasks:
+            continue
+        rng = np.random.RandomState([params['seed'], i])
+        if task == 'SAD':
+            task_paths[task] = gen_SAD(data_path, params['files'], params['hours'], rng)
+        elif task == 'SD':
+            task_paths[task] = gen_SD(data_path, params['files'], params['hours'],
+                                      params['speakers'], rng)
+        elif task == 'SID':
+            task_paths[task] = gen_SID(data_path, params['trials'], max(100, params['speakers']),
+                                       params['topN'], rng)
+        elif task == 'ASR_track1':
+            task_paths[task] = gen_ASR_track1(data_path, params['files'], params['words'],
+                                              params['speakers'], rng)
+        else:
+            task_paths[task] = gen_ASR_track2(data_path, params['utts'], rng)
+    return task_paths
+
+
+
+###############################################################################
+# Pipeline stages
+###############################################################################
+
+def set_throughput(stages, stage, n_units):
+    wall_time = stages[stage]['wall_s']
+    stages[stage]['units_per_s'] = round(n_units/wall_time, 2) if wall_time > 0 else None
+
+
+def run_stage(stages, stage, n_units, func, *args):
+    # func(*args), timed as stage of the pipeline (n_units None: throughput
+    # set later with set_throughput, once the no. of units is known)
+    start_time = time.perf_counter()
+    result = func(*args)
+    stages[stage] = {'wall_s':round(time.perf_counter()-start_time, 4),
+                     'peak_rss_mb':prof.get_peak_rss_mb()}
+    set_throughput(stages, stage, n_units or 0)
+    return result
+
+
+def write_report(write_msg, report_path):
+    util.writeList(write_msg, report_path, isOverWrite=True, verbose=False)
+
+
+def bench_SAD(ref_path, hyp_path, report_path, collar=0.5):
+    stages = {}
+    fileList, fileDict, _ = run_stage(stages, 'discovery', None, util.find_files_to_score,
+                                      ref_path, hyp_path)
+    n_files = len(fileList)
+    set_throughput(stages, 'discovery', n_files)
+    def parse():
+        return [(fs02sad.load_ref_segs(fileDict['ref'][fn]),
+                 fs02sad.read_hyp_segs(fs02sad.read_lines(fileDict['hyp'][fn]))) for fn in fileList]
+    segs = run_stage(stages, 'parsing', n_files, parse)
+    def score():
+        return [fs02sad.score_SAD_segs(ref_segs, hyp_segs, [collar])[collar].dcf
+                for ref_segs, hyp_segs in segs]
+    dcfs = run_stage(stages, 'scoring', n_files, score)
+    def report():
+        dcfDict = {fn:fs02sad.format_score(dcf).strip() for fn, dcf in zip(fileList, dcfs)}
+        write_msg = sad_score.get_write_msg_list((ref_path, hyp_path, str(collar)))
+        overall_dcf, write_msg = sad_score.get_SAD_results(dcfDict, write_msg)
+        write_report(write_msg, report_path)
+        return float(overall_dcf)
+    overall = run_stage(stages, 'report', n_files, report)
+    hours = sum([x[0][-1][1]-x[0][0][0] for x in segs])/3600.0
+    n_segs = sum([len(x[0]) for x in segs])
+    return stages, {'files':n_files, 'hours':round(hours, 3), 'ref_segs':n_segs}, {'dcf':overall}
+
+
+def bench_SD(ref_path, hyp_path, report_path, collar=0.25):
+    stages = {}
+    fileList, fileDict, _ = run_stage(stages, 'discovery', None, util.find_files_to_score,
+                                      ref_path+'RTTM/', hyp_path)
+    n_files = len(fileList)
+    set_throughput(stages, 'discovery', n_files)
+    def parse():
+        return [fs02sd.load_file_SD(fileDict['ref'][fn], fileDict['hyp'][fn],
+                                    fs02sd.get_uem_path(fileDict['ref'][fn])) for fn in fileList]
+    turns = run_stage(stages, 'parsing', n_files, parse)
+    def score():
+        return [fs02sd.score_turns_SD(*x, collar)[1].der for x in turns]
+    ders = run_stage(stages, 'scoring', n_files, score)
+    def report():
+        derDict = {fn:'%.2f' % der for fn, der in zip(fileList, ders)}
+        write_msg = sd_score.get_write_msg_list((ref_path, hyp_path, str(collar)))
+        overall_der, write_msg = sd_score.get_SD_results(derDict, write_msg)
+        write_report(write_msg, report_path)
+        return float(overall_der)
+    overall = run_stage(stages, 'report', n_files, report)
+    n_turns = sum([len(x[0])+len(x[1]) for x in turns])
+    return stages, {'files':n_files, 'turns':n_turns}, {'der':overall}
+
+
+def bench_SID(ref_path, hyp_path, report_path, topN=5):
+    stages = {}
+    # discovery of SID is the check of the no. of system predictions per line
+    max_topN = run_stage(stages, 'discovery', None, fs02sid.get_max_topN, hyp_path)
+    fileList, fileDict, total_missing = run_stage(stages, 'parsing', None,
+                                                  util.find_files_to_score, ref_path, hyp_path,
+                                                  False, 'SID')
+    n_trials = len(fileList)
+    set_throughput(stages, 'discovery', n_trials)
+    set_throughput(stages, 'parsing', n_trials)
+    topN = min(topN, max_topN)
+    results = run_stage(stages, 'scoring', n_trials, fs02sid.score_files_SID, fileList,
+                        fileDict, topN, len(total_missing))
+    def report():
+        write_msg = sid_score.get_write_msg_list((ref_path, hyp_path, topN))
+        write_msg = sid_score.get_topN_msg(results.accuracy, write_msg)
+        ranks_lines = [fn+' '+str(rank) for fn, rank in zip(results.files, results.ranks.tolist())]
+        write_report(write_msg, report_path)
+        write_report(ranks_lines, report_path+'.ranks')
+    run_stage(stages, 'report', n_trials, report)
+    overall = {'top'+str(n):results.accuracy[n] for n in results.accuracy}
+    return stages, {'trials':n_trials}, overall
+
+
+def bench_ASR(ref_path, hyp_path, report_path, track_num):
+    stages = {}
+    def discover():
+        if track_num == 1:
+            return len(util.get_from_dir(ref_path)), len(util.get_from_dir(hyp_path))
+        return 1, 1
+    n_files = run_stage(stages, 'discovery', None, discover)[0]
+    ref_trans, hyp_trans, _ = run_stage(stages, 'parsing', None, fs02asr.load_trans,
+                                        ref_path, hyp_path, track_num)
+    n_words = sum([len(words) for _, words in ref_trans])
+    set_throughput(stages, 'discovery', n_files)
+    set_throughput(stages, 'parsing', n_words)
+    scores = run_stage(stages, 'scoring', n_words, fs02asr.compute_wer, ref_trans, hyp_trans)
+    def report():
+        write_msg = asr_score.get_write_msg_list((ref_path, hyp_path, track_num))
+        overall_wer, write_msg = asr_score.get_ASR_results(fs02asr.format_scores(scores), [],
+                                                           track_num, write_msg)
+        write_report(write_msg, report_path)
+    run_stage(stages, 'report', n_files, report)
+    return stages, {'files':n_files, 'utterances':len(ref_trans), 'words':n_words}, \
+        {'wer':round(float(scores.wer), 2), 'n_err':scores.n_err}
+
+
+""" USAGE: task_result = fs02bench.bench_task(task, ref_path, hyp_path, report_path, params) """
+def bench_task(task, ref_path, hyp_path, report_path, params):
+    # runs (in the calling process) and times all stages of a task. The
+    # units of units_per_s are files (SAD, SD, ASR_track1), trials (SID) or
+    # utterances (ASR_track2), and words for ASR scoring and parsing.
+    # The peak RSS of the (new) process is reset first, so that it does not
+    # include the peak of the parent process (e.g. from generating the data).
+    prof.reset_peak_rss()
+    fs02cache.set_enabled(params['cache'])
+    start_time = time.perf_counter()
+    with redirect_stdout(open(os.devnull, 'w')):
+        if task == 'SAD':
+            stages, sizes, overall = bench_SAD(ref_path, hyp_path, report_path)
+        elif task == 'SD':
+            stages, sizes, overall = bench_SD(ref_path, hyp_path, report_path)
+        elif task == 'SID':
+            stages, sizes, overall = bench_SID(ref_path, hyp_path, report_path, params['topN'])
+        else:
+            stages, sizes, overall = bench_ASR(ref_path, hyp_path, report_path, int(task[-1]))
+    wall_time = time.perf_counter()-start_time
+    # at least the peak of every stage (VmHWM is updated lazily by the kernel)
+    peaks = [stages[x]['peak_rss_mb'] for x in stages]+[prof.get_peak_rss_mb()]
+    peak_rss = max(peaks) if None not in peaks else None
+    return {'sizes':sizes, 'stages':stages, 'wall_s':round(wall_time, 4),
+            'peak_rss_mb':peak_rss, 'overall':overall}
+
+
+""" USAGE: bench = fs02bench.run_benchmarks(tasks, params, data_path, out_path) """
+def run_benchmarks(tasks, params=None, data_path=None, out_path=None):
+    # generates (or reuses) the data of all tasks, benchmarks every task in a
+    # new process (whose peak RSS is reset, see bench_task), and writes the results
+    params = dict(DEF_PARAMS, **(params or {}))
+    if out_path is None:
+        out_path = util.get_results_path()+'FS02_Bench_'+util.getDateTimeStrStamp()+'.json'
+    keep_data = data_path is not None
+    if data_path is None:
+        data_path = util.get_temp_path()+'bench_'+util.getDateTimeStrStamp()
+    data_path = data_path.rstrip('/')+'/'
+    os.makedirs(data_path, exist_ok=True)
+
+    params_path = data_path+'bench_params.json'
+    gen_params = dict(params, tasks=sorted(tasks))
+    del gen_params['cache']
+    start_time = time.perf_counter()
+    if os.path.isfile(params_path) and json.load(open(params_path)) == gen_params:
+        task_paths = {task:tuple(x) for task, x in json.load(open(data_path+'bench_paths.json')).items()}
+        gen_time = None
+    else:
+        task_paths = gen_data(data_path, tasks, params)
+        gen_time = round(time.perf_counter()-start_time, 4)
+        with open(data_path+'bench_paths.json', 'w') as file:
+            json.dump(task_paths, file)
+        with open(params_path, 'w') as file:
+            json.dump(gen_params, file)
+
+    results = {}
+    spawn_ctx = multiprocessing.get_context('spawn')
+    for task in tasks:
+        report_path = data_path+'report_'+task+'.txt'
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn_ctx) as executor:
+            results[task] = executor.submit(bench_task, task, *task_paths[task], report_path,
+                                            params).result()
+    if not keep_data:
+        shutil.rmtree(data_path, ignore_errors=True)
+
+    bench = {'created':util.getDateTimeStrStamp(), 'params':params, 'generation_s':gen_time,
+             'system':{'python':platform.python_version(), 'numpy':np.__version__,
+                       'platform':platform.platform(), 'cpus':os.cpu_count()},
+             'tasks':results}
+    with open(out_path, 'w') as file:
+        json.dump(bench, file, indent=2)
+    return bench
+
+
+
+def print_summary(bench, out_path):
+    strz = '\t'+'*'*76
+    print('\n\n'+strz)
+    print('\tFS02 Scoring Benchmark (wall time in secs, peak RSS in MB):')
+    print('\tTask\t\t'+'\t'.join(['%-10s' % x for x in BENCH_STAGES])+'\tTotal\tPeak RSS')
+    for task in bench['tasks']:
+        result = bench['tasks'][task]
+        wall_strs = ['%-10.3f' % result['stages'][x]['wall_s'] for x in BENCH_STAGES]
+        print('\t%-10s\t' % task+'\t'.join(wall_strs)+'\t%.3f\t%s' % (result['wall_s'],
+                                                                       result['peak_rss_mb']))
+    print(strz)
+    print('\tResults written to path:\n\t\t'+out_path+'\n\n')
+
+
+
+if __name__ == '__main__':
+
+    # Input Arguments
+    tasks, params, data_path, out_path = parse_arguments()
+
+    # Generate Data and Run Benchmarks
+    bench = run_benchmarks(tasks, params, data_path, out_path)
+    del tasks, params, data_path
+
+    # Print Summary
+    print_summary(bench, out_path)
+    del bench, out_path
+# EOF
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    On-disk cache of parsed reference (ground truth) files
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+The same ground truth files are parsed for every system output scored. The
+parsed data of a file is stored in egs/.cache/ as numpy arrays, in a file
+named by the parser, its version and the SHA-1 hash of the file content:
+    <parser>_v<format>.<version>_<sha1>.bin
+A file which changes has a new hash (so its old entry is never used again),
+and the version of a parser is increased when its output changes. The cache
+directory can be deleted at any time (see clear_cache).
+
+Cache files have one json header line (dtype, shape and offset of each
+array) followed by the raw array data, 64-byte aligned. Arrays are loaded
+without parsing, with np.frombuffer of the file data (memory-mapped for
+entries of at least MEMMAP_MIN_SIZE bytes, read at once for smaller ones):
+the per array header parsing of .npy/.npz files costs more than parsing
+most reference files.
+
+Only successful parses are cached, so a file which cannot be parsed raises
+the same error every time. Entries which cannot be read are parsed again.
+
+Long-running processes (see fs02daemon) also keep the arrays of the most
+recently used entries in memory (see set_memory_entries).
+"""
+
+
+import glob, hashlib, json, os
+from collections import OrderedDict
+
+import numpy as np
+
+import fs02archive
+
+# increased when the cache file format (or naming) changes
+CACHE_FORMAT = 1
+DATA_ALIGN = 64
+# entries of this size (bytes) or larger are memory-mapped
+MEMMAP_MIN_SIZE = 1 << 24
+
+_enabled = True
+
+# arrays of the most recently used entries (last), up to _memory_entries
+_memory = OrderedDict()
+_memory_entries = 0
+
+
+def get_cache_path():
+    # egs/.cache/ of the toolkit (next to egs/.temp/)
+    sctk_path = os.path.normpath(os.path.dirname(os.path.realpath(__file__))+os.sep+os.pardir)
+    cache_path = os.path.join(sctk_path, 'egs', '.cache')+'/'
+    if not os.path.isdir(cache_path):
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+        except OSError:
+            # a read-only toolkit directory only disables the cache (entries
+            # are neither found nor written)
+            pass
+    return cache_path
+
+
+def set_enabled(enabled=True):
+    # with enabled False, load_cached always parses (and stores nothing)
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_memory_entries(max_entries):
+    # no. of entries kept in memory (0: none)
+    global _memory_entries
+    _memory_entries = max_entries
+    while len(_memory) > _memory_entries:
+        _memory.popitem(last=False)
+
+
+def get_memory_arrays(cache_fp):
+    # copies of the arrays of an entry kept in memory, None if not in memory
+    if cache_fp not in _memory:
+        return None
+    _memory.move_to_end(cache_fp)
+    return {name:x.copy() for name, x in _memory[cache_fp].items()}
+
+
+def set_memory_arrays(cache_fp, arrays):
+    # arrays are copied, as the parsed data may share them
+    if _memory_entries < 1:
+        return
+    _memory[cache_fp] = {name:np.array(x, copy=True) for name, x in arrays.items()}
+    _memory.move_to_end(cache_fp)
+    while len(_memory) > _memory_entries:
+        _memory.popitem(last=False)
+
+
+def get_file_hash(file_path):
+    sha1 = hashlib.sha1()
+    with fs02archive.open_file(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def get_cache_file(file_path, parser, version):
+    return get_cache_path()+parser+'_v'+str(CACHE_FORMAT)+'.'+str(version)+'_'+\
+        get_file_hash(file_path)+'.bin'
+
+
+def get_data_start(header_len):
+    return -(-header_len//DATA_ALIGN)*DATA_ALIGN
+
+
+def read_arrays(cache_fp):
+    # dict of the arrays of a cache file, None if missing or unreadable.
+    # Large entries are memory-mapped copy-on-write, so that the arrays are
+    # writable (as for the smaller entries) without changing the file.
+    if not os.path.isfile(cache_fp):
+        return None
+    try:
+        with open(cache_fp, 'rb') as file:
+            header = file.readline()
+            size = os.fstat(file.fileno()).st_size
+            if size >= MEMMAP_MIN_SIZE:
+                buf = np.memmap(file, dtype=np.uint8, mode='c')
+            else:
+                file.seek(0)
+                buf = bytearray(size)
+                file.readinto(buf)
+        data_start = get_data_start(len(header))
+        arrays = {}
+        for name, dtype, shape, offset in json.loads(header.decode()):
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.frombuffer(buf, dtype=dtype, count=count,
+                                             offset=data_start+offset).reshape(shape)
+        return arrays
+    except Exception:
+        return None
+
+
+def write_arrays(cache_fp, arrays):
+    # written to a temporary file first, so that processes reading (or
+    # writing) the same entry never see a partial file
+    header, offset = [], 0
+    arrays = {name:np.ascontiguousarray(x) for name, x in arrays.items()}
+    for name, x in arrays.items():
+        if x.dtype.hasobject:
+            raise ValueError('Object arrays cannot be cached: '+name)
+        header.append([name, x.dtype.str, list(x.shape), offset])
+        offset += get_data_start(x.nbytes)
+    header = (json.dumps(header)+'\n').encode()
+    temp_fp = cache_fp+'.'+str(os.getpid())+'.tmp'
+    try:
+        with open(temp_fp, 'wb') as file:
+            file.write(header+b'\0'*(get_data_start(len(header))-len(header)))
+            for x in arrays.values():
+                file.write(x.tobytes()+b'\0'*(get_data_start(x.nbytes)-x.nbytes))
+        os.replace(temp_fp, cache_fp)
+    except OSError:
+        # a read-only toolkit directory only disables the cache
+        if os.path.exists(temp_fp):
+            os.remove(temp_fp)
+
+
+""" USAGE: data = fs02cache.load_cached(file_path, parser, version, parse, to_arrays, from_arrays) """
+def load_cached(file_path, parser, version, parse, to_arrays, from_arrays):
+    """parse(file_path), loaded from the cache entry of the file content if
+    any. to_arrays converts the parsed data to a dict of numpy arrays (no
+    object arrays) and from_arrays converts it back to the parsed data."""
+    if not _enabled:
+        return parse(file_path)
+    cache_fp = get_cache_file(file_path, parser, version)
+    arrays = get_memory_arrays(cache_fp)
+    if arrays is None:
+        arrays = read_arrays(cache_fp)
+        if arrays is not None:
+            set_memory_arrays(cache_fp, arrays)
+    if arrays is not None:
+        try:
+            return from_arrays(arrays)
+        except Exception:
+            pass
+    data = parse(file_path)
+    arrays = to_arrays(data)
+    write_arrays(cache_fp, arrays)
+    set_memory_arrays(cache_fp, arrays)
+    return data
+
+
+def str_array(str_list):
+    # utf-8 bytes of the NUL terminated strings (converted back to a list
+    # much faster than a fixed width unicode array, see str_list)
+    return np.frombuffer(''.join([x+'\0' for x in str_list]).encode(), dtype=np.uint8)
+
+
+def str_list(str_arr):
+    # list of the strings of a str_array
+    return str_arr.tobytes().decode().split('\0')[:-1]
+
+
+""" USAGE: fs02cache.clear_cache(parser) """
+def clear_cache(parser=None):
+    # removes the entries of a parser (all entries if None)
+    pattern = (parser+'_v*' if parser is not None else '*')+'.bin'
+    for cache_fp in glob.glob(get_cache_path()+pattern):
+        os.remove(cache_fp)
+        _memory.pop(cache_fp, None)
+# EOF
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Long-running local scoring service (HTTP API, worker pool)
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+Scoring service for many submissions: jobs (the task list of fs02score.py)
+are queued over a local HTTP API and scored by a fixed number of worker
+processes, which are started once (imports done) and keep the parsed ground
+truth files in memory (see fs02cache.set_memory_entries).
+
+    python fs02daemon.py --port 8020 --workers 4 [--kaldi <kaldi_path>]
+
+API (json request and response bodies):
+    POST   /jobs            {"tasks": [["SAD", <ref_path>, <hyp_path>], ...],
+                             "params": {"sadcollar": 0.5, ...}, "priority": 0}
+                            queues a job, returns {"id", "status", ...}.
+                            params are those of fs02score.py, but for kaldi
+                            (set by --kaldi for all jobs) and n_jobs
+    GET    /jobs            all jobs (without results)
+    GET    /jobs/<id>       a job, with its result (fs02score.score_tasks
+                            scores) once done. ?wait=<secs> waits for it.
+    DELETE /jobs/<id>       cancels a queued or running job
+    GET    /status          no. of workers, running and queued jobs
+
+Jobs with a higher priority are run first (in submission order for the same
+priority). A running job is cancelled by terminating its worker process,
+which is then started again. Paths are paths of the machine running the
+service, and results are also written to the results path like fs02score.py.
+"""
+
+
+import fs02utils as util
+import fs02asr
+import fs02cache
+import fs02score
+import argparse, heapq, itertools, json, os, signal, sys, threading, time
+import multiprocessing as mp
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from multiprocessing.connection import wait
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+
+FINISHED = ('done', 'failed', 'cancelled')
+# finished jobs kept (with their results), oldest are removed first
+MAX_FINISHED_JOBS = 1000
+# params a job may set (kaldi is set for all jobs by --kaldi), with a
+# description of their allowed values
+JOB_PARAMS = {'sadcollar':'a number >= 0', 'diarcollar':'a number >= 0',
+              'topN':'an integer >= 1', 'sidstream':'true or false',
+              'mode':'one of '+', '.join(fs02asr.WER_MODES), 'align':'true or false',
+              'incremental':'true or false'}
+
+
+
+def parse_arguments():
+
+    desc='Long-running local scoring service for the FS02 Challenge Tasks. Jobs '+\
+        '(tasks with ref and hyp paths, as for fs02score.py) are queued over a '+\
+        'local HTTP API and scored by a pool of worker processes, which keep '+\
+        'the parsed ground truth files in memory. For the API, refer '+\
+        'the description of fs02daemon.py.'
+
+    hst_str = 'Host address of the HTTP API. Default: 127.0.0.1 (local only).'
+    prt_str = 'Port of the HTTP API. Default: 8020.'
+    wrk_str = 'Number of worker processes (jobs scored in parallel). Default: no. of CPUs.'
+    que_str = 'Maximum number of queued jobs, further jobs are refused. Default: 1000.'
+    mem_str = 'Number of parsed ground truth files kept in memory by every worker. '+\
+        'Default: 1000.'
+    kld_str = 'base path to the locally installed kaldi directory. If provided, '+\
+        'ASR Tasks of all jobs are scored with the kaldi engine. Default: python engine.'
+
+
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('-host', '--host', type=str, default='127.0.0.1', help=hst_str)
+    parser.add_argument('-port', '--port', type=int, default=8020, help=prt_str)
+    parser.add_argument('-workers', '--workers', type=int, default=0, help=wrk_str)
+    parser.add_argument('-max-queue', '--max-queue', type=int, default=1000, help=que_str)
+    parser.add_argument('-ref-memory', '--ref-memory', type=int, default=1000, help=mem_str)
+    parser.add_argument('-kaldi','--kaldi', type=str, default=None, help=kld_str)
+    args = parser.parse_args()
+
+    n_workers = util.proc_n_jobs(args.workers) if args.workers != 0 else (os.cpu_count() or 1)
+    if args.kaldi is not None:
+        args.kaldi = util.processInpPath(args.kaldi)
+
+    return args.host, args.port, n_workers, max(args.max_queue, 1), max(args.ref_memory, 0), \
+        args.kaldi
+
+
+
+def worker_main(conn, ref_memory, kaldi=None):
+    # scores the (job_id, tasks, params) jobs received on conn (ASR with the
+    # kaldi engine if kaldi is given), until None
+    fs02cache.set_memory_entries(ref_memory)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        job_id, tasks, params = job
+        out_path = util.get_results_path()+'FS02_Scores_'+util.getDateTimeStrStamp()+\
+            '_job'+job_id+'.json'
+        try:
+            result = {'status':'done',
+                      'result':fs02score.score_tasks(tasks, out_path, dict(params, kaldi=kaldi),
+                                                     n_jobs=1)}
+        except Exception as e:
+            result = {'status':'failed', 'error':type(e).__name__+': '+str(e)}
+        conn.send(result)
+
+
+def check_param(name, val):
+    # True if val is an allowed value of the job param name
+    if name in ['sidstream', 'align', 'incremental']:
+        return isinstance(val, bool)
+    if name == 'mode':
+        return val in fs02asr.WER_MODES
+    if isinstance(val, bool) or not isinstance(val, (int, float)):
+        return False
+    return isinstance(val, int) and val >= 1 if name == 'topN' else val >= 0
+
+
+""" USAGE: tasks, params, priority = fs02daemon.check_job_request(body) """
+def check_job_request(body):
+    # tasks, params and priority of a POST /jobs body, raises ValueError
+    if not isinstance(body, dict):
+        raise ValueError('Request body must be a json object.')
+    tasks = body.get('tasks')
+    if not isinstance(tasks, list) or len(tasks) < 1:
+        raise ValueError('"tasks" must be a list of [task, ref_path, hyp_path].')
+    for task in tasks:
+        if not isinstance(task, list) or len(task) != 3 or \
+                not all([isinstance(x, str) for x in task]):
+            raise ValueError('"tasks" must be a list of [task, ref_path, hyp_path].')
+        if task[0] not in fs02score.TASKS:
+            raise ValueError('Unknown Task: '+task[0]+'. Tasks: '+', '.join(fs02score.TASKS))
+    params = body.get('params', {})
+    if not isinstance(params, dict):
+        raise ValueError('"params" must be a json object.')
+    unknown = [x for x in params if x not in JOB_PARAMS]
+    if len(unknown) > 0:
+        raise ValueError('Unknown params: '+', '.join(unknown)+'. Params: '+', '.join(JOB_PARAMS))
+    for name in params:
+        if not check_param(name, params[name]):
+            raise ValueError('"'+name+'" must be '+JOB_PARAMS[name]+'.')
+    priority = body.get('priority', 0)
+    if not isinstance(priority, int):
+        raise ValueError('"priority" must be an integer.')
+    return [tuple(x) for x in tasks], params, priority
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Scheduler:
+    """Priority queue of scoring jobs, run by n_workers worker processes.
+    A scheduler thread sends the queued jobs to idle workers and collects
+    their results; jobs are dicts, updated under the lock (copies of them
+    are returned)."""
+
+    def __init__(self, n_workers, max_queue=1000, ref_memory=1000, kaldi=None):
+        self.ctx = mp.get_context('spawn')
+        self.max_queue = max_queue
+        self.ref_memory = ref_memory
+        self.kaldi = kaldi
+        self.lock = threading.Condition()
+        self.jobs = {}
+        self.queue = []
+        self.n_queued = 0
+        self.finished = []
+        self.job_ids = itertools.count(1)
+        self.stopping = False
+        self.wake_recv, self.wake_send = self.ctx.Pipe(duplex=False)
+        self.workers = [self.start_worker() for _ in range(n_workers)]
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def start_worker(self):
+        conn, worker_conn = self.ctx.Pipe()
+        process = self.ctx.Process(target=worker_main, args=(worker_conn, self.ref_memory, self.kaldi),
+                                   daemon=True)
+        process.start()
+        worker_conn.close()
+        return {'process':process, 'conn':conn, 'job':None}
+
+    def wake(self):
+        self.wake_send.send(None)
+
+    def submit(self, tasks, params, priority=0):
+        with self.lock:
+            if self.n_queued >= self.max_queue:
+                raise QueueFull('Job queue is full ('+str(self.max_queue)+' jobs).')
+            job_id = str(next(self.job_ids))
+            job = {'id':job_id, 'status':'queued', 'priority':priority,
+                   'tasks':[list(x) for x in tasks], 'params':params,
+                   'created':time.time(), 'started':None, 'finished':None}
+            self.jobs[job_id] = job
+            heapq.heappush(self.queue, (-priority, int(job_id)))
+            self.n_queued += 1
+            job = dict(job)
+        self.wake()
+        return job
+
+    def pop_job(self):
+        # next queued job (cancelled jobs are left in the heap until popped)
+        while len(self.queue) > 0:
+            _, job_id = heapq.heappop(self.queue)
+            job = self.jobs.get(str(job_id))
+            if job is not None and job['status'] == 'queued':
+                self.n_queued -= 1
+                return job
+        return None
+
+    def finish(self, job, status, **kwargs):
+        job.update(kwargs, status=status, finished=time.time())
+        self.finished.append(job['id'])
+        while len(self.finished) > MAX_FINISHED_JOBS:
+            self.jobs.pop(self.finished.pop(0), None)
+        self.lock.notify_all()
+
+    def dispatch(self):
+        for worker in self.workers:
+            if worker['job'] is not None:
+                continue
+            job = self.pop_job()
+            if job is None:
+                break
+            job.update(status='running', started=time.time())
+            worker['job'] = job
+            worker['conn'].send((job['id'], job['tasks'], job['params']))
+
+    def collect(self, conn):
+        # result of the job of the worker of conn (if not cancelled)
+        with self.lock:
+            worker = [w for w in self.workers if w['conn'] is conn]
+            if self.stopping:
+                return
+            if len(worker) < 1:
+                # worker stopped by cancel (closed here, as it may be waited on)
+                conn.close()
+                return
+            worker = worker[0]
+            try:
+                result = conn.recv()
+            except (EOFError, OSError):
+                # worker process exited (e.g. killed), started again
+                result = {'status':'failed', 'error':'Scoring worker process exited'}
+                self.workers[self.workers.index(worker)] = self.start_worker()
+            job, worker['job'] = worker['job'], None
+            self.finish(job, result.pop('status'), **result)
+
+    def run(self):
+        while True:
+            with self.lock:
+                if self.stopping:
+                    break
+                self.dispatch()
+                conns = [w['conn'] for w in self.workers if w['job'] is not None]
+            for conn in wait(conns+[self.wake_recv]):
+                if conn is self.wake_recv:
+                    conn.recv()
+                else:
+                    self.collect(conn)
+
+    def cancel(self, job_id):
+        # cancelled job, None if not found (finished jobs are left unchanged)
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['status'] in FINISHED:
+                return None if job is None else dict(job)
+            if job['status'] == 'queued':
+                self.n_queued -= 1
+            else:
+                i = [w['job'] for w in self.workers].index(job)
+                self.stop_worker(self.workers[i])
+                self.workers[i] = self.start_worker()
+            self.finish(job, 'cancelled')
+            job = dict(job)
+        self.wake()
+        return job
+
+    def stop_worker(self, worker):
+        worker['process'].terminate()
+        worker['process'].join()
+
+    def wait_job(self, job_id, timeout):
+        with self.lock:
+            self.lock.wait_for(lambda: self.jobs.get(job_id, {}).get('status') in FINISHED + (None,),
+                               timeout)
+            job = self.jobs.get(job_id)
+            return None if job is None else dict(job)
+
+    def get_status(self):
+        with self.lock:
+            return {'workers':len(self.workers), 'queued':self.n_queued,
+                    'running':len([w for w in self.workers if w['job'] is not None]),
+                    'jobs':len(self.jobs)}
+
+    def list_jobs(self):
+        with self.lock:
+            return [{x:job[x] for x in job if x != 'result'} for job in self.jobs.values()]
+
+    def stop(self):
+        with self.lock:
+            self.stopping = True
+            for worker in self.workers:
+                self.stop_worker(worker)
+        self.wake()
+        self.thread.join()
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    """HTTP API of the Scheduler of the server (see the API above)."""
+
+    server_version = 'FS02Daemon/1.0'
+
+    def send_json(self, code, body):
+        data = json.dumps(fs02score.to_json_val(body), indent=2).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def get_job_id(self, url):
+        parts = url.path.strip('/').split('/')
+        return parts[1] if len(parts) == 2 and parts[0] == 'jobs' else None
+
+    def do_GET(self):
+        scheduler = self.server.scheduler
+        url = urlparse(self.path)
+        job_id = self.get_job_id(url)
+        if url.path.strip('/') == 'status':
+            self.send_json(200, scheduler.get_status())
+        elif url.path.strip('/') == 'jobs':
+            self.send_json(200, {'jobs':scheduler.list_jobs()})
+        elif job_id is not None:
+            try:
+                timeout = float(parse_qs(url.query).get('wait', ['0'])[0])
+            except ValueError:
+                return self.send_json(400, {'error':'wait must be a number of seconds.'})
+            job = scheduler.wait_job(job_id, timeout)
+            if job is None:
+                return self.send_json(404, {'error':'Unknown job: '+job_id})
+            self.send_json(200, job)
+        else:
+            self.send_json(404, {'error':'Unknown path: '+url.path})
+
+    def do_POST(self):
+        if urlparse(self.path).path.strip('/') != 'jobs':
+            return self.send_json(404, {'error':'Unknown path: '+self.path})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            tasks, params, priority = check_job_request(json.loads(self.rfile.read(length)))
+        except ValueError as e:
+            return self.send_json(400, {'error':str(e)})
+        try:
+            job = self.server.scheduler.submit(tasks, params, priority)
+        except QueueFull as e:
+            return self.send_json(503, {'error':str(e)})
+        self.send_json(202, job)
+
+    def do_DELETE(self):
+        job_id = self.get_job_id(urlparse(self.path))
+        job = self.server.scheduler.cancel(job_id) if job_id is not None else None
+        if job is None:
+            return self.send_json(404, {'error':'Unknown job: '+str(job_id)})
+        code = 200 if job['status'] == 'cancelled' else 409
+        self.send_json(code, {x:job[x] for x in job if x != 'result'})
+
+
+class DaemonServer(ThreadingMixIn, HTTPServer):
+    # one thread per request (as http.server.ThreadingHTTPServer, which
+    # needs Python >= 3.7), not waited for on exit
+    daemon_threads = True
+
+
+""" USAGE: server = fs02daemon.start_server(host, port, n_workers) """
+def start_server(host='127.0.0.1', port=8020, n_workers=1, max_queue=1000, ref_memory=1000,
+                 kaldi=None):
+    # HTTP server (not yet serving) with its Scheduler and worker processes
+    server = DaemonServer((host, port), DaemonHandler)
+    server.scheduler = Scheduler(n_workers, max_queue, ref_memory, kaldi)
+    return server
+
+
+
+if __name__ == '__main__':
+
+    # Input Arguments
+    host, port, n_workers, max_queue, ref_memory, kaldi = parse_arguments()
+
+    # Start Workers and HTTP API
+    server = start_server(host, port, n_workers, max_queue, ref_memory, kaldi)
+    print('FS02 scoring service on http://'+host+':'+str(port)+'/ with',
+          n_workers, 'worker processes. Press Ctrl+C to stop.')
+    del host, port, n_workers, max_queue, ref_memory, kaldi
+
+    # Serve Jobs until interrupted (Ctrl+C or SIGTERM)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('\nStopping FS02 scoring service.')
+    finally:
+        server.server_close()
+        server.scheduler.stop()
+    del server
+# EOF
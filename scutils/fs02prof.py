@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Per stage and per file timings of the FS02 score-files (--profile and
+#    --timings-json options)
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+Timings are only recorded after enable() (nothing is recorded, and stage()
+costs a function call, otherwise). For every stage (stages nested in a stage
+are recorded as "stage/nested_stage") and every file scored in a stage:
+  wall_s      : wall time
+  cpu_s       : CPU time of this process
+  subproc_s   : wall time of the commands run with util.get_term_output
+                (e.g. scoreFile_SAD.pl, compute-wer), their CPU time and no.
+                of calls are also recorded per command
+  peak_rss_mb : peak resident memory of this process at the end of the stage
+  py_peak_mb  : peak memory allocated by python in the stage (profile only,
+                Python >= 3.9)
+Files scored by util.run_jobs worker processes are timed in the worker. The
+worker times of all files are recorded as the "stage/workers" stage (and
+their nested stages as "stage/nested_stage"), summed over the workers.
+"""
+
+
+import cProfile, io, json, os, pstats, sys, time, tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, peak RSS is not reported
+    resource = None
+
+
+TIME_KEYS = ['wall_s', 'cpu_s', 'subproc_s']
+
+
+class Timings:
+    # timings recorded since enable(), see get_timings
+    def __init__(self, profile=False, json_path=None):
+        self.json_path = json_path
+        self.stack, self.py_peaks = [], []
+        self.stages, self.files, self.subprocs = {}, {}, {}
+        self.subproc_s = 0.0
+        self.start = get_usage(self)
+        self.profiler = cProfile.Profile() if profile else None
+        if profile:
+            tracemalloc.start()
+            self.profiler.enable()
+
+
+_timings = None
+
+
+""" USAGE: prof.enable(profile, json_path) """
+def enable(profile=False, json_path=None):
+    # start recording timings (and cProfile and tracemalloc, if profile),
+    # finish() writes them to json_path (if not None)
+    global _timings
+    _timings = Timings(profile, json_path)
+
+
+def is_enabled():
+    return _timings is not None
+
+
+def reset_peak_rss():
+    # resets the peak RSS of this process to its current RSS (Linux only),
+    # returns False if it cannot be reset
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def get_peak_rss_mb():
+    # peak resident set size of this process so far (None if unknown). On
+    # Linux, VmHWM is used, as ru_maxrss cannot be reset and a new process
+    # starts with the ru_maxrss of its parent (kept through fork and exec)
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1])/1024.0, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes on Linux
+    return round(peak_rss/(1024.0**2 if sys.platform == 'darwin' else 1024.0), 1)
+
+
+def get_usage(timings):
+    return {'wall_s':time.perf_counter(), 'cpu_s':time.process_time(),
+            'subproc_s':timings.subproc_s}
+
+
+def add_times(totals, times, count=1):
+    for x in TIME_KEYS:
+        totals[x] = totals.get(x, 0.0)+times[x]
+    totals['calls'] = totals.get('calls', 0)+count
+
+
+def get_path(name):
+    return '/'.join(_timings.stack+[name]) if name else '/'.join(_timings.stack)
+
+
+@contextmanager
+def stage(name):
+    """Record the timings of the enclosed code as stage name (nested in the
+    current stage, if any)."""
+    if _timings is None:
+        yield
+        return
+    path = get_path(name)
+    # tracemalloc.reset_peak needs Python >= 3.9
+    is_traced = tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak')
+    if is_traced:
+        # peak python memory per stage: the peak so far is kept by the
+        # enclosing stage before resetting it
+        if len(_timings.py_peaks) > 0:
+            _timings.py_peaks[-1] = max(_timings.py_peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    # added on entry, so that stages are listed in order of start
+    totals = _timings.stages.setdefault(path, {})
+    start = get_usage(_timings)
+    _timings.stack.append(name)
+    _timings.py_peaks.append(0)
+    try:
+        yield
+    finally:
+        _timings.stack.pop()
+        py_peak = _timings.py_peaks.pop()
+        end = get_usage(_timings)
+        add_times(totals, {x:end[x]-start[x] for x in TIME_KEYS})
+        totals['peak_rss_mb'] = get_peak_rss_mb()
+        if is_traced:
+            py_peak = max(py_peak, tracemalloc.get_traced_memory()[1])
+            totals['py_peak_mb'] = round(max(totals.get('py_peak_mb', 0.0), py_peak/1024.0**2), 1)
+            if len(_timings.py_peaks) > 0:
+                _timings.py_peaks[-1] = max(_timings.py_peaks[-1], py_peak)
+
+
+@contextmanager
+def timed_file(fname):
+    """Record the timings of the enclosed code as file fname of the current
+    stage."""
+    if _timings is None:
+        yield
+        return
+    start = get_usage(_timings)
+    try:
+        yield
+    finally:
+        end = get_usage(_timings)
+        add_times(_timings.files.setdefault(get_path(''), {}).setdefault(fname, {}),
+                  {x:end[x]-start[x] for x in TIME_KEYS})
+
+
+def get_command_name(term_cmd):
+    # e.g. "compute-wer", or "perl scoreFile_SAD.pl" for scripts
+    names = [os.path.basename(x) for x in term_cmd[:2]]
+    if names[0] in ['perl', 'python', 'python3', 'bash', 'sh'] and len(names) > 1:
+        return ' '.join(names)
+    return names[0]
+
+
+@contextmanager
+def timed_command(term_cmd):
+    """Record the wall and CPU time of a command run (and waited for) in the
+    enclosed code."""
+    if _timings is None:
+        yield
+        return
+    start_wall, start_times = time.perf_counter(), os.times()
+    try:
+        yield
+    finally:
+        wall_time = time.perf_counter()-start_wall
+        end_times = os.times()
+        cpu_time = (end_times.children_user-start_times.children_user)+\
+            (end_times.children_system-start_times.children_system)
+        _timings.subproc_s += wall_time
+        totals = _timings.subprocs.setdefault(get_command_name(term_cmd), {})
+        add_times(totals, {'wall_s':wall_time, 'cpu_s':cpu_time, 'subproc_s':wall_time})
+
+
+def get_job_label(args, i):
+    # file name (without extension) of the first argument of a job, if a path
+    if len(args) > 0 and isinstance(args[0], str):
+        return os.path.splitext(os.path.basename(args[0]))[0]
+    return str(i)
+
+
+def run_timed_job(func, args, label):
+    # runs in a util.run_jobs worker process: func(*args) timed as file label,
+    # the worker timings are returned with its result (or exception)
+    global _timings
+    if _timings is not None and _timings.profiler is not None:
+        # inherited from the parent (fork), only the parent is profiled
+        _timings.profiler.disable()
+        tracemalloc.stop()
+    _timings = Timings()
+    try:
+        with timed_file(label):
+            result, error = func(*args), None
+    except Exception as e:
+        result, error = None, e
+    return result, error, get_timings()
+
+
+""" USAGE: job = prof.get_job(func, args, i); executor.submit(*job) """
+def get_job(func, args, i):
+    # (func, *args) of a worker job, timed in the worker if enabled
+    if _timings is None:
+        return (func,)+tuple(args)
+    return (run_timed_job, func, args, get_job_label(args, i))
+
+
+""" USAGE: result = prof.get_job_result(future.result()) """
+def get_job_result(job_result):
+    # result of a get_job job, adding its worker timings to the current stage
+    if _timings is None:
+        return job_result
+    result, error, worker = job_result
+    for path, totals in worker['stages'].items():
+        add_times(_timings.stages.setdefault(get_path(path), {}), totals, totals['calls'])
+    for path, files in worker['files'].items():
+        stage_files = _timings.files.setdefault(get_path(path), {})
+        for fname, totals in files.items():
+            add_times(stage_files.setdefault(fname, {}), totals, totals['calls'])
+    workers = _timings.stages.setdefault(get_path('workers'), {})
+    add_times(workers, worker['total'])
+    workers['peak_rss_mb'] = max(workers.get('peak_rss_mb') or 0.0,
+                                 worker['total']['peak_rss_mb'] or 0.0)
+    for cmd, totals in worker['subprocesses'].items():
+        add_times(_timings.subprocs.setdefault(cmd, {}), totals, totals['calls'])
+    if error is not None:
+        raise error
+    return result
+
+
+def round_times(totals):
+    return {x:(round(y, 4) if x in TIME_KEYS else y) for x, y in totals.items()}
+
+
+""" USAGE: timings = prof.get_timings() """
+def get_timings():
+    # {'total', 'stages', 'files', 'subprocesses'} recorded since enable()
+    if _timings is None:
+        return None
+    end = get_usage(_timings)
+    total = {x:end[x]-_timings.start[x] for x in TIME_KEYS}
+    total['peak_rss_mb'] = get_peak_rss_mb()
+    py_peaks = [x['py_peak_mb'] for x in _timings.stages.values() if 'py_peak_mb' in x]
+    if len(py_peaks) > 0:
+        total['py_peak_mb'] = max(py_peaks)
+    return {'total':round_times(total),
+            'stages':{x:round_times(y) for x, y in _timings.stages.items() if 'calls' in y},
+            'files':{x:{fn:round_times(y) for fn, y in files.items()}
+                     for x, files in _timings.files.items()},
+            'subprocesses':{x:round_times(y) for x, y in _timings.subprocs.items()}}
+
+
+def format_timings(timings):
+    # printable table of the stage and subprocess timings
+    def fmt_val(val, fmt):
+        return fmt % val if val is not None else '-'
+    strz = '\t'+'*'*84
+    lines = ['\n\n'+strz, '\tTimings (secs) and Peak Memory (MB):',
+             '\t%-28s %6s %10s %10s %10s %9s %9s' % ('Stage', 'Calls', 'Wall', 'CPU',
+                                                     'Subproc', 'Peak RSS', 'Py Peak')]
+    rows = [(x, y) for x, y in timings['stages'].items()]+[('TOTAL', timings['total'])]
+    for name, totals in rows:
+        lines.append('\t%-28s %6s %10.3f %10.3f %10.3f %9s %9s' % (
+            name, totals.get('calls', ''), totals['wall_s'], totals['cpu_s'],
+            totals['subproc_s'], fmt_val(totals.get('peak_rss_mb'), '%.1f'),
+            fmt_val(totals.get('py_peak_mb'), '%.1f')))
+    for cmd, totals in timings['subprocesses'].items():
+        lines.append('\tCommand %-20s %6d %10.3f %10.3f' % (cmd, totals['calls'],
+                                                           totals['wall_s'], totals['cpu_s']))
+    lines.append(strz)
+    return lines
+
+
+def dump_profiles(log_path):
+    # cProfile stats (.prof, and the top functions in .prof.txt) and
+    # tracemalloc snapshot (.tracemalloc, and the top lines in .tracemalloc.txt)
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    _timings.profiler.disable()
+    _timings.profiler.dump_stats(log_path+'.prof')
+    stats_txt = io.StringIO()
+    pstats.Stats(_timings.profiler, stream=stats_txt).sort_stats('cumulative').print_stats(40)
+    with open(log_path+'.prof.txt', 'w') as file:
+        file.write(stats_txt.getvalue())
+    snapshot.dump(log_path+'.tracemalloc')
+    with open(log_path+'.tracemalloc.txt', 'w') as file:
+        file.write('\n'.join([str(x) for x in snapshot.statistics('lineno')[:40]])+'\n')
+    return [log_path+'.prof', log_path+'.prof.txt', log_path+'.tracemalloc',
+            log_path+'.tracemalloc.txt']
+
+
+""" USAGE: prof.finish(log_path) """
+def finish(log_path):
+    # prints the timings and writes them to the json_path of enable(), and if
+    # profiling, dumps the cProfile and tracemalloc snapshots to log_path.*
+    global _timings
+    if _timings is None:
+        return
+    timings = get_timings()
+    print('\n'.join(format_timings(timings)))
+    written = []
+    if _timings.profiler is not None:
+        written += dump_profiles(log_path)
+    if _timings.json_path is not None:
+        with open(_timings.json_path, 'w') as file:
+            json.dump(timings, file, indent=2)
+        written.append(_timings.json_path)
+    if len(written) > 0:
+        print('\tTimings and Profiles written to paths:\n\t\t'+'\n\t\t'.join(written)+'\n\n')
+    _timings = None
+# EOF
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Python port of scoreFile_SAD.pl (v5.0) developed by NIST
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Open-Source Software Credits:
+# NIST openSAT  - SAD          -  DCF   - (https://www.nist.gov/itl/iad/mig/
+#                             nist-open-speech-activity-detection-evaluation)
+###############################################################################
+
+In-process SAD DCF engine. This module follows scoreFile_SAD.pl step by step
+(ref/hyp inhaling, collar generation and the merge walk of
+computeAndPrintScores), so that the miss, false alarm and DCF values match
+the ones printed by the perl script. Segments are kept as
+[start, end, segType] lists, with segType one of 'Speech', 'NonSpeech' or
+'Collar', like in the perl script.
+
+All collars are scored together from one sorted boundary array (see
+score_collars), with the merge walk kept for segments that are not
+contiguous.
+"""
+
+
+from collections import namedtuple
+
+import numpy as np
+
+import fs02archive
+import fs02cache
+import fs02prof as prof
+import fs02store
+import fs02utils as util
+
+
+SAD_COLLARS = [0.0, 0.25, 0.5, 1.0, 2.0]
+
+# Ref/Hyp column numbers (zero-based) used by the FS02 SAD file format
+# (same as the -s -e -g -t -f -u arguments passed to scoreFile_SAD.pl)
+REF_START_COL, REF_END_COL, REF_TYPE_COL = 2, 3, 4
+HYP_START_COL, HYP_END_COL, HYP_TYPE_COL = 5, 6, 7
+
+REF_NONSPEECH_TYPES = ('NS', 'NT', 'RX', 'RS')
+REF_SPEECH_TYPES = ('S', 'RI')
+REF_COLLAR_TYPES = ('nonScorable', 'Mixed', 'Uncertain')
+HYP_NONSPEECH_TYPES = ('non-speech', 'nonspeech')
+
+# Minimum NonSpeech durations (secs) for which collars are not merged, so that
+# the remaining NonSpeech segment lasts for at least 0.1 seconds.
+# EDGE: first or last NonSpeech segment of the file (collar on one side only)
+# SPLIT: NonSpeech segment in between two Speech segments
+EDGE_MIN_DUR = {0.25:0.35, 0.5:0.6, 1.0:1.1, 2.0:2.1}
+SPLIT_MIN_DUR = {0.25:0.6, 0.5:1.1, 1.0:2.1, 2.0:4.1}
+
+
+SEG_TYPES = ['NonSpeech', 'Speech', 'Collar']
+NONSPEECH, SPEECH, COLLAR = range(len(SEG_TYPES))
+
+# version of the read_ref_segs output stored in the reference cache
+REF_CACHE_VERSION = 1
+
+# version of the SADScores stored in the result store (see fs02store)
+RESULT_VERSION = 1
+
+
+SADScores = namedtuple('SADScores', ['collar', 'dcf', 'p_miss', 'p_fa',
+                        'miss_time', 'fa_time', 'tn_time', 'tp_time',
+                        'speech_time', 'nonspeech_time'])
+
+# Scores of all files for one collar: files (names of the scored files) and
+# their dcf, p_miss and p_fa arrays, not_scored (names of files which could
+# not be scored)
+SADResults = namedtuple('SADResults', ['collar', 'files', 'dcf', 'p_miss', 'p_fa',
+                        'not_scored'])
+
+
+def _chomp(line):
+    if line.endswith('\n'):
+        line = line[:-1]
+    return line
+
+
+def _get_float(fields, col):
+    try:
+        return float(fields[col])
+    except (IndexError, ValueError):
+        raise ValueError('Invalid time field in line: '+'\t'.join(fields))
+
+
+def _get_field(fields, col):
+    if col < len(fields):
+        return fields[col]
+    return ''
+
+
+def read_ref_segs(lines):
+    """Inhale the ref, converting it to segments with no collars."""
+    noCollar_segs = []
+    currRefTime = 0.0
+    prevIntervalType = ''
+    for line in lines:
+        fields = _chomp(line).split('\t')
+        segType = _get_field(fields, REF_TYPE_COL)
+        if segType not in REF_NONSPEECH_TYPES+REF_SPEECH_TYPES+REF_COLLAR_TYPES:
+            raise ValueError('Error: Unexpected segment type '+segType+
+                             '   (which is not S, NS, NT, RX, RS, or RI)')
+        start = _get_float(fields, REF_START_COL)
+        end = _get_float(fields, REF_END_COL)
+
+        if start > currRefTime and currRefTime == 0.0:
+            # ref does not begin at 0.0, so an initial collar segment is added
+            noCollar_segs.append([0.0, start, 'Collar'])
+            currRefTime = start
+
+        if start > currRefTime and currRefTime > 0.0:
+            raise ValueError('Error in ref file at un-annotated time interval'+
+                             ' from '+str(currRefTime)+' to '+str(start))
+        elif segType in REF_NONSPEECH_TYPES:
+            if prevIntervalType == 'NonSpeech' and currRefTime > 0.0:
+                start = noCollar_segs.pop()[0]
+            noCollar_segs.append([start, end, 'NonSpeech'])
+            prevIntervalType = 'NonSpeech'
+            currRefTime = end
+        elif segType in REF_SPEECH_TYPES and start == currRefTime:
+            # RI is treated as S (same as scoreFile_SAD.pl)
+            if prevIntervalType == 'Speech' and currRefTime > 0.0:
+                start = noCollar_segs.pop()[0]
+            noCollar_segs.append([start, end, 'Speech'])
+            prevIntervalType = 'Speech'
+            currRefTime = end
+        elif segType in REF_COLLAR_TYPES and start == currRefTime:
+            noCollar_segs.append([start, end, 'Collar'])
+            currRefTime = end
+        else:
+            raise ValueError('Error: overlapping ref segs, with end prev seg at '+
+                             str(currRefTime)+' and begin new seg at '+str(start))
+
+    if len(noCollar_segs) < 1:
+        raise ValueError('No segments found in ref file')
+    if noCollar_segs[0][2] == 'NonSpeech' and noCollar_segs[0][0] != 0.0:
+        raise ValueError('Unexpected ref start time > 0.0')
+    return noCollar_segs
+
+
+def get_collar_segs(noCollar_segs, collar):
+    """Generate the ref segments for a collar size (collars come out of the
+    NonSpeech segments, Speech and Collar segments are kept unchanged)."""
+    if collar == 0.0:
+        return noCollar_segs
+    edge_dur = EDGE_MIN_DUR[collar]
+    split_dur = SPLIT_MIN_DUR[collar]
+
+    first_start, first_end, first_type = noCollar_segs[0]
+    first_dur = first_end - first_start
+    if first_type == 'NonSpeech' and first_dur >= edge_dur:
+        # collar preceding the first speech region
+        if first_dur > collar:
+            collar_segs = [[first_start, first_end-collar, 'NonSpeech']]
+        else:
+            collar_segs = []
+        collar_segs.append([first_end-collar, first_end, 'Collar'])
+    elif first_type == 'NonSpeech':
+        collar_segs = [[first_start, first_end, 'Collar']]
+    else:
+        collar_segs = [[0.0, first_end, first_type]]
+
+    lastIdx = len(noCollar_segs) - 1
+    for xx in range(1, lastIdx+1):
+        start, end, segType = noCollar_segs[xx]
+        dur = end - start
+        if segType != 'NonSpeech':
+            collar_segs.append([start, end, segType])
+        elif xx < lastIdx and dur >= split_dur:
+            collar_segs.append([start, start+collar, 'Collar'])
+            collar_segs.append([start+collar, end-collar, 'NonSpeech'])
+            collar_segs.append([end-collar, end, 'Collar'])
+        elif xx == lastIdx and dur >= edge_dur:
+            collar_segs.append([start, start+collar, 'Collar'])
+            collar_segs.append([start+collar, end, 'NonSpeech'])
+        else:
+            # merged collar
+            collar_segs.append([start, end, 'Collar'])
+    return collar_segs
+
+
+def read_hyp_segs(lines):
+    """Inhale the system output (hyp) segments."""
+    hyp_segs = []
+    currHypTime = 0.0
+    prevIntervalType = ''
+    for line in lines:
+        fields = _chomp(line).split('\t')
+        start = _get_float(fields, HYP_START_COL)
+        segType = _get_field(fields, HYP_TYPE_COL)
+        if start != currHypTime:
+            raise ValueError('Error in hyp file at un-annotated time interval'+
+                             ' from '+str(currHypTime)+' to '+str(start))
+        elif segType in HYP_NONSPEECH_TYPES:
+            segType = 'NonSpeech'
+        elif segType == 'speech':
+            segType = 'Speech'
+        else:
+            raise ValueError('Error: overlapping hyp segs, with end prev seg at '+
+                             str(currHypTime)+' and begin new seg at '+
+                             str(start)+' with type '+segType)
+        end = _get_float(fields, HYP_END_COL)
+        if prevIntervalType == segType and currHypTime > 0.0:
+            start = hyp_segs.pop()[0]
+        hyp_segs.append([start, end, segType])
+        currHypTime = end
+        prevIntervalType = segType
+
+    if len(hyp_segs) < 1:
+        raise ValueError('No segments found in hyp file')
+    return hyp_segs
+
+
+def trim_hyp_segs(hyp_segs, refStartTime, refEndTime):
+    """Trim/pad the hyp so that it starts and ends with the ref."""
+    hyp_segs = [list(x) for x in hyp_segs]
+    try:
+        if hyp_segs[0][0] < refStartTime:
+            while hyp_segs[0][1] <= refStartTime:
+                hyp_segs.pop(0)
+        if hyp_segs[0][0] > refStartTime:
+            if hyp_segs[0][2] == 'NonSpeech':
+                hyp_segs[0][0] = refStartTime
+            else:
+                hyp_segs.insert(0, [refStartTime, hyp_segs[0][0], 'NonSpeech'])
+        if hyp_segs[-1][1] > refEndTime:
+            while hyp_segs[-1][0] >= refEndTime:
+                hyp_segs.pop()
+    except IndexError:
+        raise ValueError('Hyp segments do not overlap ref segments')
+    if hyp_segs[-1][1] > refEndTime:
+        hyp_segs[-1][1] = refEndTime
+    if hyp_segs[-1][1] < refEndTime:
+        hyp_segs.append([hyp_segs[-1][1], refEndTime, 'NonSpeech'])
+    return hyp_segs
+
+
+def get_dcf(p_miss, p_fa):
+    return 0.75*p_miss + 0.25*p_fa
+
+
+def compute_SAD_scores(ref_segs, hyp_segs, collar):
+    """Merge walk over the (contiguous) ref and hyp segments, and DCF for the
+    collar size (computeAndPrintScores from scoreFile_SAD.pl)."""
+    speechTimeSum = 0.0
+    truePositiveSum = 0.0
+    falseNegativeSum = 0.0
+    nonSpeechTimeSum = 0.0
+    trueNegativeSum = 0.0
+    falsePositiveSum = 0.0
+
+    currScoringTime = 0.0
+    currRefState = 'undefined'
+    currHypState = 'undefined'
+    endScoredTime = ref_segs[-1][1]
+    hypIdx, maxHypIdx = 0, len(hyp_segs) - 1
+    refIdx, maxRefIdx = 0, len(ref_segs) - 1
+
+    while currScoringTime < endScoredTime:
+        prevScoringTime = currScoringTime
+        hyp_start, hyp_end, hyp_type = hyp_segs[hypIdx]
+        ref_start, ref_end, ref_type = ref_segs[refIdx]
+        # the seg(s) starting at currScoringTime give the current state(s)
+        if hyp_start <= ref_start:
+            currRefState = ref_type
+        if hyp_start >= ref_start:
+            currHypState = hyp_type
+        # end of the interval to be scored is the end of hyp or ref seg
+        if hyp_end <= ref_end:
+            currScoringTime = hyp_end
+            if hypIdx < maxHypIdx:
+                hypIdx += 1
+            elif refIdx == maxRefIdx and currScoringTime == prevScoringTime:
+                raise ValueError('Ref and Hyp segments could not be aligned')
+        else:
+            currScoringTime = ref_end
+            if refIdx < maxRefIdx:
+                refIdx += 1
+            elif hypIdx == maxHypIdx and currScoringTime == prevScoringTime:
+                raise ValueError('Ref and Hyp segments could not be aligned')
+
+        if currRefState == 'Collar':
+            continue
+        segDur = currScoringTime - prevScoringTime
+        if currRefState == 'Speech':
+            speechTimeSum += segDur
+            if currHypState == 'Speech':
+                truePositiveSum += segDur
+            elif currHypState == 'NonSpeech':
+                falseNegativeSum += segDur
+        elif currRefState == 'NonSpeech':
+            nonSpeechTimeSum += segDur
+            if currHypState == 'NonSpeech':
+                trueNegativeSum += segDur
+            elif currHypState == 'Speech':
+                falsePositiveSum += segDur
+
+    return get_SAD_scores(collar, falseNegativeSum, falsePositiveSum,
+                          trueNegativeSum, truePositiveSum,
+                          speechTimeSum, nonSpeechTimeSum)
+
+
+def get_SAD_scores(collar, falseNegativeSum, falsePositiveSum, trueNegativeSum,
+                   truePositiveSum, speechTimeSum, nonSpeechTimeSum):
+    # speech (or nonspeech) time of 0 is taken as 1 for the miss (or FA) rate
+    isSpeech = speechTimeSum >= 0.00001
+    isNonSpeech = nonSpeechTimeSum >= 0.00001
+    p_miss = falseNegativeSum / (speechTimeSum if isSpeech else 1)
+    p_fa = falsePositiveSum / (nonSpeechTimeSum if isNonSpeech else 1)
+    if isSpeech and isNonSpeech:
+        dcf = get_dcf(p_miss, p_fa)
+    elif isSpeech:
+        dcf = 0.75*p_miss
+    elif isNonSpeech:
+        dcf = 0.25*p_fa
+    else:
+        dcf = 0.0
+    return SADScores(collar, dcf, p_miss, p_fa, falseNegativeSum,
+                     falsePositiveSum, trueNegativeSum, truePositiveSum,
+                     speechTimeSum, nonSpeechTimeSum)
+
+
+def is_contiguous(segs):
+    # every segment starts at the end of the previous one and is not empty
+    for xx in range(len(segs)):
+        if segs[xx][1] <= segs[xx][0]:
+            return False
+        if xx > 0 and segs[xx][0] != segs[xx-1][1]:
+            return False
+    return True
+
+
+def get_seg_arrays(segs):
+    starts = np.array([x[0] for x in segs], dtype='float64')
+    ends = np.array([x[1] for x in segs], dtype='float64')
+    types = np.array([SEG_TYPES.index(x[2]) for x in segs], dtype='int8')
+    return starts, ends, types
+
+
+def get_collar_bounds(starts, ends, types, collar):
+    """Vectorized get_collar_segs for contiguous ref segments. Returns the
+    sorted boundaries of the segments for the collar size, and their types."""
+    nSegs = len(types)
+    if collar == 0.0:
+        return np.append(starts, ends[-1]), types
+    dur = ends - starts
+    segIdx = np.arange(nSegs)
+    isNonSpeech = types == NONSPEECH
+    # NonSpeech segments split into [NonSpeech, Collar], [Collar, NonSpeech,
+    # Collar] or [Collar, NonSpeech]; others are merged into a Collar
+    isHead = isNonSpeech & (segIdx == 0) & (dur >= EDGE_MIN_DUR[collar])
+    isSplit = isNonSpeech & (segIdx > 0) & (segIdx < nSegs-1) & \
+        (dur >= SPLIT_MIN_DUR[collar])
+    isTail = isNonSpeech & (segIdx > 0) & (segIdx == nSegs-1) & \
+        (dur >= EDGE_MIN_DUR[collar])
+
+    sub_starts = np.stack([starts,
+                           np.where(isHead, ends-collar, starts+collar),
+                           ends-collar], axis=1)
+    first_types = np.where(isNonSpeech, COLLAR, types)
+    first_types[isHead] = NONSPEECH
+    second_types = np.where(isHead, COLLAR, NONSPEECH)
+    sub_types = np.stack([first_types, second_types,
+                          np.full(nSegs, COLLAR)], axis=1).astype('int8')
+    isValid = np.stack([np.ones(nSegs, dtype=bool), isHead|isSplit|isTail,
+                        isSplit], axis=1)
+    collar_bounds = np.append(sub_starts[isValid], ends[-1])
+    return collar_bounds, sub_types[isValid]
+
+
+def score_collars(noCollar_segs, hyp_segs, collars=SAD_COLLARS):
+    """Score all collars in a single pass over contiguous ref and hyp
+    segments. The scored intervals of each collar are taken from one sorted
+    array with the boundaries of the ref (for all collars) and of the hyp;
+    time sums are accumulated in time order, as in the merge walk."""
+    ref_starts, ref_ends, ref_types = get_seg_arrays(noCollar_segs)
+    hyp_starts, hyp_ends, hyp_types = get_seg_arrays(hyp_segs)
+    hyp_bounds = np.append(hyp_starts, hyp_ends[-1])
+    collar_bounds = {c:get_collar_bounds(ref_starts, ref_ends, ref_types, c)
+                     for c in collars}
+    all_bounds = np.unique(np.concatenate(
+        [hyp_bounds]+[collar_bounds[c][0] for c in collars]))
+    endScoredTime = ref_ends[-1]
+    all_bounds = all_bounds[all_bounds <= endScoredTime]
+    isHypBound = np.zeros(len(all_bounds), dtype=bool)
+    isHypBound[np.searchsorted(all_bounds, hyp_bounds[hyp_bounds <= endScoredTime])] = True
+
+    scores = {}
+    for collar in collars:
+        bounds, types = collar_bounds[collar]
+        isBound = isHypBound.copy()
+        isBound[np.searchsorted(all_bounds, bounds)] = True
+        scoring_times = all_bounds[isBound]
+        segDurs = np.diff(scoring_times)
+        refState = types[np.searchsorted(bounds, scoring_times[:-1], 'right')-1]
+        hypState = hyp_types[np.searchsorted(hyp_bounds, scoring_times[:-1], 'right')-1]
+
+        def time_sum(isScored):
+            # sequential sum (np.sum uses pairwise summation)
+            if not isScored.any():
+                return 0.0
+            return float(np.cumsum(np.where(isScored, segDurs, 0.0))[-1])
+        isSpeech = refState == SPEECH
+        isNonSpeech = refState == NONSPEECH
+        scores[collar] = get_SAD_scores(
+            collar, time_sum(isSpeech & (hypState == NONSPEECH)),
+            time_sum(isNonSpeech & (hypState == SPEECH)),
+            time_sum(isNonSpeech & (hypState == NONSPEECH)),
+            time_sum(isSpeech & (hypState == SPEECH)),
+            time_sum(isSpeech), time_sum(isNonSpeech))
+    return scores
+
+
+def read_lines(file_path):
+    with fs02archive.open_file(file_path, 'r') as file:
+        return file.readlines()
+
+
+def parse_ref_file(gt_fp):
+    return read_ref_segs(read_lines(gt_fp))
+
+
+def ref_segs_to_arrays(noCollar_segs):
+    return {'starts':np.array([x[0] for x in noCollar_segs], dtype=np.float64),
+            'ends':np.array([x[1] for x in noCollar_segs], dtype=np.float64),
+            'types':np.array([SEG_TYPES.index(x[2]) for x in noCollar_segs], dtype=np.int8)}
+
+
+def ref_segs_from_arrays(arrays):
+    seg_types = [SEG_TYPES[x] for x in arrays['types'].tolist()]
+    return [[start, end, seg_type] for start, end, seg_type in
+            zip(arrays['starts'].tolist(), arrays['ends'].tolist(), seg_types)]
+
+
+def load_ref_segs(gt_fp):
+    # read_ref_segs of a ground truth file, from the reference cache
+    return fs02cache.load_cached(gt_fp, 'sad_ref', REF_CACHE_VERSION, parse_ref_file,
+                                 ref_segs_to_arrays, ref_segs_from_arrays)
+
+
+def score_SAD_segs(noCollar_segs, hyp_segs, collars=SAD_COLLARS):
+    collars = [float(c) for c in collars]
+    refStartTime = noCollar_segs[0][0]
+    hyp_segs = trim_hyp_segs(hyp_segs, refStartTime, noCollar_segs[-1][1])
+    if refStartTime == 0.0 and hyp_segs[0][0] <= refStartTime and \
+            is_contiguous(noCollar_segs) and is_contiguous(hyp_segs):
+        return score_collars(noCollar_segs, hyp_segs, collars)
+    scores = {}
+    for collar in collars:
+        ref_segs = get_collar_segs(noCollar_segs, collar)
+        scores[collar] = compute_SAD_scores(ref_segs, hyp_segs, collar)
+    return scores
+
+
+""" USAGE: scores = fs02sad.score_file_SAD(gt_fp, hyp_fp, [0.5]) """
+def score_file_SAD(gt_fp, hyp_fp, collars=SAD_COLLARS):
+    """Score a SAD system output file against its ground truth file.
+    Returns a dict of SADScores per collar. Raises ValueError for files
+    which scoreFile_SAD.pl could not score."""
+    with prof.stage('parsing'):
+        noCollar_segs = load_ref_segs(gt_fp)
+        hyp_segs = read_hyp_segs(read_lines(hyp_fp))
+    with prof.stage('scoring'):
+        return score_SAD_segs(noCollar_segs, hyp_segs, collars)
+
+
+def get_stored_scores(fileList, fileDict, collars, store):
+    # ({fn:{collar:SADScores}} of the stored files, {fn:{collar:key}})
+    keys = {fn:{c:store.get_key('SAD', RESULT_VERSION, [fileDict['ref'][fn], fileDict['hyp'][fn]],
+                                {'collar':c}) for c in collars} for fn in fileList}
+    stored = store.get_stats([key for fn in fileList for key in keys[fn].values()])
+    scores_dict = {fn:{c:SADScores(**stored[keys[fn][c]]) for c in collars}
+                   for fn in fileList if all([key in stored for key in keys[fn].values()])}
+    return scores_dict, keys
+
+
+""" USAGE: results = fs02sad.score_files_SAD(fileList, fileDict, [0.5], n_jobs, store) """
+def score_files_SAD(fileList, fileDict, collars=SAD_COLLARS, n_jobs=1, store=None):
+    """Score the (ref, hyp) file pairs of util.find_files_to_score with n_jobs
+    worker processes. Returns a dict of SADResults per collar. With a
+    fs02store.ResultStore, only files without stored scores are scored."""
+    collars = [float(c) for c in collars]
+    scores_dict = {}
+    if store is not None:
+        scores_dict, keys = get_stored_scores(fileList, fileDict, collars, store)
+    to_score = fs02archive.sort_by_archive([fn for fn in fileList if fn not in scores_dict],
+                                           fileDict['hyp'])
+    args_list = [(fileDict['ref'][fn], fileDict['hyp'][fn], collars) for fn in to_score]
+    for fn, scores in zip(to_score, util.run_jobs(score_file_SAD, args_list, n_jobs)):
+        scores_dict[fn] = scores
+    if store is not None:
+        store.put_stats([(keys[fn][c], 'SAD', fn, fs02store.to_stats(scores_dict[fn][c]))
+                         for fn in to_score if scores_dict[fn] is not None for c in collars])
+    scores_list = [scores_dict[fn] for fn in fileList]
+    files = [fn for fn, scores in zip(fileList, scores_list) if scores is not None]
+    not_scored = [fn for fn, scores in zip(fileList, scores_list) if scores is None]
+    scores_list = [scores for scores in scores_list if scores is not None]
+    results = {}
+    for collar in collars:
+        score_arrays = [np.array([scores[collar]._asdict()[x] for scores in scores_list],
+                                 dtype=np.float64) for x in ['dcf', 'p_miss', 'p_fa']]
+        results[collar] = SADResults(collar, files, *score_arrays, not_scored)
+    return results
+
+
+""" USAGE: results = fs02sad.score_SAD(ref_path, hyp_path, [0.5]) """
+def score_SAD(ref_path, hyp_path, collars=SAD_COLLARS, n_jobs=1, store=None):
+    """Score a SAD system output directory against the ground truth directory.
+    Returns a dict of SADResults per collar. Raises util.ScoringError for
+    invalid inputs (files which could not be scored are listed in
+    not_scored)."""
+    ref_path = util.check_path(ref_path)
+    hyp_path = util.check_path(hyp_path)
+    fileList, fileDict, _ = util.find_files_to_score(ref_path, hyp_path)
+    return score_files_SAD(fileList, fileDict, collars, n_jobs, store)
+
+
+def get_overall(results, score_name='dcf'):
+    # mean of the per file scores (as printed by scoreFile_SAD.pl), rounded
+    # like the OVERALL results of scoreFS02SAD.py
+    score_vals = getattr(results, score_name)
+    if len(score_vals) < 1:
+        raise util.ScoringError('No files could be scored for collar '+str(results.collar))
+    return round(sum([float(format_score(x)) for x in score_vals])/len(score_vals),5)
+
+
+def format_score(score_val):
+    # same precision as the scores printed by scoreFile_SAD.pl
+    return '%7.5f' % score_val
+# EOF
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Single entry point scoring all FS02 Tasks (SAD, SD, SID, ASR) in one process
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Open-Source Software Credits:
+# KALDI         - ASR          -  WER   - (http://kaldi-asr.org),
+#                                         (https://github.com/kaldi-asr/kaldi/
+#                                         blob/master/src/bin/compute-wer.cc)
+# DSCORE        - DIARIZATION  -  DER   - (https://github.com/nryant/dscore)
+# NIST openSAT  - SAD          -  DCF   - (https://www.nist.gov/itl/iad/mig/
+#                             nist-open-speech-activity-detection-evaluation)
+###############################################################################
+"""
+
+import fs02utils as util
+import fs02asr
+import fs02sd
+import fs02sid
+import fs02store
+import scoreFS02SAD as sad_score
+import scoreFS02SD as sd_score
+import scoreFS02SID as sid_score
+import scoreFS02ASR as asr_score
+import argparse, io, json, math, os
+from contextlib import redirect_stdout
+
+
+TASKS = ['SAD', 'SD_track1', 'SD_track2', 'SID', 'ASR_track1', 'ASR_track2']
+TASK_ARGS = {'SAD':'sad', 'SD_track1':'sd1', 'SD_track2':'sd2', 'SID':'sid',
+             'ASR_track1':'asr1', 'ASR_track2':'asr2'}
+DEF_TASKS = ['SAD', 'SD_track1', 'SID', 'ASR_track1', 'ASR_track2']
+DEF_PARAMS = {'sadcollar':0.5, 'diarcollar':0.25, 'topN':5, 'sidstream':False,
+              'mode':'all', 'kaldi':None, 'align':False, 'n_jobs':1, 'incremental':False}
+
+
+
+def parse_arguments():
+
+    def_out_path = util.get_results_path()+'FS02_Scores_'+util.getDateTimeStrStamp()+'.json'
+
+
+    desc='Single entry point to generate Scores for all FS02 Challenge Tasks '+\
+        '(SAD, SD track1/track2, SID, ASR track1/track2) in one process. '+\
+        'Tasks are scored concurrently and all results are written to one '+\
+        'json file. Every task takes the same ref and hyp paths as its own '+\
+        'wrapper file (scoreFS02<Task>.py). If no task is given, all tasks are '+\
+        'scored on the default examples provided with the toolkit.'
+
+    tsk_str = 'Reference (ground truth) and Hypothesis (system output) Paths '+\
+        'for the %s Task. (same as --ref and --hyp of %s) May be given more than once, '+\
+        'e.g. for several submission packets (archives).'
+    out_str = 'Output (overall and per file system scores of all tasks) json File Path. '+\
+        'Default: Result file will stored in '+util.get_results_path()+' directory. '+\
+        'Text results and log files of every task will be stored in '+util.get_logs_path()
+    sclr_str = 'Desired forgiveness Collar for SAD evaluation. Default: 0.5 secs.'
+    dclr_str = 'Desired forgiveness Collar for SD evaluation. Default: 0.25 secs.'
+    top_str = 'Desired Top-N Accuracy for SID evaluation. Default: Top-5 Accuracy.'
+    stm_str = 'Stream SID Ref and Hyp files line by line (see scoreFS02SID.py --stream).'
+    mod_str = 'ASR Scoring mode (as compute-wer --mode). Input Options: '+\
+        ', '.join(fs02asr.WER_MODES)+'. Default: all.'
+    kld_str = 'base path to the locally installed kaldi directory. If provided, '+\
+        'ASR Tasks are scored with the kaldi engine. Default: python engine.'
+    aln_str = 'Also write ASR alignment reports (see scoreFS02ASR.py --align).'
+    inc_str = 'Incremental SAD and SD scoring: only files changed since an earlier '+\
+        '--incremental run are scored again (see --incremental of scoreFS02SAD.py).'
+    job_str = 'Number of tasks scored in parallel (worker processes). '+\
+        'Results are identical to a serial run. Default: no. of tasks (up to no. of CPUs).'
+
+
+    parser = argparse.ArgumentParser(description=desc)
+    for task in TASKS:
+        wrapper = 'scoreFS02'+task.split('_')[0]+'.py'
+        parser.add_argument('-'+TASK_ARGS[task], '--'+TASK_ARGS[task], type=str, nargs=2,
+                            action='append', metavar=('REF', 'HYP'),
+                            help=tsk_str % (task, wrapper))
+    parser.add_argument('-out', '--out', type=str, default=def_out_path, help=out_str)
+    parser.add_argument('-sadcollar', '--sadcollar', type=float, default=0.5, help=sclr_str)
+    parser.add_argument('-diarcollar', '--diarcollar', type=float, default=0.25, help=dclr_str)
+    parser.add_argument('-topN', '--topN', type=int, default=5, help=top_str)
+    parser.add_argument('-sidstream', '--sidstream', action='store_true', help=stm_str)
+    parser.add_argument('-mode', '--mode', type=str, default='all',
+                        choices=fs02asr.WER_MODES, help=mod_str)
+    parser.add_argument('-kaldi','--kaldi', type=str, default=None, help=kld_str)
+    parser.add_argument('-align', '--align', action='store_true', help=aln_str)
+    parser.add_argument('-incremental', '--incremental', action='store_true', help=inc_str)
+    parser.add_argument('-jobs', '--jobs', type=int, default=0, help=job_str)
+    args = parser.parse_args()
+
+    task_list = [(task,)+tuple(paths) for task in TASKS
+                 for paths in (getattr(args, TASK_ARGS[task]) or [])]
+    if len(task_list) < 1:
+        print('No Task ref and hyp paths provided.')
+        print('Running Script on default examples for Tasks:',', '.join(DEF_TASKS))
+        task_list = get_default_tasks()
+    out_path = util.processInpPath(args.out, inpType='file')
+    if args.kaldi is not None:
+        args.kaldi = util.processInpPath(args.kaldi)
+    params = {'sadcollar':args.sadcollar, 'diarcollar':args.diarcollar, 'topN':args.topN,
+              'sidstream':args.sidstream, 'mode':args.mode, 'kaldi':args.kaldi,
+              'align':args.align, 'incremental':args.incremental}
+    n_jobs = util.proc_n_jobs(args.jobs) if args.jobs != 0 else None
+
+    return task_list, out_path, params, n_jobs
+
+
+
+def get_default_tasks():
+    ref_def = util.get_fs02sctk_path()+'egs/ref_gt/'
+    hyp_def = util.get_fs02sctk_path()+'egs/sys_results/'
+    sid_mp = 'SID/FS01_SID_uttID2spkID_Dev.txt'
+    asr2_mp = 'ASR/ASR_track2/FS01_ASR_track2_transcriptions_Dev'
+    task_mps = {'SAD':('SAD/','SAD/'), 'SD_track1':('SD/','SD/'), 'SID':(sid_mp, sid_mp),
+                'ASR_track1':('ASR/ASR_track1/','ASR/ASR_track1/'),
+                'ASR_track2':(asr2_mp, asr2_mp)}
+    return [(task, ref_def+task_mps[task][0], hyp_def+task_mps[task][1]) for task in DEF_TASKS]
+
+
+
+""" USAGE: inputs, write_msg = prep_task(task, ref_path, hyp_path, params, discovered) """
+def prep_task(task, ref_path, hyp_path, params, discovered):
+    # input paths and files to score of a task, as checked by its wrapper file
+    # (raises util.ScoringError). Files to score are found once per (ref, hyp)
+    # in the parent process and shared (through discovered) by all tasks
+    # scoring the same paths.
+    inputs = {'ref':ref_path, 'hyp':hyp_path, 'fileList':None, 'fileDict':None}
+    if task in ['SID', 'ASR_track2']:
+        inputs['ref'] = util.check_path(ref_path, inpType='file', checkExists=True)
+        inputs['hyp'] = util.check_path(hyp_path, inpType='file', checkExists=True)
+    else:
+        inputs['ref'] = util.check_path(ref_path)
+        inputs['hyp'] = util.check_path(hyp_path)
+
+    if task == 'SAD':
+        disc_key = (inputs['ref'], inputs['hyp'], True, '')
+        write_msg = sad_score.get_write_msg_list((inputs['ref'], inputs['hyp'],
+                                                  sad_score.proc_sad_collar(params['sadcollar'])))
+    elif task.startswith('SD'):
+        inputs['ref'] = fs02sd.check_ref_files(inputs['ref'])
+        disc_key = (inputs['ref']+'RTTM/', inputs['hyp'], True, '')
+        write_msg = sd_score.get_write_msg_list((inputs['ref'], inputs['hyp'],
+                                                 sd_score.proc_sd_collar(params['diarcollar'])))
+    elif task == 'SID':
+        if params['sidstream']:
+            max_TopN = fs02sid.get_max_topN_stream(inputs['hyp'])
+        else:
+            max_TopN = fs02sid.get_max_topN(inputs['hyp'])
+        inputs['max_TopN'] = max_TopN
+        inputs['topN'] = fs02sid.check_topN(params['topN'], max_TopN)
+        disc_key = None if params['sidstream'] else (inputs['ref'], inputs['hyp'], False, 'SID')
+        write_msg = sid_score.get_write_msg_list((inputs['ref'], inputs['hyp'], inputs['topN']))
+    else:
+        disc_key = None
+        # kaldi base path normalized as by the CLI (ignored when aligning)
+        inputs['kaldi'] = None
+        if params['kaldi'] is not None and not params['align']:
+            inputs['kaldi'] = util.check_path(params['kaldi'])
+        write_msg = asr_score.get_write_msg_list((inputs['ref'], inputs['hyp'], int(task[-1])))
+
+    if disc_key is not None:
+        if disc_key not in discovered:
+            discovered[disc_key] = util.find_files_to_score(*disc_key)
+        inputs['fileList'], inputs['fileDict'], total_missing = discovered[disc_key]
+        write_msg = util.get_files_to_score_msg(inputs['fileList'], total_missing, write_msg,
+                                                disc_key[2])
+    return inputs, write_msg
+
+
+
+def score_SAD(inputs, params, write_msg, out_path):
+    sadcollar = sad_score.proc_sad_collar(params['sadcollar'])
+    store = fs02store.open_store(params['incremental'])
+    dcfDict, write_msg = sad_score.score_folder_SAD(inputs['fileList'], inputs['fileDict'],
+                                                    sadcollar, write_msg, store=store)
+    overall_dcf, write_msg = sad_score.get_SAD_results(dcfDict, write_msg)
+    result = {'params':{'collar':float(sadcollar)},
+              'files':{fn:float(dcfDict[fn]) for fn in dcfDict},
+              'not_scored':[fn for fn in inputs['fileList'] if fn not in dcfDict],
+              'overall':{'dcf':float(overall_dcf)}}
+    return result, write_msg
+
+
+def score_SD(inputs, params, write_msg, out_path):
+    diarcollar = sd_score.proc_sd_collar(params['diarcollar'])
+    store = fs02store.open_store(params['incremental'])
+    derDict, write_msg = sd_score.score_folder_SD(inputs['fileList'], inputs['fileDict'],
+                                                  diarcollar, write_msg, out_path, store)
+    overall_der, write_msg = sd_score.get_SD_results(derDict, write_msg)
+    result = {'params':{'collar':float(diarcollar)},
+              'files':{fn:float(derDict[fn]) for fn in derDict},
+              'not_scored':[fn for fn in inputs['fileList'] if fn not in derDict],
+              'overall':{'der':float(overall_der)},
+              'log':util.get_logs_path()+util.get_bname(out_path)+'.log'}
+    return result, write_msg
+
+
+def score_SID(inputs, params, write_msg, out_path):
+    if params['sidstream']:
+        topNDict, write_msg = sid_score.score_SID_stream(inputs['ref'], inputs['hyp'],
+                                                         inputs['topN'], inputs['max_TopN'],
+                                                         write_msg, out_path)
+    else:
+        topNDict, write_msg = sid_score.score_SID(inputs['fileList'], inputs['fileDict'],
+                                                  inputs['topN'], write_msg, out_path)
+    if 5 in topNDict:
+        write_msg = sid_score.get_Top5_results(topNDict, write_msg)
+    result = {'params':{'topN':inputs['topN'], 'stream':params['sidstream']},
+              'overall':{'top'+str(n):topNDict[n] for n in topNDict}}
+    return result, write_msg
+
+
+def score_ASR(inputs, params, write_msg, out_path, track_num):
+    align_path = out_path if params['align'] else None
+    kaldi_path = inputs['kaldi']
+    gt_trans, hyp_trans, file_name, word_speakers = asr_score.load_ASR_trans(
+        inputs['ref'], inputs['hyp'], track_num, params['n_jobs'])
+    asr_file_termOut, report_msg = asr_score.get_ASR_termOut(gt_trans, hyp_trans, kaldi_path,
+                                                             params['mode'], file_name,
+                                                             word_speakers, align_path)
+    overall_wer, write_msg = asr_score.get_ASR_results(asr_file_termOut, report_msg,
+                                                       track_num, write_msg)
+    scores = fs02asr.parse_scores(asr_file_termOut)
+    if scores is None:
+        raise ValueError(asr_file_termOut.strip().split('\n')[-1].replace('ERROR: ',''))
+    result = {'params':{'mode':params['mode'],
+                        'engine':'python' if kaldi_path is None else 'kaldi'},
+              'overall':scores._asdict()}
+    if align_path is not None:
+        result['log'] = align_path+'.align.log'
+    return result, write_msg
+
+
+
+""" USAGE: result = fs02score.run_task(name, inputs, params, write_msg, out_path) """
+def run_task(name, inputs, params, write_msg, out_path):
+    # scores one task (name: task or 'task:i'), writing its text results (and
+    # terminal output) to <out_path>.<name>.txt in the logs path. Errors (and
+    # terminated wrapper functions) are returned as a 'failed' result.
+    task = name.split(':')[0]
+    task_out_path = util.get_logs_path()+util.get_bname(out_path)+'.'+name.replace(':','.')
+    result = {'status':'ok', 'ref':inputs['ref'], 'hyp':inputs['hyp']}
+    term_log = io.StringIO()
+    with redirect_stdout(term_log):
+        try:
+            if task == 'SAD':
+                task_result, write_msg = score_SAD(inputs, params, write_msg, task_out_path)
+            elif task.startswith('SD'):
+                task_result, write_msg = score_SD(inputs, params, write_msg, task_out_path)
+            elif task == 'SID':
+                task_result, write_msg = score_SID(inputs, params, write_msg, task_out_path)
+            else:
+                task_result, write_msg = score_ASR(inputs, params, write_msg, task_out_path,
+                                                   int(task[-1]))
+            result.update(task_result)
+        except (Exception, SystemExit) as e:
+            result.update(failed_result(e, term_log.getvalue()))
+    write_msg.append('\n\n'+term_log.getvalue())
+    util.writeList(write_msg, task_out_path+'.txt', isOverWrite=True, verbose=False)
+    result['report'] = task_out_path+'.txt'
+    return result
+
+
+def failed_result(err, term_out):
+    # error message of a raised exception, or the reason printed by a wrapper
+    # function before calling util.terminate_program()
+    if isinstance(err, util.ScoringError):
+        msg = str(err).strip()
+    elif isinstance(err, SystemExit):
+        lines = [x.strip() for x in term_out.split('\n') if x.strip() != '']
+        lines = [x for x in lines if not x.startswith('Terminating FS02')]
+        msg = lines[-1] if len(lines) > 0 else 'Scoring terminated'
+    else:
+        msg = type(err).__name__+': '+str(err)
+    return {'status':'failed', 'error':msg}
+
+
+def to_json_val(val):
+    # NaN and inf are not valid json, written as null
+    if isinstance(val, dict):
+        return {k:to_json_val(val[k]) for k in val}
+    if isinstance(val, (list, tuple)):
+        return [to_json_val(x) for x in val]
+    if isinstance(val, float) and not math.isfinite(val):
+        return None
+    return val
+
+
+
+""" USAGE: results = fs02score.score_tasks([('SAD', ref_path, hyp_path), ...]) """
+def score_tasks(task_list, out_path=None, params=None, n_jobs=None):
+    # scores all (task, ref_path, hyp_path) in task_list with n_jobs worker
+    # processes (default: one per task, up to the no. of CPUs), writes and
+    # returns the combined results {'created', 'out_path', 'tasks':{task:result}}.
+    # A task may be given more than once, results are then keyed 'task:i'.
+    if out_path is None:
+        out_path = util.get_results_path()+'FS02_Scores_'+util.getDateTimeStrStamp()+'.json'
+    params = dict(DEF_PARAMS, **(params or {}))
+    if n_jobs is None:
+        n_jobs = min(len(task_list), os.cpu_count() or 1)
+    task_names = [task for task, _, _ in task_list]
+    names = [task if task_names.count(task) == 1 else task+':'+str(i)
+             for i, task in enumerate(task_names)]
+
+    results = {}
+    args_list, args_names = [], []
+    discovered = {}
+    for name, (task, ref_path, hyp_path) in zip(names, task_list):
+        if task not in TASKS:
+            results[name] = {'status':'failed', 'error':'Unknown Task: '+task}
+            continue
+        term_log = io.StringIO()
+        with redirect_stdout(term_log):
+            try:
+                inputs, write_msg = prep_task(task, ref_path, hyp_path, params, discovered)
+            except Exception as e:
+                results[name] = dict({'ref':ref_path, 'hyp':hyp_path},
+                                     **failed_result(e, term_log.getvalue()))
+                continue
+        args_list.append((name, inputs, params, write_msg, out_path))
+        args_names.append(name)
+
+    fail_val = {'status':'failed', 'error':'Scoring worker process failed'}
+    for name, result in zip(args_names, util.run_jobs(run_task, args_list, n_jobs, fail_val)):
+        results[name] = result
+
+    scores = {'created':util.getDateTimeStrStamp(), 'out_path':out_path,
+              'tasks':{name:results[name] for name in names}}
+    scores = to_json_val(scores)
+    with open(out_path, 'w') as file:
+        json.dump(scores, file, indent=2)
+    return scores
+
+
+
+def print_summary(scores):
+    strz = '\t'+'*'*60
+    print('\n\n'+strz)
+    print('\tOVERALL Results for FS02 Tasks:')
+    for name in scores['tasks']:
+        result = scores['tasks'][name]
+        if result['status'] != 'ok':
+            print('\t'+name+'\t: FAILED ('+result['error'].replace('\n',' ')+')')
+            continue
+        overall = result['overall']
+        if 'dcf' in overall:
+            res_str = 'DCF '+str(overall['dcf'])
+        elif 'der' in overall:
+            res_str = 'DER '+str(overall['der'])+' %'
+        elif 'wer' in overall:
+            res_str = 'WER '+fs02asr.format_rate(overall['wer'])+' %'
+        else:
+            n = 5 if 'top5' in overall else result['params']['topN']
+            res_str = 'Top-'+str(n)+' Accuracy '+str(overall['top'+str(n)])+' %'
+        print('\t'+name+'\t: '+res_str)
+    print(strz)
+    print('\tResults written to path:\n\t\t'+scores['out_path'])
+    print('\tPer Task results and logs written to path:\n\t\t'+util.get_logs_path()+'\n\n')
+
+
+
+if __name__ == '__main__':
+
+    # Input Arguments
+    task_list, out_path, params, n_jobs = parse_arguments()
+
+    # Score Tasks and Write Results
+    scores = score_tasks(task_list, out_path, params, n_jobs)
+    del task_list, out_path, params, n_jobs
+
+    # Print Overall Results
+    print_summary(scores)
+    del scores
+# EOF
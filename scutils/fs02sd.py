@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    DER scoring of the FS02 SD Tasks (library functions of scoreFS02SD.py)
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Open-Source Software Credits:
+# DSCORE        - DIARIZATION  -  DER   - (https://github.com/nryant/dscore)
+###############################################################################
+
+Files are scored with dscore, in the same way as dscore/score.py with the
+--ignore_overlaps, --collar and -u (one UEM file per RTTM file) arguments.
+The ref directory has an RTTM/ and a UEM/ directory with one file per
+recording, the hyp directory one RTTM file per recording.
+
+Nothing is printed here (other than the warnings logged by dscore), invalid
+inputs raise util.ScoringError.
+"""
+
+
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+import fs02archive
+import fs02cache
+import fs02prof as prof
+import fs02store
+import fs02utils as util
+
+sys.path.append(util.get_dscore_path())
+from scorelib.rttm import load_rttm, validate_rttm
+from scorelib.score import Scores, score
+from scorelib.turn import TurnSet, merge_turns, trim_turns
+from scorelib.uem import UEM, load_uem
+from scorelib.utils import info
+from score import check_for_empty_files
+
+
+# files (names of the scored files) and their DER (%) array, not_scored
+# (names of files which could not be scored) and errors ({fn:error message}
+# of the not_scored files with invalid RTTM or UEM files)
+SDResults = namedtuple('SDResults', ['collar', 'files', 'der', 'not_scored', 'errors'])
+
+# version of the reference RTTM, UEM and RTTM validation data stored in the
+# reference cache
+REF_CACHE_VERSION = 1
+
+# version of the dscore Scores stored in the result store (see fs02store)
+RESULT_VERSION = 1
+
+
+def check_ref_files(ref_path):
+    # ref path with matching RTTM/ and UEM/ directories
+    rttm_path = ref_path+'RTTM/'
+    uem_path = ref_path+'UEM/'
+    if not util.check_isDir(rttm_path):
+        raise util.ScoringError('Ground Truth RTTM Folder does not exist in ref path.')
+    if not util.check_isDir(uem_path):
+        raise util.ScoringError('Ground Truth UEM Folder does not exist in ref path.')
+    
+    rttm_list = util.get_from_dir(rttm_path)
+    uem_list = util.get_from_dir(uem_path)
+    
+    if len(rttm_list) < 1:
+        raise util.ScoringError('\nNo RTTM files found in ref path. Cannot provide score.')
+    if len(uem_list) < 1:
+        raise util.ScoringError('\nNo UEM files found in ref path. Cannot provide score.')
+    
+    rttm_dict = {util.getfName(x):x for x in rttm_list}
+    uem_dict = {util.getfName(x):x for x in uem_list}
+    missing_from_uem = list(set(rttm_dict.keys()) - set(uem_dict.keys()))
+    missing_from_rttm = list(set(uem_dict.keys()) - set(rttm_dict.keys()))
+    
+    if len(missing_from_uem+missing_from_rttm) > 0:
+        raise util.ScoringError('Uncommon Files found between Ground Truth RTTM and UEM folders.\n'+
+            'Missing Files:'+''.join(['\n'+fn+'.uem' for fn in missing_from_uem])+
+            ''.join(['\n'+fn+'.rttm' for fn in missing_from_rttm]))
+    return ref_path
+
+
+def get_uem_path(ref_rttm):
+    return ref_rttm.replace('/RTTM/','/UEM/').replace('.rttm','.uem')
+
+
+def check_rttm_path(rttm_fp):
+    if not fs02archive.exists(rttm_fp):
+        raise IOError('Unable to open RTTM file: %s' % rttm_fp)
+
+
+def load_turns(rttm_fp):
+    # same errors as dscore/score.py load_rttms (which exits instead)
+    check_rttm_path(rttm_fp)
+    try:
+        with fs02archive.open_file(rttm_fp, 'rb') as file:
+            turns, _, _ = load_rttm(file, as_turnset=True)
+    except IOError as e:
+        raise IOError('Invalid RTTM file: %s. %s' % (rttm_fp, e))
+    return turns
+
+
+def turns_to_arrays(turns):
+    return {'onsets':turns.onsets, 'offsets':turns.offsets, 'durs':turns.durs,
+            'speaker_inds':turns.speaker_inds, 'file_inds':turns.file_inds,
+            'speaker_ids':fs02cache.str_array(turns.speaker_ids),
+            'file_ids':fs02cache.str_array(turns.file_ids)}
+
+
+def turns_from_arrays(arrays):
+    return TurnSet(arrays['onsets'], arrays['offsets'], arrays['durs'], arrays['speaker_inds'],
+                   arrays['file_inds'], fs02cache.str_list(arrays['speaker_ids']),
+                   fs02cache.str_list(arrays['file_ids']))
+
+
+def load_ref_turns(rttm_fp):
+    # load_turns of a reference RTTM file, from the reference cache
+    check_rttm_path(rttm_fp)
+    return fs02cache.load_cached(rttm_fp, 'sd_rttm', REF_CACHE_VERSION, load_turns,
+                                 turns_to_arrays, turns_from_arrays)
+
+
+def uem_to_arrays(uem):
+    regions = [(fid, onset, offset) for fid in uem for onset, offset in uem[fid]]
+    return {'file_ids':fs02cache.str_array([x[0] for x in regions]),
+            'onsets':np.array([x[1] for x in regions], dtype=np.float64),
+            'offsets':np.array([x[2] for x in regions], dtype=np.float64)}
+
+
+def uem_from_arrays(arrays):
+    fid_to_score_regions = {}
+    for fid, onset, offset in zip(fs02cache.str_list(arrays['file_ids']),
+                                  arrays['onsets'].tolist(),
+                                  arrays['offsets'].tolist()):
+        fid_to_score_regions.setdefault(fid, []).append((onset, offset))
+    return UEM(fid_to_score_regions.items())
+
+
+def load_ref_uem(uem_fp):
+    # load_uem of a reference UEM file, from the reference cache
+    return fs02cache.load_cached(uem_fp, 'sd_uem', REF_CACHE_VERSION, load_uem,
+                                 uem_to_arrays, uem_from_arrays)
+
+
+def validation_to_arrays(validation):
+    file_ids, speaker_ids, error_messages = validation
+    return {'file_ids':fs02cache.str_array(sorted(file_ids)),
+            'speaker_ids':fs02cache.str_array(sorted(speaker_ids)),
+            'error_messages':fs02cache.str_array(error_messages)}
+
+
+def validation_from_arrays(arrays):
+    return (set(fs02cache.str_list(arrays['file_ids'])),
+            set(fs02cache.str_list(arrays['speaker_ids'])),
+            fs02cache.str_list(arrays['error_messages']))
+
+
+def validate_hyp_rttm(rttm_fp):
+    # dscore validate_rttm of a system output RTTM file (or archive member)
+    with fs02archive.open_file(rttm_fp, 'rb') as file:
+        return validate_rttm(file)
+
+
+def validate_ref_rttm(rttm_fp):
+    # dscore validate_rttm of a reference RTTM file, from the reference cache
+    return fs02cache.load_cached(rttm_fp, 'sd_rttm_validation', REF_CACHE_VERSION,
+                                 validate_rttm, validation_to_arrays, validation_from_arrays)
+
+
+def get_result_key(store, ref_rttm, hyp_rttm, collar):
+    # result store key of the scores of a file
+    return store.get_key('SD', RESULT_VERSION, [ref_rttm, get_uem_path(ref_rttm), hyp_rttm],
+                         {'collar':float(collar)})
+
+
+""" USAGE: stored_scores, keys = fs02sd.get_stored_scores(fileList, fileDict, 0.25, store) """
+def get_stored_scores(fileList, fileDict, collar, store):
+    # ({fn:global_scores} of the stored files, {fn:key})
+    keys = {fn:get_result_key(store, fileDict['ref'][fn], fileDict['hyp'][fn], collar)
+            for fn in fileList}
+    stored = store.get_stats(list(keys.values()))
+    return {fn:Scores(**stored[keys[fn]]) for fn in fileList if keys[fn] in stored}, keys
+
+
+def log_step(msg, verbose):
+    if verbose:
+        info(msg, file=sys.stderr)
+
+
+def load_file_SD(ref_rttm, hyp_rttm, ref_uem, verbose=False):
+    # (ref_turns, sys_turns, uem) of a file, see score_file_SD
+    log_step('Loading speaker turns from reference RTTMs...', verbose)
+    ref_turns = load_ref_turns(ref_rttm)
+    log_step('Loading speaker turns from system RTTMs...', verbose)
+    sys_turns = load_turns(hyp_rttm)
+    log_step('Loading universal evaluation map...', verbose)
+    uem = load_ref_uem(ref_uem)
+    return ref_turns, sys_turns, uem
+
+
+def score_turns_SD(ref_turns, sys_turns, uem, collar=0.25, verbose=False):
+    # dscore (file_scores, global_scores) of loaded turns, see score_file_SD
+    log_step('Trimming reference speaker turns to UEM scoring regions...', verbose)
+    ref_turns = trim_turns(ref_turns, uem)
+    log_step('Trimming system speaker turns to UEM scoring regions...', verbose)
+    sys_turns = trim_turns(sys_turns, uem)
+    log_step('Checking for overlapping reference speaker turns...', verbose)
+    ref_turns = merge_turns(ref_turns)
+    log_step('Checking for overlapping system speaker turns...', verbose)
+    sys_turns = merge_turns(sys_turns)
+    log_step('Scoring...', verbose)
+    check_for_empty_files(ref_turns, sys_turns, uem)
+    return score(ref_turns, sys_turns, uem, collar=float(collar), ignore_overlaps=True)
+
+
+""" USAGE: file_scores, global_scores = fs02sd.score_file_SD(ref_rttm, hyp_rttm, ref_uem, 0.25) """
+def score_file_SD(ref_rttm, hyp_rttm, ref_uem, collar=0.25, verbose=False):
+    """Score a SD system output RTTM file with dscore. Returns the dscore
+    (file_scores, global_scores). If verbose, the steps of dscore/score.py
+    are logged to stderr."""
+    with prof.stage('parsing'):
+        ref_turns, sys_turns, uem = load_file_SD(ref_rttm, hyp_rttm, ref_uem, verbose)
+    with prof.stage('scoring'):
+        return score_turns_SD(ref_turns, sys_turns, uem, collar, verbose)
+
+
+""" USAGE: results = fs02sd.score_files_SD(fileList, fileDict, 0.25, store) """
+def score_files_SD(fileList, fileDict, collar=0.25, store=None):
+    # (ref RTTM, hyp RTTM) file pairs of util.find_files_to_score, with a
+    # fs02store.ResultStore only files without stored scores are scored.
+    # Files with invalid (or missing) RTTM and UEM files are not scored,
+    # other errors are raised.
+    global_scores, keys, errors = {}, {}, {}
+    if store is not None:
+        global_scores, keys = get_stored_scores(fileList, fileDict, collar, store)
+    to_score = fs02archive.sort_by_archive([fn for fn in fileList if fn not in global_scores],
+                                           fileDict['hyp'])
+    entries = []
+    for fn in to_score:
+        ref_rttm = fileDict['ref'][fn]
+        try:
+            _, global_scores[fn] = score_file_SD(ref_rttm, fileDict['hyp'][fn],
+                                                 get_uem_path(ref_rttm), collar)
+        except (IOError, ValueError) as e:
+            errors[fn] = str(e)
+            continue
+        if store is not None:
+            entries.append((keys[fn], 'SD', fn, fs02store.to_stats(global_scores[fn])))
+    if store is not None:
+        store.put_stats(entries)
+    files = [fn for fn in fileList if fn in global_scores]
+    not_scored = [fn for fn in fileList if fn not in global_scores]
+    ders = [global_scores[fn].der for fn in files]
+    return SDResults(float(collar), files, np.array(ders, dtype=np.float64), not_scored, errors)
+
+
+""" USAGE: results = fs02sd.score_SD(ref_path, hyp_path, 0.25) """
+def score_SD(ref_path, hyp_path, collar=0.25, store=None):
+    """Score a SD system output directory against the ground truth directory.
+    Returns SDResults. Raises util.ScoringError for invalid inputs (files
+    which could not be scored are listed in not_scored, with their error in
+    errors)."""
+    ref_path = check_ref_files(util.check_path(ref_path))
+    hyp_path = util.check_path(hyp_path)
+    fileList, fileDict, _ = util.find_files_to_score(ref_path+'RTTM/', hyp_path)
+    return score_files_SD(fileList, fileDict, collar, store)
+
+
+def get_overall(results):
+    # mean of the per file DERs (as printed by dscore), rounded like the
+    # OVERALL result of scoreFS02SD.py
+    if len(results.der) < 1:
+        raise util.ScoringError('No files could be scored.')
+    return round(sum([float('%.2f' % x) for x in results.der])/len(results.der),5)
+# EOF
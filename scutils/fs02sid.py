@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Top-N accuracy scoring of the FS02 SID Task (library functions of
+#    scoreFS02SID.py)
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+Ref files have one "uttID ... spkID" line per utterance (the true speaker is
+the last field), Hyp files one "uttID spkID_1 ... spkID_N" line with the N
+system predictions in order. A file is correct for Top-n if its true speaker
+is one of the first n predictions, i.e. if the rank of the true speaker
+(1 = first prediction, 0 = not predicted) is in 1..n.
+
+Nothing is printed here, invalid inputs raise util.ScoringError.
+"""
+
+
+from collections import namedtuple
+
+import numpy as np
+
+import fs02utils as util
+
+
+# accuracy: {n: Top-n accuracy (%)} for n in 1..topN
+# rank_counts: no. of files per true speaker rank (0: not predicted)
+# files, ranks: scored uttIDs and their true speaker ranks (None if streamed)
+SIDResults = namedtuple('SIDResults', ['accuracy', 'rank_counts', 'n_missing',
+                        'files', 'ranks'])
+
+
+def get_max_topN(hyp_path):
+    # no. of system predictions per line, which has to be the same for all lines
+    hyp_list = util.readList(hyp_path)
+    n_fields = set([len(x.split()) for x in hyp_list])
+    if len(n_fields) != 1:
+        raise util.ScoringError('System Output File not consistent.\n'+
+            'All sample results should contain the same no. of speaker predictions.')
+    return n_fields.pop() - 1
+
+
+def get_max_topN_stream(hyp_path):
+    # no. of system predictions from the first line, the other lines are
+    # checked while scoring
+    for fn, fields in iter_SID_lines(hyp_path):
+        return len(fields) - 1
+    raise util.ScoringError('\nNo System Output files found in hyp path. Cannot provide score.')
+
+
+def check_topN(topN, max_topN):
+    if topN < 1:
+        raise util.ScoringError('Top-N parameter has to be greater than 0.')
+    if topN > max_topN:
+        raise util.ScoringError('Top-N parameter cannot be greater than no. of '+
+                                'system predictions ('+str(max_topN)+').')
+    return topN
+
+
+def iter_SID_lines(file_path):
+    # (uttID, all fields) of each line of a SID file sorted by uttID
+    prev_fn = None
+    with open(file_path,'r') as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) == 0:
+                continue
+            if prev_fn is not None and fields[0] <= prev_fn:
+                raise util.ScoringError('File not sorted by utterance ID (or duplicate ID): '+
+                    file_path+'\nUtterance ID '+fields[0]+' found after '+prev_fn)
+            prev_fn = fields[0]
+            yield fields[0], fields
+
+
+""" USAGE: for uttID, rank in fs02sid.iter_ranks(ref_path, hyp_path, max_topN): """
+def iter_ranks(ref_path, hyp_path, max_topN):
+    # merge-join of Ref and Hyp files sorted by uttID, yielding the true
+    # speaker rank of each common uttID, and None as rank of the uttIDs
+    # found in only one of the files
+    ref_iter, hyp_iter = iter_SID_lines(ref_path), iter_SID_lines(hyp_path)
+    ref, hyp = next(ref_iter, None), next(hyp_iter, None)
+    if ref is None:
+        raise util.ScoringError('\nNo Reference files found in ref path. Cannot provide score.')
+    while ref is not None or hyp is not None:
+        if hyp is None or (ref is not None and ref[0] < hyp[0]):
+            yield ref[0], None
+            ref = next(ref_iter, None)
+        elif ref is None or hyp[0] < ref[0]:
+            yield hyp[0], None
+            hyp = next(hyp_iter, None)
+        else:
+            hyp_str_list = hyp[1][1:]
+            if len(hyp_str_list) != max_topN:
+                raise util.ScoringError('System Output File not consistent.\n'+
+                    'All sample results should contain the same no. of speaker predictions.')
+            ref_str = ref[1][-1]
+            yield ref[0], hyp_str_list.index(ref_str)+1 if ref_str in hyp_str_list else 0
+            ref, hyp = next(ref_iter, None), next(hyp_iter, None)
+
+
+""" USAGE: rank_counts, n_missing = fs02sid.count_ranks(ref_path, hyp_path, max_topN) """
+def count_ranks(ref_path, hyp_path, max_topN, on_rank=None):
+    # no. of files per true speaker rank (0: not predicted) and no. of uttIDs
+    # found in only one of the files, from iter_ranks. on_rank(uttID, rank)
+    # is called for each of them (e.g. to log the per file ranks).
+    rank_counts = np.zeros(max_topN+1, dtype=np.int64)
+    n_missing = 0
+    for fn, rank in iter_ranks(ref_path, hyp_path, max_topN):
+        if rank is None:
+            n_missing += 1
+        else:
+            rank_counts[rank] += 1
+        if on_rank is not None:
+            on_rank(fn, rank)
+    return rank_counts, n_missing
+
+
+def get_true_ranks(fileList, fileDict):
+    # rank (1 = first prediction) of the true speaker in the system predictions
+    # of each file, 0 if the true speaker is not predicted
+    ranks = np.zeros(len(fileList), dtype=np.int64)
+    for i, fn in enumerate(fileList):
+        hyp_str_list = fileDict['hyp'][fn]
+        ref_str = fileDict['ref'][fn]
+        if ref_str in hyp_str_list:
+            ranks[i] = hyp_str_list.index(ref_str)+1
+    return ranks
+
+
+def get_topN_accuracy(rank_counts, topN):
+    # Top-n accuracies from the no. of files per true speaker rank
+    n_files = int(np.sum(rank_counts))
+    if n_files < 1:
+        raise util.ScoringError('\nNo common files between Ref and Hyp that can be scored.')
+    n_corr = np.cumsum(rank_counts[1:topN+1]).tolist()
+    return {n:round((100.0*n_corr[n-1])/n_files,3) for n in range(1,topN+1)}
+
+
+""" USAGE: results = fs02sid.score_files_SID(fileList, fileDict, topN) """
+def score_files_SID(fileList, fileDict, topN=5, n_missing=0):
+    ranks = get_true_ranks(fileList, fileDict)
+    rank_counts = np.bincount(ranks, minlength=topN+1)
+    return SIDResults(get_topN_accuracy(rank_counts, topN), rank_counts, n_missing,
+                      list(fileList), ranks)
+
+
+""" USAGE: results = fs02sid.score_SID(ref_path, hyp_path, topN=5) """
+def score_SID(ref_path, hyp_path, topN=5):
+    """Top-N accuracies of a SID system output file. Raises util.ScoringError
+    for invalid inputs."""
+    ref_path = util.check_path(ref_path, inpType='file', checkExists=True)
+    hyp_path = util.check_path(hyp_path, inpType='file', checkExists=True)
+    topN = check_topN(topN, get_max_topN(hyp_path))
+    fileList, fileDict, total_missing = util.find_files_to_score(ref_path, hyp_path,
+                                                                 isFolder=False, task='SID')
+    return score_files_SID(fileList, fileDict, topN, len(total_missing))
+
+
+""" USAGE: results = fs02sid.score_SID_stream(ref_path, hyp_path, topN=5) """
+def score_SID_stream(ref_path, hyp_path, topN=5):
+    """score_SID for very large trial lists, in constant memory. Both files
+    must be sorted by uttID. Per file ranks are not kept (see count_ranks)."""
+    ref_path = util.check_path(ref_path, inpType='file', checkExists=True)
+    hyp_path = util.check_path(hyp_path, inpType='file', checkExists=True)
+    max_topN = get_max_topN_stream(hyp_path)
+    topN = check_topN(topN, max_topN)
+    rank_counts, n_missing = count_ranks(ref_path, hyp_path, max_topN)
+    return SIDResults(get_topN_accuracy(rank_counts, topN), rank_counts, n_missing,
+                      None, None)
+# EOF
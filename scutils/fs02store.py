@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 2026
+
+@author: Aditya Joglekar
+
+###############################################################################
+# Revision history
+# v1.0 (October 17, 2026)
+#    - Aditya Joglekar
+#    Per file result store for incremental re-scoring
+#
+###############################################################################
+# This software was developed at the University of Texas at Dallas, Center for
+# Robust Speech Systems (UTD-CRSS). It serves as a wrapper around multiple
+# third-party open-source code listed below. This software is licensed under
+# a Creative Commons Attribution-ShareAlike 4.0 International License.
+#
+# UTD-CRSS assumes no responsibility whatsoever for its use by any party, and
+# makes no guarantees, expressed or implied, about its quality, reliability,
+# or any other characteristic. We would appreciate acknowledgement if the
+# software is used. This software can be redistributed and/or modified freely
+# provided that any derivative works bear some notice that they are derived
+# from it, and any modified versions bear some notice that they
+# have been modified.
+#
+# THIS SOFTWARE IS PROVIDED "AS IS."  With regard to this software,
+# UTD-CRSS MAKES NO EXPRESS OR IMPLIED WARRANTY AS TO ANY MATTER WHATSOEVER,
+# INCLUDING MERCHANTABILITY, OR FITNESS FOR A PARTICULAR PURPOSE.
+###############################################################################
+
+When a system output is scored again with only a few changed files, the
+scores of the unchanged files are taken from a SQLite database in results/
+(see get_store_path). An entry holds the per file statistics of one scored
+(ref, hyp) file pair (e.g. the speech, miss and false alarm times of a SAD
+file), keyed by the SHA-1 hash of:
+    [task, result version, scoring parameters, SHA-1 of each input file]
+so that a file is scored again if any of its input files or the scoring
+parameters changed. The result version of a task is increased when the
+scores of a file change. Overall scores are computed from the per file
+statistics, as for files which are scored.
+
+Only the scores of files which could be scored are stored. The database can
+be deleted at any time, and a database which cannot be opened (or written)
+only disables the store.
+"""
+
+
+import hashlib, json, sqlite3
+
+import fs02cache
+import fs02utils as util
+
+
+STORE_NAME = 'fs02_results.sqlite'
+
+# SQLite limit on the number of parameters of a query (older versions)
+MAX_QUERY_KEYS = 500
+
+
+def get_store_path():
+    return util.get_results_path()+STORE_NAME
+
+
+class ResultStore:
+    """Per file statistics stored in the SQLite database at db_path."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path if db_path is not None else get_store_path()
+        self.file_hashes = {}
+        try:
+            self.conn = sqlite3.connect(self.db_path, timeout=60)
+            self.conn.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, '+
+                              'task TEXT, file_name TEXT, stats TEXT, created TEXT)')
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print('Result store could not be opened ('+str(e)+'). All files will be scored.')
+            self.conn = None
+
+    def get_file_hash(self, file_path):
+        # ref files are shared by the keys of a file (e.g. one key per collar)
+        if file_path not in self.file_hashes:
+            self.file_hashes[file_path] = fs02cache.get_file_hash(file_path)
+        return self.file_hashes[file_path]
+
+    def get_key(self, task, version, file_paths, params):
+        # key of the scores of the input files (None if a file cannot be read)
+        try:
+            file_hashes = [self.get_file_hash(fp) for fp in file_paths]
+        except OSError:
+            return None
+        key = json.dumps([task, version, params, file_hashes], sort_keys=True)
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get_stats(self, keys):
+        # {key:stats} of the stored keys
+        keys = [key for key in keys if key is not None]
+        stored = {}
+        if self.conn is None:
+            return stored
+        try:
+            for i in range(0, len(keys), MAX_QUERY_KEYS):
+                chunk = keys[i:i+MAX_QUERY_KEYS]
+                query = 'SELECT key, stats FROM results WHERE key IN ('+\
+                    ','.join(['?']*len(chunk))+')'
+                for key, stats in self.conn.execute(query, chunk):
+                    stored[key] = json.loads(stats)
+        except sqlite3.Error:
+            return {}
+        return stored
+
+    def put_stats(self, entries):
+        # stores the (key, task, file_name, stats) entries in one transaction
+        entries = [(key, task, fn, json.dumps(stats), util.getDateTimeStrStamp())
+                   for key, task, fn, stats in entries if key is not None]
+        if self.conn is None or len(entries) < 1:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany('INSERT OR REPLACE INTO results VALUES (?,?,?,?,?)',
+                                      entries)
+        except sqlite3.Error as e:
+            print('Scores could not be written to the result store ('+str(e)+').')
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+""" USAGE: store = fs02store.open_store(incremental) """
+def open_store(incremental, db_path=None):
+    # ResultStore if incremental scoring is asked for, else None
+    return ResultStore(db_path) if incremental else None
+
+
+def to_stats(scores):
+    # json values of a namedtuple of scores (numpy floats as python floats)
+    return {name:(float(val) if not isinstance(val, str) else val)
+            for name, val in scores._asdict().items()}
+# EOF
@@ -40,9 +40,13 @@ Created on Sun Apr 5 2020
 """
 
 
-import os, glob, sys, json, re
+import fs02archive
+import fs02cache
+import fs02prof as prof
+import os, glob, sys, json, string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from string import ascii_letters
 from subprocess import Popen, PIPE, STDOUT
 
 
@@ -57,32 +61,53 @@ def get_fs02sctk_path():
     return sctk_path
 
 
+def get_dscore_path():
+    return get_fs02sctk_path()+'scutils/dscore/'
+
+
 def get_temp_path():
     temp_path = get_fs02sctk_path()+'egs/.temp/'
     if not os.path.isdir(temp_path):
-        os.mkdir(temp_path)
+        os.makedirs(temp_path, exist_ok=True)
     return temp_path
 
 
 def get_results_path():
     results_path = get_fs02sctk_path()+'results/'
     if not os.path.isdir(results_path):
-        os.mkdir(results_path)
+        os.makedirs(results_path, exist_ok=True)
     return results_path
 
 
 def get_logs_path():
     logs_path = get_fs02sctk_path()+'logs/'
     if not os.path.isdir(logs_path):
-        os.mkdir(logs_path)
+        os.makedirs(logs_path, exist_ok=True)
     return logs_path
 
 
+class ScoringError(ValueError):
+    # invalid scoring inputs, raised by the library functions (of all tasks)
+    # in place of printing the reason and calling terminate_program()
+    pass
+
+
 def terminate_program():
     print('Terminating FS02 score-file without scoring execution\n')
     sys.exit()
 
 
+""" USAGE: result = util.call_or_terminate(func, *args) """
+def call_or_terminate(func, *args, **kwargs):
+    # func(*args, **kwargs) for the score-files (CLI), printing the reason of
+    # a ScoringError and terminating the program
+    try:
+        return func(*args, **kwargs)
+    except ScoringError as e:
+        print(str(e))
+        terminate_program()
+
+
 def remove_file(file_path):
     if os.path.exists(file_path):
         os.remove(file_path)
@@ -97,7 +122,19 @@ def check_isDir(inp_path):
 
 
 def get_from_dir(inp_path):
-    filepath_list = glob.glob(inp_path+'*')
+    # files of an archive (see fs02archive) are listed at any depth, and
+    # must have distinct names
+    archive_path = fs02archive.split_archive_path(inp_path)
+    if archive_path is None:
+        filepath_list = glob.glob(inp_path+'*')
+        return filepath_list
+    filepath_list = fs02archive.list_members(*archive_path)
+    fname_counts = Counter([getfName(x) for x in filepath_list])
+    duplicates = sorted([x for x in fname_counts if x != '' and fname_counts[x] > 1])
+    if len(duplicates) > 0:
+        raise ScoringError('Files with the same name found in archive path: '+inp_path+'\n'+
+            ' '.join(duplicates)+'\nPlease provide the archive folder to score '+
+            '(e.g. '+archive_path[0]+'/<folder>/Dev/).')
     return filepath_list
     
 
@@ -109,11 +146,54 @@ def getDateTimeStrStamp():
 
 # term_cmd should be a list
 def get_term_output(term_cmd):
-    p = Popen(term_cmd, stdout=PIPE, stdin=PIPE, stderr=STDOUT)
-    termOut = p.stdout.read().decode()
+    with prof.timed_command(term_cmd):
+        p = Popen(term_cmd, stdout=PIPE, stdin=PIPE, stderr=STDOUT)
+        termOut = p.stdout.read().decode()
+        p.wait()
     return termOut
 
 
+""" USAGE: results = util.run_jobs(func, args_list, n_jobs, fail_val) """
+def run_jobs(func, args_list, n_jobs=1, fail_val=None):
+    # func(*args) for all args in args_list, using n_jobs worker processes.
+    # Results are returned in the same order as args_list (for any n_jobs),
+    # calls raising an exception return fail_val without stopping the others.
+    # Each call is timed as a file of the current fs02prof stage (if enabled).
+    results = []
+    if n_jobs <= 1 or len(args_list) <= 1:
+        for i, args in enumerate(args_list):
+            try:
+                with prof.timed_file(prof.get_job_label(args, i)):
+                    results.append(func(*args))
+            except Exception:
+                results.append(fail_val)
+        return results
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [executor.submit(*prof.get_job(func, args, i))
+                   for i, args in enumerate(args_list)]
+        for future in futures:
+            try:
+                results.append(prof.get_job_result(future.result()))
+            except Exception:
+                results.append(fail_val)
+    return results
+
+
+def proc_n_jobs(n_jobs):
+    if n_jobs < 1:
+        print('Number of jobs has to be greater than 0. Using all available CPUs.')
+        n_jobs = os.cpu_count() or 1
+    return n_jobs
+
+
+def proc_prof_args(profile, timings_path):
+    # --profile and --timings-json options of the score-files
+    if timings_path is not None:
+        timings_path = processInpPath(timings_path, inpType='file')
+    if profile or timings_path is not None:
+        prof.enable(profile, timings_path)
+
+
 def is_number(num_str):
     try:
         float(num_str)
@@ -151,121 +231,213 @@ def readList(readPath):
     return readList
 
 
+# clean_ASR_line translation table, built once:
+# - "'" deleted (to allow words like let's, we're, etc; scoring words like
+#   "we're" will be held off for the third phase of the challenge)
+# - punctuation replaced by spaces
+# - only words made of english letters (after upper) are kept
+ASR_TRANS_TABLE = str.maketrans(',.;:@#?!&$-', ' '*11, "'")
+ASR_LINE_SEP = '\x00'
+
+
+def clean_ASR_text(text):
+    # deletions, [unk] removal and upper case of (one or more) lines
+    text = text.translate(ASR_TRANS_TABLE).replace('[unk]','').upper()
+    return text.replace('[UNK]','')
+
+
+def join_ASR_words(text):
+    # english words of a cleaned line (ascii and alpha: english letters only)
+    return ' '.join([e for e in text.split() if e.isalpha() and e.isascii()])
+
+
+if not hasattr(str, 'isascii'):
+    # str.isascii needs Python >= 3.7 (same words, a bit slower)
+    def join_ASR_words(text):
+        return ' '.join([e for e in text.split() if not e.strip(string.ascii_letters)])
+
+
 """clean transcript lines for ASR track 1 and 2"""
 def clean_ASR_line(line):
-    # to allow words like let's, we're, etc
-    english_chars = set(ascii_letters + "'")
-    # scoring words like "we're" will be held off for the third phase of the challenge
-    words = line.replace("'","")
-    words = words.replace('[unk]','').upper()
-    words = words.replace('[UNK]','')
-    words = re.sub(r'[,.;:@#?!&$-]+', ' ', words)
-    words = ' '.join(e for e in words.split() if english_chars.issuperset(e))
-    words = re.sub(' +', ' ',words)
-    return words
+    return join_ASR_words(clean_ASR_text(line))
+
+
+""" USAGE: clean_lines = util.clean_ASR_lines(lines) """
+def clean_ASR_lines(lines):
+    # clean_ASR_line of all lines, cleaned together in a single text
+    text = ASR_LINE_SEP.join(lines)
+    if len(lines) == 0 or text.count(ASR_LINE_SEP) != len(lines)-1:
+        return [clean_ASR_line(x) for x in lines]
+    return [join_ASR_words(x) for x in clean_ASR_text(text).split(ASR_LINE_SEP)]
 
 
 """for ASR_track2 clean-up processing"""
-def get_ASR_track2_clean(file_path, setType):
-    write_path = get_temp_path()+'ASR_track1_'+setType+'_'+getDateTimeStrStamp()
-    
+def get_ASR_track2_trans(file_path):
+    # sorted list of (file-name, cleaned words) tuples, in memory
     track2_data = readList(file_path)
     track2_dict = {x.split()[0].strip():' '.join(x.split()[1:]) for x in track2_data}
-    write_list = []
-    
-    for fn in track2_dict:
-        words = clean_ASR_line(track2_dict[fn])
-        write_list.append(fn+' '+words)
-    
-    write_list.sort()
-    writeList(write_list, write_path, isOverWrite=True, verbose=False)
-    return write_path
+    clean_lines = clean_ASR_lines(list(track2_dict.values()))
+    return sorted((fn, x.split()) for fn, x in zip(track2_dict, clean_lines))
+
+
+"""for ASR_track2 clean-up processing"""
+def get_ASR_track2_clean(file_path, setType):
+    return write_trans_temp(get_ASR_track2_trans(file_path), setType)
 
 
 """for ASR_track1 clean-up processing"""
-def get_json_txtstr(file_path):
-    
-    content = []
-    with open(file_path,'r') as file:  
+def get_json_words(file_path):
+    # cleaned words of all utterances of a json file, and their speakerIDs
+    words, speakers = [], []
+    with fs02archive.open_file(file_path,'r') as file:
         data = json.load(file)
         if not type(data)==list:
             data = [data]
-        for utt in data:
-            words = clean_ASR_line(utt['words'])
-            content.append(words)
-    content = ' '.join(content)
-    content = re.sub(' +', ' ',content)
-    content = content.strip()
-    return content
+        clean_lines = clean_ASR_lines([utt['words'] for utt in data])
+        for utt, line in zip(data, clean_lines):
+            utt_words = line.split()
+            words.extend(utt_words)
+            # hyp segments need not carry a speakerID
+            speakers.extend([str(utt.get('speakerID'))]*len(utt_words))
+    return words, speakers
+
+
+def json_words_to_arrays(json_words):
+    return {'words':fs02cache.str_array(json_words[0]),
+            'speakers':fs02cache.str_array(json_words[1])}
+
+
+def json_words_from_arrays(arrays):
+    return fs02cache.str_list(arrays['words']), fs02cache.str_list(arrays['speakers'])
 
 
 """for ASR_track1 clean-up processing"""
-def json_dir_to_txt(dir_path, setType):
-    json_fp_list = get_from_dir(dir_path)
-    write_path = get_temp_path()+'ASR_track1_'+setType+'_'+getDateTimeStrStamp()
-    write_list = []
+def load_json_words(file_path):
+    # get_json_words of a ground truth json file, from the reference cache
+    return fs02cache.load_cached(file_path, 'asr_json', REF_CACHE_VERSION, get_json_words,
+                                 json_words_to_arrays, json_words_from_arrays)
+
+
+"""for ASR_track1 clean-up processing"""
+def get_json_txtstr(file_path):
+    return ' '.join(get_json_words(file_path)[0])
+
+
+""" USAGE: trans, word_speakers = util.json_dir_to_trans(dir_path, n_jobs, use_cache) """
+def json_dir_to_trans(dir_path, n_jobs=1, use_cache=False):
+    # sorted list of (file-name, cleaned words) tuples and dict of
+    # file-name: speakerID of each word, json files are read by n_jobs
+    # worker processes (from the reference cache if use_cache).
+    json_fp_list = sorted(get_from_dir(dir_path), key=getfName)
+    if fs02archive.split_archive_path(dir_path) is not None:
+        # only the json files of an archive (e.g. not the system description)
+        json_fp_list = [fp for fp in json_fp_list if fp.lower().endswith('.json')]
+    read_func = load_json_words if use_cache else get_json_words
+    read_list = sorted(json_fp_list, key=fs02archive.archive_index)
+    words_dict = dict(zip(read_list, run_jobs(read_func, [(fp,) for fp in read_list], n_jobs)))
+    trans, word_speakers = [], {}
     for fp in json_fp_list:
-        fname = getfName(fp)
-        str_transcript = get_json_txtstr(fp)
-        write_list.append(fname+' '+str_transcript)
-    write_list.sort()
+        words = words_dict[fp]
+        if words is None:
+            # failed in a worker, read again here to raise the same error
+            words = get_json_words(fp)
+        trans.append((getfName(fp), words[0]))
+        word_speakers[getfName(fp)] = words[1]
+    return trans, word_speakers
+
+
+"""for ASR_track1 clean-up processing"""
+def json_dir_to_txt(dir_path, setType, n_jobs=1):
+    # ground truth (setType 'ref') files are read from the reference cache
+    return write_trans_temp(json_dir_to_trans(dir_path, n_jobs, setType == 'ref')[0], setType)
+
+
+def write_trans_temp(trans, setType):
+    # kaldi "text" temp file of (file-name, words) tuples, for compute-wer
+    write_path = get_temp_path()+'ASR_track1_'+setType+'_'+getDateTimeStrStamp()
+    write_list = [fn+' '+' '.join(words) for fn, words in trans]
     writeList(write_list, write_path, isOverWrite=True, verbose=False)
     return write_path
 
 
 
-def processInpPath(inp_path, inpType='dir', checkExists=False):
-    if inp_path is not None:
-        inp_path = str(inp_path)
-    else:
-        print('No Input Path provided')
-        terminate_program()
+""" USAGE: inp_path = util.check_path(inp_path, inpType='file', checkExists=True) """
+def check_path(inp_path, inpType='dir', checkExists=False):
+    # normalized path (directories end with '/'), raises ScoringError
+    if inp_path is None:
+        raise ScoringError('No Input Path provided')
+    inp_path = str(inp_path)
     if inp_path[-1] == '/':
         inp_path = inp_path[:-1]
     
     if inpType == 'file':
         dir_name = os.path.dirname(inp_path)
         if not os.path.isdir(dir_name):
-            print(dir_name,' -> Directory Path of file does not Exist.')
-            terminate_program()
-        else:
-            if checkExists:
-                if not os.path.isfile(inp_path):
-                    print(inp_path,' -> File Path does not Exist.')
-                    terminate_program()
-            return inp_path
+            raise ScoringError(dir_name+'  -> Directory Path of file does not Exist.')
+        if checkExists and not os.path.isfile(inp_path):
+            raise ScoringError(inp_path+'  -> File Path does not Exist.')
     else:
-        if not os.path.isdir(inp_path):
-            print(inp_path,' -> Path is not a Directory or does not Exist')
-            terminate_program()
-        else:
-            if inp_path[-1] != '/':
-                inp_path += '/'
-            return inp_path
+        if not os.path.isdir(inp_path) and fs02archive.split_archive_path(inp_path) is None:
+            raise ScoringError(inp_path+'  -> Path is not a Directory or does not Exist')
+        inp_path += '/'
+    return inp_path
 
-def get_files_to_score(ref_path, hyp_path, write_msg, isFolder=True, task=''):
+
+def processInpPath(inp_path, inpType='dir', checkExists=False):
+    return call_or_terminate(check_path, inp_path, inpType, checkExists)
+
+# version of the SID ref map and ASR json words stored in the reference cache
+REF_CACHE_VERSION = 1
+
+
+def get_SID_ref_dict(ref_path):
+    # uttID: spkID (last field) of each line of a SID ref file
+    return {x.split()[0].strip():x.split()[-1].strip() for x in readList(ref_path)}
+
+
+def SID_ref_dict_to_arrays(ref_dict):
+    return {'uttIDs':fs02cache.str_array(ref_dict.keys()),
+            'spkIDs':fs02cache.str_array(ref_dict.values())}
+
+
+def SID_ref_dict_from_arrays(arrays):
+    return dict(zip(fs02cache.str_list(arrays['uttIDs']), fs02cache.str_list(arrays['spkIDs'])))
+
+
+def load_SID_ref_dict(ref_path):
+    return fs02cache.load_cached(ref_path, 'sid_ref', REF_CACHE_VERSION, get_SID_ref_dict,
+                                 SID_ref_dict_to_arrays, SID_ref_dict_from_arrays)
+
+
+""" USAGE: files_to_score, fileDict, total_missing = util.find_files_to_score(ref_path, hyp_path) """
+def find_files_to_score(ref_path, hyp_path, isFolder=True, task=''):
+    # sorted names common to ref and hyp (files of both directories, or
+    # lines of both files), their ref and hyp entries, and the names missing
+    # from either one. Raises ScoringError if there is nothing to score.
     fileDict = {'ref':{},'hyp':{}}
     
     if isFolder:
         ref_list = get_from_dir(ref_path)
         hyp_list = get_from_dir(hyp_path)
+    elif task == 'SID':
+        # uttID: spkID map of the ref file, from the reference cache
+        ref_list = load_SID_ref_dict(ref_path)
+        hyp_list = readList(hyp_path)
     else:
         ref_list = readList(ref_path)
         hyp_list = readList(hyp_path)
     
     if len(ref_list) < 1:
-        print('\nNo Reference files found in ref path. Cannot provide score.')
-        terminate_program()
+        raise ScoringError('\nNo Reference files found in ref path. Cannot provide score.')
     if len(hyp_list) < 1:
-        print('\nNo System Output files found in hyp path. Cannot provide score.')
-        terminate_program()
+        raise ScoringError('\nNo System Output files found in hyp path. Cannot provide score.')
 
     if isFolder:
         ref_dict = {getfName(x):x for x in ref_list}
         hyp_dict = {getfName(x):x for x in hyp_list}
     else:
         if task == 'SID':
-            ref_dict = {x.split()[0].strip():x.split()[-1].strip() for x in ref_list}
+            ref_dict = ref_list
             hyp_dict = {x.split()[0].strip():[y.strip() for y in x.split()[1:]] for x in hyp_list}
         else:
             ref_dict = {x.split()[0].strip():' '.join(x.split()[1:]).strip() for x in ref_list}
@@ -279,15 +451,23 @@ def get_files_to_score(ref_path, hyp_path, write_msg, isFolder=True, task=''):
     files_to_score = list(set(set(all_file_list) - set(total_missing)))
     
     if len(files_to_score) < 1:
-        print('\nNo common files between Ref and Hyp that can be scored.')
-        terminate_program()
+        raise ScoringError('\nNo common files between Ref and Hyp that can be scored.')
     
     files_to_score.sort()
     for fn in files_to_score:
         fileDict['ref'][fn] = ref_dict[fn]
         fileDict['hyp'][fn] = hyp_dict[fn]
-        
-    # write Messages
+    return files_to_score, fileDict, total_missing
+
+
+def get_files_to_score(ref_path, hyp_path, write_msg, isFolder=True, task=''):
+    files_to_score, fileDict, total_missing = call_or_terminate(
+        find_files_to_score, ref_path, hyp_path, isFolder, task)
+    write_msg = get_files_to_score_msg(files_to_score, total_missing, write_msg, isFolder)
+    return files_to_score, fileDict, write_msg
+
+
+def get_files_to_score_msg(files_to_score, total_missing, write_msg, isFolder=True):
     write_msg.append('\n\nTotal Files to be Evaluated : '+str(len(files_to_score)))
     if isFolder:
         write_msg.append('\nScoring File Names:\n'+' '.join(files_to_score))
@@ -298,6 +478,5 @@ def get_files_to_score(ref_path, hyp_path, write_msg, isFolder=True, task=''):
         else:
             write_msg.append('No files missing from evaluation list.')
     write_msg.append('\n\n')
-    
-    return files_to_score, fileDict, write_msg
+    return write_msg
 # EOF
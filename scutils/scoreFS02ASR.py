@@ -40,6 +40,8 @@ Created on Sun Apr 5 2020
 """
 
 import fs02utils as util
+import fs02prof as prof
+import fs02asr
 import argparse
 
 
@@ -56,7 +58,7 @@ def parse_arguments():
         '(folder with json files for track-1, and a plain text file for track-2)'+\
         'For more information regarding scoring input and hypothesis files, '+\
         'refer below arguments description. Open-Source Software Credits: '+\
-        'This script uses compute-wer tool from the Kaldi Speech Recognition '+\
+        'This script uses (a python port of) compute-wer tool from the Kaldi Speech Recognition '+\
         'Toolkit. for more info, refer: (http://kaldi-asr.org/doc/tools.html)'
     
     ref_mp = 'egs/ref_gt/ASR/ASR_track'
@@ -79,6 +81,8 @@ def parse_arguments():
         'Directory Path for Track-1 must include only FS02-ASR system output files. '+\
         'For ASR_track1: directory containing json format system output files required. '+\
         'Please refer ./'+ref_mp+'1/ directory for examples and file format. '+\
+        'The json files of a .tar.gz, .tgz, .tar or .zip archive (e.g. a submission packet), '+\
+        'or of a directory inside one (archive/folder/), are scored without extracting it. '+\
         'For ASR_track2: kaldi "text" file. Refer: { https://kaldi-asr.org/doc/data_prep.html#data_prep_data }. '+\
         'file contents of File Path for Track-2 must include only FS02_ASR_track2 '+\
         'file-names followed by associated transcripts (like in Kaldi "text" format)'+\
@@ -89,20 +93,54 @@ def parse_arguments():
     trk_str = 'Track number of the ASR Task to be evaluated. '+\
         'Input Options: (as string) "1" or "2"'
     kld_str = 'base path to the locally installed kaldi directory. '+\
-        'e.g. /home/crss/kaldi. This argument is required for'
+        'e.g. /home/crss/kaldi. This argument is required for the kaldi engine.'
+    eng_str = 'WER scoring engine. Input Options: "python" (in-process port of '+\
+        'compute-wer) or "kaldi" (runs compute-wer from --kaldi). Default: python.'
+    mod_str = 'Scoring mode (as compute-wer --mode). Input Options: "all" (missing '+\
+        'hypotheses are scored as empty), "present" (only utterances with a '+\
+        'hypothesis are scored) or "strict" (error on missing hypotheses). Default: all.'
+    aln_str = 'Also report per-file, per-speaker (Track-1) error counts and top '+\
+        'confusion pairs, computed from a single alignment of all utterances. '+\
+        'Per-utterance alignments are stored in '+util.get_logs_path()+' as a '+\
+        'columnar .align.npz file (see fs02asr.load_alignments) and as text '+\
+        'in a .align.log file. (python engine only)'
+    job_str = 'Number of Track-1 json files read in parallel (worker processes). '+\
+        'Results are identical to a serial run. Default: 1.'
+    prf_str = 'Print the wall time, CPU time, subprocess time and peak memory of every '+\
+        'scoring stage, and dump cProfile (.prof) and tracemalloc (.tracemalloc) '+\
+        'snapshots of this process to '+util.get_logs_path()
+    tjs_str = 'Write the per stage and per file timings (see --profile) to this json File Path.'
     
     
     parser = argparse.ArgumentParser(description=desc)
     parser.add_argument('-track', '--track', type=str, default='1', help=trk_str)
-    parser.add_argument('-kaldi','--kaldi', type=str, required=True, help=kld_str)
+    parser.add_argument('-kaldi','--kaldi', type=str, default=None, help=kld_str)
     parser.add_argument('-ref', '--ref', type=str, default=ref_def, help=ref_str)
     parser.add_argument('-hyp', '--hyp', type=str, default=hyp_def, help=hyp_str)
     parser.add_argument('-out', '--out', type=str, default=def_out_path, help=out_str)
+    parser.add_argument('-engine', '--engine', type=str, default='python',
+                        choices=['python', 'kaldi'], help=eng_str)
+    parser.add_argument('-mode', '--mode', type=str, default='all',
+                        choices=fs02asr.WER_MODES, help=mod_str)
+    parser.add_argument('-align', '--align', action='store_true', help=aln_str)
+    parser.add_argument('-jobs', '--jobs', type=int, default=1, help=job_str)
+    parser.add_argument('-profile', '--profile', action='store_true', help=prf_str)
+    parser.add_argument('-timings-json', '--timings-json', type=str, default=None, help=tjs_str)
      
     args = parser.parse_args()
+    util.proc_prof_args(args.profile, args.timings_json)
     
     track_num = proc_track_num(args.track)
-    kaldi_path = util.processInpPath(args.kaldi)    
+    if args.align and args.engine == 'kaldi':
+        print('Alignment output is only available with the python engine.')
+        args.engine = 'python'
+    if args.engine == 'kaldi':
+        if args.kaldi is None:
+            print('--kaldi path is required for the kaldi engine.')
+            util.terminate_program()
+        kaldi_path = util.processInpPath(args.kaldi)
+    else:
+        kaldi_path = None
     if args.ref == ref_def or args.hyp == hyp_def:
         ad = str(track_num)+'/'
         t2_name = 'FS01_ASR_track2_transcriptions_Dev'
@@ -122,7 +160,9 @@ def parse_arguments():
         hyp_path = util.processInpPath(args.hyp)
     out_path = util.processInpPath(args.out, inpType='file')
     
-    return ref_path, hyp_path, out_path, track_num, kaldi_path
+    n_jobs = util.proc_n_jobs(args.jobs)
+    
+    return ref_path, hyp_path, out_path, track_num, kaldi_path, args.mode, args.align, n_jobs
 
 
 
@@ -152,18 +192,79 @@ def get_write_msg_list(params):
     return write_msg
 
 
-def score_all_ASR(ref_path, hyp_path, write_msg, kaldi_path, track_num):
-    if track_num ==1:
-        gt_fp = 'ark:'+util.json_dir_to_txt(ref_path, setType='ref')
-        hyp_fp = 'ark:'+util.json_dir_to_txt(hyp_path, setType='hyp')
-    else:
-        gt_fp = 'ark:'+util.get_ASR_track2_clean(ref_path, setType='ref')
-        hyp_fp = 'ark:'+util.get_ASR_track2_clean(hyp_path, setType='hyp')
-    
+def compute_wer_kaldi(gt_trans, hyp_trans, kaldi_path, mode):
+    gt_fp = util.write_trans_temp(gt_trans, setType='ref')
+    hyp_fp = util.write_trans_temp(hyp_trans, setType='hyp')
     kld_cmd_path = kaldi_path+'src/bin/compute-wer'
-    cmode = '--mode=all'
-    file_term_cmd = [kld_cmd_path, '--text', cmode, gt_fp, hyp_fp]
-    asr_file_termOut = util.get_term_output(file_term_cmd)
+    cmode = '--mode='+mode
+    file_term_cmd = [kld_cmd_path, '--text', cmode, 'ark:'+gt_fp, 'ark:'+hyp_fp]
+    try:
+        termOut = util.get_term_output(file_term_cmd)
+    finally:
+        util.remove_file(gt_fp); util.remove_file(hyp_fp)
+    return termOut
+
+
+def compute_wer(gt_trans, hyp_trans, mode):
+    try:
+        scores = fs02asr.compute_wer(gt_trans, hyp_trans, mode)
+    except ValueError as err:
+        return 'ERROR: '+str(err)
+    return fs02asr.format_scores(scores)
+
+
+def align_ASR(gt_trans, hyp_trans, mode, file_name, word_speakers, align_path):
+    try:
+        aligns = fs02asr.align_all(gt_trans, hyp_trans, mode)
+    except ValueError as err:
+        return 'ERROR: '+str(err), []
+    
+    utt_counts = fs02asr.count_ops(aligns)
+    align_msg = [fs02asr.format_counts(aligns.keys, utt_counts, 'UTTERANCE'), '\n']
+    for utt, key in enumerate(aligns.keys):
+        align_msg.append('KEY: '+key+'\n'+fs02asr.format_alignment(aligns, utt)+'\n')
+    util.writeList(align_msg, align_path+'.align.log', isOverWrite=True, verbose=False)
+    fs02asr.save_alignments(aligns, align_path+'.align.npz')
+    
+    report_msg = ['\n\tError Counts per File:\n']
+    if file_name is None:
+        report_msg.append(fs02asr.format_counts(aligns.keys, utt_counts, 'FILE'))
+    else:
+        report_msg.append(fs02asr.format_counts([file_name],
+                                                utt_counts.sum(axis=0, keepdims=True), 'FILE'))
+    if word_speakers is not None:
+        names, counts = fs02asr.count_ops_by_label(aligns, word_speakers)
+        report_msg.append('\n\tError Counts per Speaker:\n')
+        report_msg.append(fs02asr.format_counts(names, counts, 'SPEAKER'))
+    report_msg.append('\n\tTop-20 Confusion Pairs (REF ==> HYP):\n')
+    report_msg.append(fs02asr.format_confusion_pairs(fs02asr.confusion_pairs(aligns, 20)))
+    report_msg.append('\n\tAlignments written to: '+align_path+'.align.log, '+
+                      align_path+'.align.npz')
+    return fs02asr.format_scores(fs02asr.alignment_scores(aligns)), report_msg
+
+
+def load_ASR_trans(ref_path, hyp_path, track_num, n_jobs=1):
+    gt_trans, hyp_trans, word_speakers = util.call_or_terminate(fs02asr.load_trans, ref_path,
+                                                                hyp_path, track_num, n_jobs)
+    file_name = util.get_bname(ref_path) if track_num == 2 else None
+    return gt_trans, hyp_trans, file_name, word_speakers
+
+
+def get_ASR_termOut(gt_trans, hyp_trans, kaldi_path, mode='all', file_name=None,
+                    word_speakers=None, align_path=None):
+    # compute-wer style output (of the selected engine) and alignment reports
+    report_msg = []
+    if align_path is not None:
+        asr_file_termOut, report_msg = align_ASR(gt_trans, hyp_trans, mode, file_name,
+                                                 word_speakers, align_path)
+    elif kaldi_path is None:
+        asr_file_termOut = compute_wer(gt_trans, hyp_trans, mode)
+    else:
+        asr_file_termOut = compute_wer_kaldi(gt_trans, hyp_trans, kaldi_path, mode)
+    return asr_file_termOut, report_msg
+
+
+def get_ASR_results(asr_file_termOut, report_msg, track_num, write_msg):
     write_msg.append('\n\n\n'+asr_file_termOut+'\n\n\n')
     wer_mrkr = '%WER'
     if wer_mrkr not in asr_file_termOut:
@@ -177,23 +278,42 @@ def score_all_ASR(ref_path, hyp_path, write_msg, kaldi_path, track_num):
         print(wline); write_msg.append(wline)
         wline = '\t'+'*'*60; print(wline); write_msg.append(wline)
         wline = '\n\n'; print(wline)
+    write_msg.extend(report_msg)
     return overall_wer, write_msg
 
 
+def score_all_ASR(ref_path, hyp_path, write_msg, kaldi_path, track_num, mode='all',
+                  align_path=None, n_jobs=1):
+    with prof.stage('parsing'):
+        gt_trans, hyp_trans, file_name, word_speakers = load_ASR_trans(ref_path, hyp_path,
+                                                                       track_num, n_jobs)
+    with prof.stage('scoring'):
+        asr_file_termOut, report_msg = get_ASR_termOut(gt_trans, hyp_trans, kaldi_path, mode,
+                                                       file_name, word_speakers, align_path)
+    with prof.stage('report'):
+        return get_ASR_results(asr_file_termOut, report_msg, track_num, write_msg)
+
+
 
 if __name__ == '__main__':
 
     # Input Arguments
-    ref_path, hyp_path, out_path, track_num, kaldi_path = parse_arguments()
+    ref_path, hyp_path, out_path, track_num, kaldi_path, mode, align, n_jobs = parse_arguments()
+    align_path = util.get_logs_path()+util.get_bname(out_path) if align else None
     
     # Results and Log
     write_msg = get_write_msg_list((ref_path, hyp_path, track_num))
     
     # Score Files  
-    overall_wer, write_msg = score_all_ASR(ref_path, hyp_path, write_msg, kaldi_path, track_num)
-    del ref_path, hyp_path, kaldi_path, track_num
+    overall_wer, write_msg = score_all_ASR(ref_path, hyp_path, write_msg, kaldi_path,
+                                           track_num, mode, align_path, n_jobs)
+    del ref_path, hyp_path, kaldi_path, track_num, mode, align, align_path, n_jobs
     
     # Write Results and Log
-    util.writeList(write_msg, out_path, isOverWrite=True)
+    with prof.stage('report'):
+        util.writeList(write_msg, out_path, isOverWrite=True)
+    
+    # Print and Write Timings and Profiles
+    prof.finish(util.get_logs_path()+util.get_bname(out_path))
     del write_msg, out_path
 # EOF
\ No newline at end of file
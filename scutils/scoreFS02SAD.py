@@ -41,6 +41,10 @@ Created on Sun Apr 5 2020
 
 
 import fs02utils as util
+import fs02archive
+import fs02prof as prof
+import fs02sad
+import fs02store
 import argparse
 
 
@@ -56,8 +60,8 @@ def parse_arguments():
     desc='Wrapper File to generate DCF Scores for FS02 Challenge SAD Task.' +\
         'For more information regarding scoring input and hypothesis files, '+\
         'refer below arguments description. '+\
-        'Open-Source Software Credits: This script uses scoreFile_SAD.pl '+\
-        'developed by NIST. for more info, refer: (https://www.nist.gov/'+\
+        'Open-Source Software Credits: This script uses (a python port of) '+\
+        'scoreFile_SAD.pl developed by NIST. for more info, refer: (https://www.nist.gov/'+\
         'itl/iad/mig/nist-open-speech-activity-detection-evaluation)'
     
     ref_mp = 'egs/ref_gt/SAD/'
@@ -72,12 +76,30 @@ def parse_arguments():
         'Please refer ./'+ref_mp+' directory for examples.'
     hyp_str = 'Hypothesis (system output) Directory Path. '+\
         'This directory must include only SAD system output files. '+\
-        'Please refer ./'+hyp_mp+' directory for examples and file format.'
+        'Please refer ./'+hyp_mp+' directory for examples and file format. '+\
+        'A .tar.gz, .tgz, .tar or .zip archive (e.g. a submission packet), or a directory '+\
+        'inside one (archive/folder/), is scored without extracting it. (python engine only)'
     out_str = 'Output (per file and overall system score) File Path. '+\
         'Default: Result file will stored in '+util.get_results_path()+' directory. '+\
         'Additional log files if generated will be stored in '+util.get_logs_path()
     clr_str = 'Desired forgiveness Collar for SAD evaluation. '+coll_inps_str+\
         ' Default collar length: 0.5 secs.'
+    eng_str = 'SAD scoring engine. Input Options: "python" (in-process port of '+\
+        'scoreFile_SAD.pl) or "perl" (runs scoreFile_SAD.pl for every file). '+\
+        'Default: python.'
+    all_str = 'Score all collars ('+coll_inps_str.split(': ')[-1]+') in a single '+\
+        'run, reporting DCF, Miss rate and False Alarm rate per collar. '+\
+        'The --sadcollar argument is ignored. (python engine only)'
+    job_str = 'Number of files scored in parallel (worker processes). '+\
+        'Results are identical to a serial run. Default: 1.'
+    inc_str = 'Incremental scoring: the per file scores are stored in '+\
+        fs02store.get_store_path()+' and only files whose ref or hyp file (or the '+\
+        'collar) changed since an earlier --incremental run are scored again. '+\
+        '(python engine only)'
+    prf_str = 'Print the wall time, CPU time, subprocess time and peak memory of every '+\
+        'scoring stage, and dump cProfile (.prof) and tracemalloc (.tracemalloc) '+\
+        'snapshots of this process to '+util.get_logs_path()
+    tjs_str = 'Write the per stage and per file timings (see --profile) to this json File Path.'
     
     
     parser = argparse.ArgumentParser(description=desc)
@@ -85,14 +107,35 @@ def parse_arguments():
     parser.add_argument('-hyp', '--hyp', type=str, default=hyp_def, help=hyp_str)
     parser.add_argument('-out', '--out', type=str, default=def_out_path, help=out_str)
     parser.add_argument('-sadcollar', '--sadcollar', type=float, default=0.5, help=clr_str)
+    parser.add_argument('-engine', '--engine', type=str, default='python',
+                        choices=['python', 'perl'], help=eng_str)
+    parser.add_argument('-allcollars', '--allcollars', action='store_true', help=all_str)
+    parser.add_argument('-jobs', '--jobs', type=int, default=1, help=job_str)
+    parser.add_argument('-incremental', '--incremental', action='store_true', help=inc_str)
+    parser.add_argument('-profile', '--profile', action='store_true', help=prf_str)
+    parser.add_argument('-timings-json', '--timings-json', type=str, default=None, help=tjs_str)
     args = parser.parse_args()
+    util.proc_prof_args(args.profile, args.timings_json)
     
     ref_path = util.processInpPath(args.ref)
     hyp_path = util.processInpPath(args.hyp)
     out_path = util.processInpPath(args.out, inpType='file')
     sadcollar = proc_sad_collar(args.sadcollar)
+    if args.allcollars:
+        sadcollar = 'all'
+        if args.engine == 'perl':
+            print('All collars mode is only available with the python engine.')
+            args.engine = 'python'
+    if args.incremental and args.engine == 'perl':
+        print('Incremental scoring is only available with the python engine.')
+        args.incremental = False
+    if args.engine == 'perl' and fs02archive.split_archive_path(hyp_path) is not None:
+        print('Archives are only scored with the python engine.')
+        args.engine = 'python'
     
-    return ref_path, hyp_path, out_path, sadcollar
+    n_jobs = util.proc_n_jobs(args.jobs)
+    
+    return ref_path, hyp_path, out_path, sadcollar, args.engine, n_jobs, args.incremental
 
 
 
@@ -114,6 +157,8 @@ def get_write_msg_list(params):
     write_msg = [strz+'\t\t--Stating SAD system Evaluation for FS02--\n'+strz]
     write_msg.append('\tGround Truth Directory Path : '+ref_path)
     write_msg.append('\tSystem Output Directory Path : '+hyp_path)
+    if sadcollar == 'all':
+        sadcollar = ', '.join([str(x) for x in fs02sad.SAD_COLLARS])
     write_msg.append('\tforgiveness collar for SAD evaluation : '+str(sadcollar))
     write_msg.append('\n\n')
     
@@ -121,7 +166,7 @@ def get_write_msg_list(params):
     
 
 
-def score_file_SAD(gt_fp, hyp_fp, sadcollar):
+def score_file_SAD_perl(gt_fp, hyp_fp, sadcollar):
         
     temp_out_fp = util.get_temp_path()+util.getfName(gt_fp)+'.out'
     util.remove_file(temp_out_fp)
@@ -143,19 +188,23 @@ def score_file_SAD(gt_fp, hyp_fp, sadcollar):
 
 
 
-def score_folder_SAD(fileList, fileDict, sadcollar, write_msg):
-    dcfDict = {}
-    non_scored = []
-    for fname in fileList:
-        dcf = score_file_SAD(fileDict['ref'][fname], fileDict['hyp'][fname], sadcollar)
-        if dcf == 'NaN':
-            non_scored.append(fname)
-        else:
-            dcfDict[fname] = dcf
+def score_folder_SAD(fileList, fileDict, sadcollar, write_msg, engine='python', n_jobs=1,
+                     store=None):
+    if engine == 'perl':
+        args_list = [(fileDict['ref'][fname], fileDict['hyp'][fname], sadcollar) for fname in fileList]
+        dcf_list = util.run_jobs(score_file_SAD_perl, args_list, n_jobs, fail_val='NaN')
+        dcfDict = {fname:dcf for fname, dcf in zip(fileList, dcf_list) if dcf != 'NaN'}
+        non_scored = [fname for fname in fileList if fname not in dcfDict]
+    else:
+        results = fs02sad.score_files_SAD(fileList, fileDict, [sadcollar], n_jobs,
+                                          store)[float(sadcollar)]
+        dcfDict = {fname:fs02sad.format_score(dcf).strip()
+                   for fname, dcf in zip(results.files, results.dcf.tolist())}
+        non_scored = results.not_scored
     
     if len(non_scored) > 0:
-        wline = '\nThe following files cound not be scored:\n\t'
-        +' '.join(non_scored)+'\nPlease check the System Output for errors.\n'
+        wline = '\nThe following files cound not be scored:\n\t'+\
+            ' '.join(non_scored)+'\nPlease check the System Output for errors.\n'
         write_msg.append(wline)
     
     wline = 'Files Succesfully Evaluated: '+str(len(dcfDict))+'\n'
@@ -164,6 +213,52 @@ def score_folder_SAD(fileList, fileDict, sadcollar, write_msg):
 
 
 
+def score_folder_SAD_allcollars(fileList, fileDict, write_msg, n_jobs=1, store=None):
+    results = fs02sad.score_files_SAD(fileList, fileDict, fs02sad.SAD_COLLARS, n_jobs, store)
+    non_scored = results[fs02sad.SAD_COLLARS[0]].not_scored
+    
+    if len(non_scored) > 0:
+        wline = '\nThe following files cound not be scored:\n\t'+\
+            ' '.join(non_scored)+'\nPlease check the System Output for errors.\n'
+        write_msg.append(wline)
+    
+    wline = 'Files Succesfully Evaluated: '+str(len(results[fs02sad.SAD_COLLARS[0]].files))+'\n'
+    write_msg.append(wline)
+    return results, write_msg
+
+
+
+def get_SAD_allcollar_results(results, write_msg):
+    
+    score_names = ['dcf', 'p_miss', 'p_fa']
+    overall = {c:{} for c in fs02sad.SAD_COLLARS}
+    
+    write_msg.append('\n\n\t---Individual DCF, Miss and False Alarm Rates per Collar---\n')
+    write_msg.append('   File Name\t:\tCollar\t:\t  DCF\t:\t P_Miss\t:\t P_FA')
+    for i, fname in enumerate(results[fs02sad.SAD_COLLARS[0]].files):
+        for collar in fs02sad.SAD_COLLARS:
+            score_strs = [fs02sad.format_score(getattr(results[collar], x)[i]).strip()
+                          for x in score_names]
+            write_msg.append(fname+'\t:\t'+str(collar)+'\t:\t'+'\t:\t'.join(score_strs))
+    
+    wline = '\n\n'; print(wline); write_msg.append(wline)
+    wline = '\t'+'*'*60; print(wline); write_msg.append(wline)
+    wline = '\tOVERALL Results for FS02 SAD Task (all collars):'
+    print(wline); write_msg.append(wline)
+    wline = '\tCollar\t:\t  DCF\t:\t P_Miss\t:\t P_FA'
+    print(wline); write_msg.append(wline)
+    for collar in fs02sad.SAD_COLLARS:
+        for x in score_names:
+            overall[collar][x] = str(fs02sad.get_overall(results[collar], x))
+        wline = '\t'+str(collar)+'\t:\t'+'\t:\t'.join([overall[collar][x] for x in score_names])
+        print(wline); write_msg.append(wline)
+    wline = '\t'+'*'*60; print(wline); write_msg.append(wline)
+    wline = '\n\n'; print(wline)
+    
+    return overall, write_msg
+
+
+
 def get_SAD_results(dcfDict, write_msg):
     
     overall_dcf = 0.0
@@ -192,23 +287,45 @@ def get_SAD_results(dcfDict, write_msg):
 if __name__ == '__main__':
 
     # Input Arguments
-    ref_path, hyp_path, out_path, sadcollar = parse_arguments()
+    ref_path, hyp_path, out_path, sadcollar, engine, n_jobs, incremental = parse_arguments()
     
     # Results and Log
     write_msg = get_write_msg_list((ref_path, hyp_path, sadcollar))
     
     # Get Files to Score
-    fileList, fileDict, write_msg = util.get_files_to_score(ref_path, hyp_path, write_msg)
+    with prof.stage('discovery'):
+        fileList, fileDict, write_msg = util.get_files_to_score(ref_path, hyp_path, write_msg)
     del ref_path, hyp_path
     
-    # Score Files
-    dcfDict, write_msg = score_folder_SAD(fileList, fileDict, sadcollar, write_msg)
-    del sadcollar, fileList, fileDict
+    # Stored per file scores (incremental scoring)
+    store = fs02store.open_store(incremental)
     
-    # Get SAD DCF results
-    overall_dcf, write_msg = get_SAD_results(dcfDict, write_msg)
+    if sadcollar == 'all':
+        # Score Files (all collars)
+        with prof.stage('files'):
+            results, write_msg = score_folder_SAD_allcollars(fileList, fileDict, write_msg, n_jobs,
+                                                             store)
+        del sadcollar, engine, n_jobs, incremental, store, fileList, fileDict
+        
+        # Get SAD DCF, Miss and False Alarm results for all collars
+        with prof.stage('report'):
+            overall_scores, write_msg = get_SAD_allcollar_results(results, write_msg)
+    else:
+        # Score Files
+        with prof.stage('files'):
+            dcfDict, write_msg = score_folder_SAD(fileList, fileDict, sadcollar, write_msg,
+                                                  engine, n_jobs, store)
+        del sadcollar, engine, n_jobs, incremental, store, fileList, fileDict
+        
+        # Get SAD DCF results
+        with prof.stage('report'):
+            overall_dcf, write_msg = get_SAD_results(dcfDict, write_msg)
     
     # Write Results and Log
-    util.writeList(write_msg, out_path, isOverWrite=True)
+    with prof.stage('report'):
+        util.writeList(write_msg, out_path, isOverWrite=True)
+    
+    # Print and Write Timings and Profiles
+    prof.finish(util.get_logs_path()+util.get_bname(out_path))
     del write_msg, out_path
 # EOF
\ No newline at end of file
@@ -41,7 +41,17 @@ Created on Sun Apr 5 2020
 
 
 import fs02utils as util
-import argparse
+import fs02archive
+import fs02prof as prof
+import fs02sd
+import fs02store
+import argparse, io, sys
+from contextlib import redirect_stdout, redirect_stderr
+
+sys.path.append(util.get_dscore_path())
+from score import print_table
+from scorelib.rttm import validate_rttm
+from scorelib.utils import error, info
 
 
 
@@ -72,12 +82,21 @@ def parse_arguments():
         'and UEM folders. Please refer ./'+ref_mp+' directory for examples.'
     hyp_str = 'Hypothesis (system output) Directory Path. '+\
         'This directory must include only diarization system output RTTM files. '+\
-        'Please refer ./'+hyp_mp+' directory for examples and file format.'
+        'Please refer ./'+hyp_mp+' directory for examples and file format. '+\
+        'A .tar.gz, .tgz, .tar or .zip archive (e.g. a submission packet), or a directory '+\
+        'inside one (archive/folder/), is scored without extracting it.'
     out_str = 'Output (per file and overall system score) File Path. '+\
         'Default: Result file will stored in '+util.get_results_path()+' directory. '+\
         'Additional log files if generated will be stored in '+util.get_logs_path()
     clr_str = 'Desired forgiveness Collar for SD evaluation. '+coll_inps_str+\
         ' Default collar length: 0.25 secs.'
+    inc_str = 'Incremental scoring: the per file scores are stored in '+\
+        fs02store.get_store_path()+' and only files whose ref RTTM, ref UEM or hyp '+\
+        'RTTM file (or the collar) changed since an earlier --incremental run are scored again.'
+    prf_str = 'Print the wall time, CPU time, subprocess time and peak memory of every '+\
+        'scoring stage, and dump cProfile (.prof) and tracemalloc (.tracemalloc) '+\
+        'snapshots of this process to '+util.get_logs_path()
+    tjs_str = 'Write the per stage and per file timings (see --profile) to this json File Path.'
     
     
     parser = argparse.ArgumentParser(description=desc)
@@ -85,52 +104,22 @@ def parse_arguments():
     parser.add_argument('-hyp', '--hyp', type=str, default=hyp_def, help=hyp_str)
     parser.add_argument('-out', '--out', type=str, default=def_out_path, help=out_str)
     parser.add_argument('-diarcollar', '--diarcollar', type=float, default=0.25, help=clr_str)
+    parser.add_argument('-incremental', '--incremental', action='store_true', help=inc_str)
+    parser.add_argument('-profile', '--profile', action='store_true', help=prf_str)
+    parser.add_argument('-timings-json', '--timings-json', type=str, default=None, help=tjs_str)
     args = parser.parse_args()
+    util.proc_prof_args(args.profile, args.timings_json)
     
     ref_path = proc_sd_ref_files(util.processInpPath(args.ref))
     hyp_path = util.processInpPath(args.hyp)
     out_path = util.processInpPath(args.out, inpType='file')
     diarcollar = proc_sd_collar(args.diarcollar)
     
-    return ref_path, hyp_path, out_path, diarcollar
+    return ref_path, hyp_path, out_path, diarcollar, args.incremental
 
 
 def proc_sd_ref_files(ref_path):
-    rttm_path = ref_path+'RTTM/'
-    uem_path = ref_path+'UEM/'
-    if not util.check_isDir(rttm_path):
-        print('Ground Truth RTTM Folder does not exist in ref path.')
-        util.terminate_program()
-    if not util.check_isDir(uem_path):
-        print('Ground Truth UEM Folder does not exist in ref path.')
-        util.terminate_program()
-    
-    rttm_list = util.get_from_dir(rttm_path)
-    uem_list = util.get_from_dir(uem_path)
-    
-    if len(rttm_list) < 1:
-        print('\nNo RTTM files found in ref path. Cannot provide score.')
-        util.terminate_program()
-    if len(uem_list) < 1:
-        print('\nNo UEM files found in ref path. Cannot provide score.')
-        util.terminate_program()
-    
-    rttm_dict = {util.getfName(x):x for x in rttm_list}
-    uem_dict = {util.getfName(x):x for x in uem_list}
-    missing_from_uem = list(set(rttm_dict.keys()) - set(uem_dict.keys()))
-    missing_from_rttm = list(set(uem_dict.keys()) - set(rttm_dict.keys()))
-    
-    if len(missing_from_uem+missing_from_rttm) > 0:
-        print('Uncommon Files found between Ground Truth RTTM and UEM folders.')
-        print('Missing Files:')
-        if len(missing_from_uem) > 0:
-            for fn in missing_from_uem:
-                print(fn+'.uem')
-        if len(missing_from_rttm) > 0:
-            for fn in missing_from_rttm:
-                print(fn+'.rttm')
-        util.terminate_program()
-    return ref_path
+    return util.call_or_terminate(fs02sd.check_ref_files, ref_path)
 
 
 def proc_sd_collar(diarcollar):
@@ -156,47 +145,97 @@ def get_write_msg_list(params):
     return write_msg
     
 
-def score_file_SAD(py_val_path, py_score_path, fname, ref_rttm, hyp_rttm, ref_uem, diarcollar):
-    
-    val_term_cmd = ['python', py_val_path, ref_rttm, hyp_rttm]
-    val_termOut = util.get_term_output(val_term_cmd)
-    
-    sc_term_cmd = ['python', py_score_path, '--ignore_overlaps', '--collar', 
-                    diarcollar, '-u', ref_uem, '-r', ref_rttm, '-s', hyp_rttm]
-    sc_termOut = util.get_term_output(sc_term_cmd)
+def validate_file_SD(rttm_fp, validate=validate_rttm):
+    # same messages as dscore/validate_rttm.py
+    info('Validating %s...' % rttm_fp)
+    file_ids, speaker_ids, error_messages = validate(rttm_fp)
+    file_ids = sorted(file_ids)
+    info('%d file ids found: %s' % (len(file_ids), ', '.join(file_ids)))
+    speaker_ids = sorted(speaker_ids)
+    info('%d speaker ids found: %s' % (len(speaker_ids), ', '.join(speaker_ids)))
+    for msg in error_messages:
+        error(msg, file=sys.stdout)
+
+
+def dscore_file_SD(ref_rttm, hyp_rttm, ref_uem, diarcollar):
+    # same steps as dscore/score.py (--ignore_overlaps --collar diarcollar -u)
+    file_scores, global_scores = fs02sd.score_file_SD(ref_rttm, hyp_rttm, ref_uem,
+                                                      diarcollar, verbose=True)
+    print_table(file_scores, global_scores)
+    return file_scores, global_scores
 
-    if len(sc_termOut.split('*** OVERALL ***')) == 2:
-        der = sc_termOut.split('*** OVERALL ***')[-1].strip().split()[0]
+
+def score_file_SD(fname, ref_rttm, hyp_rttm, ref_uem, diarcollar):
+    
+    val_log = io.StringIO()
+    with redirect_stdout(val_log), redirect_stderr(val_log), prof.stage('validation'):
+        try:
+            validate_file_SD(ref_rttm, fs02sd.validate_ref_rttm)
+            validate_file_SD(hyp_rttm, fs02sd.validate_hyp_rttm)
+        except Exception as e:
+            error('%s' % e)
+    
+    sc_log = io.StringIO()
+    global_scores = None
+    with redirect_stdout(sc_log), redirect_stderr(sc_log):
+        try:
+            _, global_scores = dscore_file_SD(ref_rttm, hyp_rttm, ref_uem, diarcollar)
+        except Exception as e:
+            error('%s' % e)
+    
+    if global_scores is not None:
+        der = '%.2f' % global_scores.der
     else:
         print('Error in scoring', fname,'. Please Check the log file.\n')
-        der = 'NaN'    
+        der = 'NaN'
     strz = '\n\n\t\t'+'*'*60+'\n\n\n'
     log_desc = '\n---Scoring Log for file:'+fname+'---'
-    log_list = [log_desc,'\n\n',val_termOut,'\n\n', sc_termOut,strz]
+    log_list = [log_desc,'\n\n',val_log.getvalue(),'\n\n', sc_log.getvalue(),strz]
     
-    return der, log_list
+    return der, global_scores, log_list
 
 
 
-def score_folder_SD(fileList, fileDict, diarcollar, write_msg, out_path):
-    sctk_path = util.get_fs02sctk_path()
-    py_val_path = sctk_path+'scutils/dscore/validate_rttm.py'
-    py_score_path = sctk_path+'scutils/dscore/score.py'
+def get_stored_log(fname, store):
+    strz = '\n\n\t\t'+'*'*60+'\n\n\n'
+    log_desc = '\n---Scoring Log for file:'+fname+'---'
+    return [log_desc,'\n\n','Ref and Hyp files unchanged, scores loaded from the result store: '+
+            store.db_path,strz]
+
+
+
+def score_folder_SD(fileList, fileDict, diarcollar, write_msg, out_path, store=None):
     log_write_path = util.get_logs_path()+util.get_bname(out_path)+'.log'
     derDict = {}
     log_list = []
     unsuc_files = []
-    for fn in fileList:
+    stored_scores, keys, entries = {}, {}, []
+    if store is not None:
+        stored_scores, keys = fs02sd.get_stored_scores(fileList, fileDict, diarcollar, store)
+    # files of an archive are scored in archive order
+    file_results = {}
+    for fn in fs02archive.sort_by_archive(fileList, fileDict['hyp']):
         ref_rttm = fileDict['ref'][fn]
         hyp_rttm = fileDict['hyp'][fn]
-        ref_uem = ref_rttm.replace('/RTTM/','/UEM/').replace('.rttm','.uem')
-        der, curr_log = score_file_SAD(py_val_path, py_score_path, 
-                               fn, ref_rttm, hyp_rttm, ref_uem, diarcollar)
+        ref_uem = fs02sd.get_uem_path(ref_rttm)
+        if fn in stored_scores:
+            der, curr_log = '%.2f' % stored_scores[fn].der, get_stored_log(fn, store)
+        else:
+            with prof.timed_file(fn):
+                der, global_scores, curr_log = score_file_SD(fn, ref_rttm, hyp_rttm, ref_uem,
+                                                             diarcollar)
+            if store is not None and global_scores is not None:
+                entries.append((keys[fn], 'SD', fn, fs02store.to_stats(global_scores)))
+        file_results[fn] = der, curr_log
+    for fn in fileList:
+        der, curr_log = file_results[fn]
         if der != 'NaN':
             derDict[fn] = der
         else:
             unsuc_files.append(fn)
         log_list += curr_log
+    if store is not None:
+        store.put_stats(entries)
     with open(log_write_path,'w') as file:
             file.write('\n'.join(log_list))
             print('\n\nLog File for SD Task - DER evaluation',
@@ -235,24 +274,36 @@ def get_SD_results(derDict, write_msg):
 if __name__ == '__main__':
 
     # Input Arguments
-    ref_path, hyp_path, out_path, diarcollar = parse_arguments()
+    ref_path, hyp_path, out_path, diarcollar, incremental = parse_arguments()
     
     
     # Results and Log
     write_msg = get_write_msg_list((ref_path, hyp_path, diarcollar))
     
     # Get Files to Score
-    fileList, fileDict, write_msg = util.get_files_to_score(ref_path+'RTTM/', hyp_path, write_msg)
+    with prof.stage('discovery'):
+        fileList, fileDict, write_msg = util.get_files_to_score(ref_path+'RTTM/', hyp_path,
+                                                                write_msg)
     del ref_path, hyp_path
     
+    # Stored per file scores (incremental scoring)
+    store = fs02store.open_store(incremental)
+    
     # Score Files
-    derDict, write_msg = score_folder_SD(fileList, fileDict, diarcollar, write_msg, out_path)
-    del diarcollar, fileList, fileDict
+    with prof.stage('files'):
+        derDict, write_msg = score_folder_SD(fileList, fileDict, diarcollar, write_msg, out_path,
+                                             store)
+    del diarcollar, incremental, store, fileList, fileDict
     
     # Get SD DER results
-    overall_der, write_msg = get_SD_results(derDict, write_msg)
+    with prof.stage('report'):
+        overall_der, write_msg = get_SD_results(derDict, write_msg)
     
     # Write Results and Log
-    util.writeList(write_msg, out_path, isOverWrite=True)
+    with prof.stage('report'):
+        util.writeList(write_msg, out_path, isOverWrite=True)
+    
+    # Print and Write Timings and Profiles
+    prof.finish(util.get_logs_path()+util.get_bname(out_path))
     del write_msg, out_path
 # EOF
\ No newline at end of file
@@ -40,7 +40,10 @@ Created on Sun Apr 5 2020
 """
 
 import fs02utils as util
+import fs02prof as prof
+import fs02sid
 import argparse
+import numpy as np
 
 
 def parse_arguments():
@@ -71,6 +74,14 @@ def parse_arguments():
         'Additional log files will be stored in '+util.get_logs_path()
     clr_str = 'Desired Top-N Accuracy for SID evaluation. '+\
         'Default: Top-5 Accuracy.'
+    stm_str = 'Stream Ref and Hyp files line by line (constant memory, for very '+\
+        'large trial lists). Both files must be sorted by utterance ID '+\
+        '(e.g. with: LC_ALL=C sort -k1,1). Per file results are written as the '+\
+        'rank of the true speaker in the system predictions (0: not predicted).'
+    prf_str = 'Print the wall time, CPU time, subprocess time and peak memory of every '+\
+        'scoring stage, and dump cProfile (.prof) and tracemalloc (.tracemalloc) '+\
+        'snapshots of this process to '+util.get_logs_path()
+    tjs_str = 'Write the per stage and per file timings (see --profile) to this json File Path.'
     
     
     parser = argparse.ArgumentParser(description=desc)
@@ -78,15 +89,23 @@ def parse_arguments():
     parser.add_argument('-hyp', '--hyp', type=str, default=hyp_def, help=hyp_str)
     parser.add_argument('-out', '--out', type=str, default=def_out_path, help=out_str)
     parser.add_argument('-topN', '--topN', type=int, default=5, help=clr_str)
+    parser.add_argument('-stream', '--stream', action='store_true', help=stm_str)
+    parser.add_argument('-profile', '--profile', action='store_true', help=prf_str)
+    parser.add_argument('-timings-json', '--timings-json', type=str, default=None, help=tjs_str)
     
     args = parser.parse_args()
+    util.proc_prof_args(args.profile, args.timings_json)
     ref_path = util.processInpPath(args.ref, inpType='file', checkExists=True)
     hyp_path = util.processInpPath(args.hyp, inpType='file', checkExists=True)
     out_path = util.processInpPath(args.out, inpType='file')
-    max_TopN = validate_hyp_file(hyp_path)
+    with prof.stage('discovery'):
+        if args.stream:
+            max_TopN = get_max_TopN_stream(hyp_path)
+        else:
+            max_TopN = validate_hyp_file(hyp_path)
     topN_num = proc_topN_inp(args.topN, max_TopN)
     
-    return ref_path, hyp_path, out_path, topN_num
+    return ref_path, hyp_path, out_path, topN_num, max_TopN, args.stream
 
 
 def proc_topN_inp(topN_num, max_TopN):
@@ -102,15 +121,11 @@ def proc_topN_inp(topN_num, max_TopN):
 
 
 def validate_hyp_file(hyp_path):
-    hyp_list = util.readList(hyp_path)
-    n_diff_res = len(list(set([len(x.split()) for x in hyp_list])))
-    if n_diff_res != 1:
-        print('System Output File not consistent.')
-        print('All sample results should contain the same no. of speaker predictions.')
-        util.terminate_program()
-    else:
-        max_TopN = len(hyp_list[1].split()) - 1
-    return max_TopN
+    return util.call_or_terminate(fs02sid.get_max_topN, hyp_path)
+
+
+def get_max_TopN_stream(hyp_path):
+    return util.call_or_terminate(fs02sid.get_max_topN_stream, hyp_path)
 
 
 def get_write_msg_list(params):
@@ -128,37 +143,65 @@ def get_write_msg_list(params):
 
 
 
+def get_topN_msg(topNDict, write_msg):
+    strz = '\t'+'*'*40+'\n'
+    write_msg.append('\n\n\n')
+    write_msg.append(strz+'\tTop-N Acurracy System Evaluation Results:\n'+strz)
+    for n in topNDict:
+        write_msg.append('\tTop-'+str(n)+' Accuracy : '+str(topNDict[n])+' %')
+    write_msg.append(strz+'\n')
+    return write_msg
+
+
 def score_SID(fileList, fileDict, topN_num, write_msg, out_path):
-    clsfd_Dict = {n:{'corr':[],'incorr':[]} for n in range(1,topN_num+1)}
-    
-    for fn in fileList:
-        ref_str = fileDict['ref'][fn]
-        hyp_str_list = fileDict['hyp'][fn]
-        
-        for topn in clsfd_Dict:
-            hyp_topn = hyp_str_list[:topn]
-            if ref_str in hyp_topn:
-                clsfd_Dict[topn]['corr'].append(fn)
-            else:
-                clsfd_Dict[topn]['incorr'].append(fn)
-    
-    topNDict = {n:round((100.0*len(clsfd_Dict[n]['corr']))/len(fileList),3) for n in clsfd_Dict}
+    results = fs02sid.score_files_SID(fileList, fileDict, topN_num)
+    topNDict = results.accuracy
     
+    fn_array = np.array(fileList, dtype=object)
+    ranks = results.ranks
+    is_ranked = ranks > 0
     write_msg.append('Individual Results (per file) written to following paths:\n')
     strz = '\t'+'*'*40+'\n'
-    for n in clsfd_Dict:
+    for n in topNDict:
+        is_corr = is_ranked & (ranks <= n)
         write_path = util.get_logs_path()+util.get_bname(out_path)+'.Top-'+str(n)
         write_msg.append(write_path)
         write_list = [strz+'\tPer File SID Top-'+str(n)+' Accuracy Results\n'+strz]
-        write_list.append('\n\nCorrect Predictions:\n'+' '.join(clsfd_Dict[n]['corr']))
-        write_list.append('\n\nIncorrect Predictions:\n'+' '.join(clsfd_Dict[n]['incorr']))
+        write_list.append('\n\nCorrect Predictions:\n'+' '.join(fn_array[is_corr].tolist()))
+        write_list.append('\n\nIncorrect Predictions:\n'+' '.join(fn_array[~is_corr].tolist()))
         write_list.append('\n')
         util.writeList(write_list, write_path, isOverWrite=True)
-    write_msg.append('\n\n\n')
-    write_msg.append(strz+'\tTop-N Acurracy System Evaluation Results:\n'+strz)
-    for n in topNDict:
-        write_msg.append('\tTop-'+str(n)+' Accuracy : '+str(topNDict[n])+' %')
-    write_msg.append(strz+'\n')
+    write_msg = get_topN_msg(topNDict, write_msg)
+    return topNDict, write_msg
+
+
+def score_SID_stream(ref_path, hyp_path, topN_num, max_TopN, write_msg, out_path):
+    # only the no. of files per true speaker rank (0: not predicted) is kept
+    # in memory, the rank of each file is written to the log file
+    log_path = util.get_logs_path()+util.get_bname(out_path)
+    ranks_path, missing_path = log_path+'.ranks', log_path+'.missing'
+    with open(ranks_path,'w') as ranks_file, open(missing_path,'w') as missing_file:
+        def write_rank(fn, rank):
+            if rank is None:
+                missing_file.write(fn+'\n')
+            else:
+                ranks_file.write(fn+' '+str(rank)+'\n')
+        rank_counts, n_missing = util.call_or_terminate(fs02sid.count_ranks, ref_path, hyp_path,
+                                                        max_TopN, write_rank)
+    
+    n_files = int(sum(rank_counts))
+    topNDict = util.call_or_terminate(fs02sid.get_topN_accuracy, rank_counts, topN_num)
+    
+    write_msg.append('\n\nTotal Files to be Evaluated : '+str(n_files))
+    if n_missing > 0:
+        write_msg.append('Number of files missing from the evaluation list: '+str(n_missing))
+        write_msg.append('Missing File Names written to following path:\n'+missing_path)
+    else:
+        write_msg.append('No files missing from evaluation list.')
+    write_msg.append('\n\n')
+    write_msg.append('Individual Results (per file true speaker rank) written to following path:\n')
+    write_msg.append(ranks_path)
+    write_msg = get_topN_msg(topNDict, write_msg)
     return topNDict, write_msg
 
 def get_Top5_results(topNDict, write_msg):
@@ -173,25 +216,39 @@ def get_Top5_results(topNDict, write_msg):
 if __name__ == '__main__':
 
     # Input Arguments
-    ref_path, hyp_path, out_path, topN_num = parse_arguments()
+    ref_path, hyp_path, out_path, topN_num, max_TopN, stream = parse_arguments()
     
     
     # Results and Log
     write_msg = get_write_msg_list((ref_path, hyp_path, topN_num))
     
-    # Get Files to Score
-    fileList, fileDict, write_msg = util.get_files_to_score(ref_path, hyp_path, 
-                                        write_msg, isFolder=False, task='SID')
-    del ref_path, hyp_path
-    
-    # Score Files
-    topNDict, write_msg = score_SID(fileList, fileDict, topN_num, write_msg, out_path)
-    del topN_num, fileList, fileDict
+    if stream:
+        # Score Files (streaming)
+        with prof.stage('scoring'):
+            topNDict, write_msg = score_SID_stream(ref_path, hyp_path, topN_num, max_TopN,
+                                                   write_msg, out_path)
+        del ref_path, hyp_path, topN_num, max_TopN, stream
+    else:
+        # Get Files to Score
+        with prof.stage('discovery'):
+            fileList, fileDict, write_msg = util.get_files_to_score(ref_path, hyp_path, 
+                                                write_msg, isFolder=False, task='SID')
+        del ref_path, hyp_path, max_TopN, stream
+        
+        # Score Files
+        with prof.stage('scoring'):
+            topNDict, write_msg = score_SID(fileList, fileDict, topN_num, write_msg, out_path)
+        del topN_num, fileList, fileDict
     
     # Get SID Top-5 Accuracy results
-    get_Top5_results(topNDict, write_msg)
+    with prof.stage('report'):
+        get_Top5_results(topNDict, write_msg)
     
     # Write Results and Log
-    util.writeList(write_msg, out_path, isOverWrite=True)
+    with prof.stage('report'):
+        util.writeList(write_msg, out_path, isOverWrite=True)
+    
+    # Print and Write Timings and Profiles
+    prof.finish(util.get_logs_path()+util.get_bname(out_path))
     del write_msg, out_path
 # EOF
\ No newline at end of file
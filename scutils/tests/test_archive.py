@@ -0,0 +1,108 @@
+"""Tests for scoring system outputs in archives."""
+import io
+import os
+import pickle
+import shutil
+import tarfile
+import tempfile
+import zipfile
+
+import fs02archive
+import fs02utils as util
+
+
+TMP_DIR = tempfile.mkdtemp(prefix="fs02_test_archive__")
+
+FILES = {
+    'Dev/FS01_dev_001.txt': 'FS01_dev_001\t0.00\t1.50\tspeech\n',
+    'Dev/FS01_dev_002.txt': 'FS01_dev_002\t0.00\t2.25\tspeech\n',
+    'Eval/FS01_eval_001.txt': 'FS01_eval_001\t0.00\t3.00\tspeech\n',
+    }
+HIDDEN = {
+    'Dev/.FS01_dev_003.txt': 'hidden\n',
+    '__MACOSX/Dev/._FS01_dev_001.txt': 'resource fork\n',
+    }
+
+
+def _write_tar(name, prefix):
+    archive_path = os.path.join(TMP_DIR, name)
+    with tarfile.open(archive_path, 'w:gz') as tar:
+        for member, text in dict(FILES, **HIDDEN).items():
+            data = text.encode('utf-8')
+            info = tarfile.TarInfo(prefix+member)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return archive_path
+
+
+def _write_zip(name, prefix):
+    archive_path = os.path.join(TMP_DIR, name)
+    with zipfile.ZipFile(archive_path, 'w') as zipf:
+        for member, text in dict(FILES, **HIDDEN).items():
+            zipf.writestr(prefix+member, text)
+    return archive_path
+
+
+def _check_archive(archive_path):
+    members = fs02archive.list_members(archive_path)
+    assert sorted(x.name for x in members) == sorted(FILES)
+    assert fs02archive.split_archive_path(archive_path+'/Dev/') == (archive_path, 'Dev/')
+    assert fs02archive.split_archive_path(archive_path+'/./Dev') == (archive_path, 'Dev/')
+    dev_members = fs02archive.list_members(archive_path, 'Dev/')
+    assert sorted(x.name for x in dev_members) == ['Dev/FS01_dev_001.txt',
+                                                   'Dev/FS01_dev_002.txt']
+    for member in members:
+        assert member == archive_path+'/'+member.name
+        with fs02archive.open_file(member, 'r') as f:
+            assert f.read() == FILES[member.name]
+    assert sorted(util.get_from_dir(archive_path+'/Dev/')) == sorted(dev_members)
+    fs02archive.close_archive()
+
+
+def test_tar_members():
+    _check_archive(_write_tar('sad.tar.gz', ''))
+
+
+def test_tar_members_dot_prefix():
+    # created with: cd <dir> && tar czf ../<archive> .
+    _check_archive(_write_tar('sad_dot.tar.gz', './'))
+
+
+def test_zip_members():
+    _check_archive(_write_zip('sad.zip', ''))
+
+
+def test_zip_members_dot_prefix():
+    _check_archive(_write_zip('sad_dot.zip', './'))
+
+
+def test_is_hidden():
+    assert fs02archive.is_hidden('Dev/.FS01_dev_003.txt')
+    assert fs02archive.is_hidden('.git/config')
+    assert fs02archive.is_hidden('__MACOSX/Dev/._FS01_dev_001.txt')
+    assert not fs02archive.is_hidden('./Dev/FS01_dev_001.txt')
+    assert not fs02archive.is_hidden('Dev/FS01_dev_001.txt')
+
+
+def test_split_archive_path():
+    archive_path = _write_tar('split.tar.gz', '')
+    assert fs02archive.split_archive_path(archive_path) == (archive_path, '')
+    assert fs02archive.split_archive_path(archive_path+'/') == (archive_path, '')
+    assert fs02archive.split_archive_path(TMP_DIR) is None
+
+
+def test_sort_by_archive():
+    archive_path = _write_tar('order.tar.gz', './')
+    members = fs02archive.list_members(archive_path)
+    file_paths = {util.getfName(x):x for x in members}
+    file_names = sorted(file_paths, reverse=True)
+    assert fs02archive.sort_by_archive(file_names, file_paths) == \
+        [util.getfName(x) for x in members]
+    member = pickle.loads(pickle.dumps(members[0]))
+    assert (member.archive, member.name, member.position) == \
+        (members[0].archive, members[0].name, members[0].position)
+    fs02archive.close_archive()
+
+
+def teardown_module():
+    shutil.rmtree(TMP_DIR)
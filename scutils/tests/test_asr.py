@@ -0,0 +1,102 @@
+"""Tests for the python WER engine."""
+import numpy as np
+from numpy.testing import assert_equal
+
+import fs02asr
+
+
+def kaldi_edit_distance(ref, hyp):
+    """Scalar port of kaldi LevenshteinEditDistance (util/edit-distance-inl.h).
+    Returns (n_err, n_ins, n_del, n_sub)."""
+    # [ins, del, sub, total cost] of each cell of the previous row
+    e = [[0, j, 0, j] for j in range(len(ref)+1)]
+    for i in range(1, len(hyp)+1):
+        cur_e = [None]*(len(ref)+1)
+        cur_e[0] = [e[0][0]+1, e[0][1], e[0][2], e[0][3]+1]
+        for j in range(1, len(ref)+1):
+            ins_err = e[j][3]+1
+            del_err = cur_e[j-1][3]+1
+            sub_err = e[j-1][3]+(hyp[i-1] != ref[j-1])
+            if sub_err < ins_err and sub_err < del_err:
+                cur_e[j] = list(e[j-1])
+                cur_e[j][2] += hyp[i-1] != ref[j-1]
+                cur_e[j][3] = sub_err
+            elif del_err < ins_err:
+                cur_e[j] = list(cur_e[j-1])
+                cur_e[j][1] += 1
+                cur_e[j][3] = del_err
+            else:
+                cur_e[j] = list(e[j])
+                cur_e[j][0] += 1
+                cur_e[j][3] = ins_err
+        e = cur_e
+    n_ins, n_del, n_sub, n_err = e[-1]
+    return n_err, n_ins, n_del, n_sub
+
+
+# (ref, hyp, (n_err, n_ins, n_del, n_sub)), with ties between the ops
+TIE_CASES = [
+    ('a', 'b', (1, 0, 0, 1)),
+    ('a b', 'b a', (2, 1, 1, 0)),
+    ('a b', 'b', (1, 0, 1, 0)),
+    ('b', 'a b', (1, 1, 0, 0)),
+    ('a a', 'a', (1, 0, 1, 0)),
+    ('a b c', 'c b a', (2, 0, 0, 2)),
+    ('a b', 'c d e', (3, 1, 0, 2)),
+    ('', 'a b', (2, 2, 0, 0)),
+    ('a b', '', (2, 0, 2, 0)),
+    ]
+
+
+def _encode(ref, hyp):
+    (ref, hyp), _ = fs02asr.encode_words([[('u', ref.split())],
+                                          [('u', hyp.split())]])
+    return ref[0][1], hyp[0][1]
+
+
+def _check_counts(ref_trans, hyp_trans, expected):
+    # expected (n_err, n_ins, n_del, n_sub) of every utterance
+    counts = fs02asr.count_ops(fs02asr.align_all(ref_trans, hyp_trans))
+    for (key, ref), utt_counts, (n_err, n_ins, n_del, n_sub) in \
+            zip(ref_trans, counts, expected):
+        n_cor = len(ref)-n_del-n_sub
+        assert_equal(utt_counts.tolist(), [n_cor, n_sub, n_ins, n_del])
+
+
+def test_tie_cases():
+    for ref, hyp, expected in TIE_CASES:
+        assert kaldi_edit_distance(ref.split(), hyp.split()) == expected
+        assert fs02asr.edit_distance(*_encode(ref, hyp)) == expected
+    _check_counts([(str(i), x[0].split()) for i, x in enumerate(TIE_CASES)],
+                  [(str(i), x[1].split()) for i, x in enumerate(TIE_CASES)],
+                  [x[2] for x in TIE_CASES])
+
+
+def test_random_against_kaldi():
+    # small vocabulary, so that many cells tie
+    rstate = np.random.RandomState(1234)
+    ref_trans, hyp_trans, expected = [], [], []
+    for utt in range(500):
+        ref = [str(x) for x in rstate.randint(3, size=rstate.randint(13))]
+        hyp = [str(x) for x in rstate.randint(3, size=rstate.randint(13))]
+        ref_trans.append((str(utt), ref))
+        hyp_trans.append((str(utt), hyp))
+        expected.append(kaldi_edit_distance(ref, hyp))
+        assert fs02asr.edit_distance(*_encode(' '.join(ref), ' '.join(hyp))) == \
+            expected[-1]
+    _check_counts(ref_trans, hyp_trans, expected)
+
+
+def test_align_positions():
+    rstate = np.random.RandomState(4321)
+    for _ in range(200):
+        ref = rstate.randint(3, size=rstate.randint(13))
+        hyp = rstate.randint(3, size=rstate.randint(13))
+        ops, ref_pos, hyp_pos = fs02asr.align(ref, hyp)
+        # the aligned positions cover ref and hyp, in order
+        assert_equal(ref_pos[ops != fs02asr.OP_INS], np.arange(len(ref)))
+        assert_equal(hyp_pos[ops != fs02asr.OP_DEL], np.arange(len(hyp)))
+        is_cor = ops == fs02asr.OP_COR
+        assert_equal(ref[ref_pos[is_cor]], hyp[hyp_pos[is_cor]])
+        assert not np.any(ref[ref_pos[ops == fs02asr.OP_SUB]] ==
+                          hyp[hyp_pos[ops == fs02asr.OP_SUB]])
@@ -0,0 +1,91 @@
+"""Tests for the reference file cache."""
+import mmap
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from numpy.testing import assert_equal
+
+import fs02cache
+
+
+TMP_DIR = tempfile.mkdtemp(prefix="fs02_test_cache__")
+
+ARRAYS = {
+    'onsets': np.array([0.5, 1.25, 3.0]),
+    'speaker_inds': np.array([0, 1, 0], dtype=np.int64),
+    'ids': fs02cache.str_array(['S1', 'S2']),
+    'empty': np.zeros((0, 2)),
+    }
+
+
+def _is_memmapped(x):
+    while x is not None:
+        if isinstance(x, (np.memmap, mmap.mmap)):
+            return True
+        x = getattr(x, 'base', None)
+    return False
+
+
+def _check_arrays(arrays):
+    assert sorted(arrays) == sorted(ARRAYS)
+    for name in ARRAYS:
+        assert_equal(arrays[name], ARRAYS[name])
+        assert arrays[name].dtype == ARRAYS[name].dtype
+        assert arrays[name].shape == ARRAYS[name].shape
+
+
+def test_read_write_arrays():
+    cache_fp = os.path.join(TMP_DIR, 'read.bin')
+    fs02cache.write_arrays(cache_fp, ARRAYS)
+    arrays = fs02cache.read_arrays(cache_fp)
+    _check_arrays(arrays)
+    assert not _is_memmapped(arrays['onsets'])
+    assert fs02cache.str_list(arrays['ids']) == ['S1', 'S2']
+
+
+def test_read_arrays_memmap():
+    cache_fp = os.path.join(TMP_DIR, 'memmap.bin')
+    fs02cache.write_arrays(cache_fp, ARRAYS)
+    memmap_min_size = fs02cache.MEMMAP_MIN_SIZE
+    fs02cache.MEMMAP_MIN_SIZE = 0
+    try:
+        arrays = fs02cache.read_arrays(cache_fp)
+    finally:
+        fs02cache.MEMMAP_MIN_SIZE = memmap_min_size
+    _check_arrays(arrays)
+    assert _is_memmapped(arrays['onsets'])
+    # copy on write: the cache file is unchanged
+    arrays['onsets'][0] = 10.0
+    _check_arrays(fs02cache.read_arrays(cache_fp))
+
+
+def test_read_arrays_invalid():
+    cache_fp = os.path.join(TMP_DIR, 'invalid.bin')
+    with open(cache_fp, 'wb') as f:
+        f.write(b'not a cache file')
+    assert fs02cache.read_arrays(cache_fp) is None
+    assert fs02cache.read_arrays(os.path.join(TMP_DIR, 'missing.bin')) is None
+
+
+def test_read_only_cache_path():
+    # a cache directory which cannot be created (or written) only disables
+    # the cache
+    def fail(*args, **kwargs):
+        raise PermissionError('Read-only file system')
+    isdir, makedirs = os.path.isdir, os.makedirs
+    os.path.isdir, os.makedirs = (lambda path: False), fail
+    try:
+        cache_path = fs02cache.get_cache_path()
+    finally:
+        os.path.isdir, os.makedirs = isdir, makedirs
+    assert cache_path.endswith(os.path.join('egs', '.cache')+'/')
+    cache_fp = os.path.join(TMP_DIR, 'read_only', 'entry.bin')
+    fs02cache.write_arrays(cache_fp, ARRAYS)
+    assert fs02cache.read_arrays(cache_fp) is None
+    assert not os.path.exists(os.path.dirname(cache_fp))
+
+
+def teardown_module():
+    shutil.rmtree(TMP_DIR)
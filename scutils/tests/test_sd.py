@@ -0,0 +1,56 @@
+"""Tests for SD scoring."""
+import os
+import shutil
+import tempfile
+
+from numpy.testing import assert_raises
+
+import fs02cache
+import fs02sd
+
+
+EGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'egs')
+REF_DIR = os.path.join(EGS_DIR, 'ref_gt', 'SD')
+HYP_DIR = os.path.join(EGS_DIR, 'sys_results', 'SD')
+TMP_DIR = tempfile.mkdtemp(prefix="fs02_test_sd__")
+
+
+def setup_module():
+    fs02cache.set_enabled(False)
+
+
+def _copy_hyp(name):
+    hyp_dir = os.path.join(TMP_DIR, name)
+    shutil.copytree(HYP_DIR, hyp_dir)
+    return hyp_dir
+
+
+def test_score_SD_invalid_rttm():
+    hyp_dir = _copy_hyp('invalid')
+    with open(os.path.join(hyp_dir, 'FS01_dev_002.rttm'), 'a') as f:
+        f.write('SPEAKER FS01_dev_002 1 ten 1.0 <NA> <NA> S1 <NA> <NA>\n')
+    results = fs02sd.score_SD(REF_DIR, hyp_dir)
+    assert results.not_scored == ['FS01_dev_002']
+    assert list(results.errors) == ['FS01_dev_002']
+    assert 'Turn onset not FLOAT' in results.errors['FS01_dev_002']
+    assert 'FS01_dev_001' in results.files
+    assert len(results.files) == len(results.der)
+
+
+def test_score_SD_unexpected_error():
+    # errors other than invalid inputs are raised
+    hyp_dir = _copy_hyp('unexpected')
+    score_turns_SD = fs02sd.score_turns_SD
+    def fail(*args, **kwargs):
+        raise RuntimeError('bug')
+    fs02sd.score_turns_SD = fail
+    try:
+        with assert_raises(RuntimeError):
+            fs02sd.score_SD(REF_DIR, hyp_dir)
+    finally:
+        fs02sd.score_turns_SD = score_turns_SD
+
+
+def teardown_module():
+    fs02cache.set_enabled(True)
+    shutil.rmtree(TMP_DIR)